@@ -0,0 +1,81 @@
+import argparse
+import os
+import statistics
+import time
+from typing import Callable, List
+
+from azure.storage.blob import BlobServiceClient
+from dotenv import load_dotenv
+
+from src.extractors.blob_client_registry import BlobClientRegistry
+from utils.ml_logging import get_logger
+
+# Initialize logging
+logger = get_logger()
+
+
+def time_requests(
+    get_container_client: Callable, container_name: str, requests: int
+) -> List[float]:
+    """
+    Times container property requests, each made through a freshly obtained client.
+
+    :param get_container_client: Returns the container client used by one request.
+    :param container_name: Name of the container.
+    :param requests: Number of requests.
+    :return: Latency of each request, in seconds.
+    """
+    latencies = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        get_container_client(container_name).get_container_properties()
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def main() -> None:
+    """
+    Compares request latency with a new client per manager against shared clients.
+    """
+    parser = argparse.ArgumentParser(
+        description="Benchmark cold (new BlobServiceClient per manager) against warm "
+        "(shared registry) request latency. Requires AZURE_STORAGE_CONNECTION_STRING. "
+        "Run from the repository root with: python -m benchmarks.bench_blob_clients"
+    )
+    parser.add_argument("--container", required=True)
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--pool-maxsize", type=int, default=64)
+    args = parser.parse_args()
+
+    load_dotenv()
+    connection_string = os.getenv("AZURE_STORAGE_CONNECTION_STRING")
+    if connection_string is None:
+        raise EnvironmentError("AZURE_STORAGE_CONNECTION_STRING is not set.")
+
+    def cold_client(container_name: str):
+        # What every manager did before: a new client, pool and TLS handshake.
+        service_client = BlobServiceClient.from_connection_string(connection_string)
+        return service_client.get_container_client(container_name)
+
+    registry = BlobClientRegistry(pool_maxsize=args.pool_maxsize)
+
+    def warm_client(container_name: str):
+        return registry.get_container_client(connection_string, container_name)
+
+    # One untimed request opens the shared connection before the warm runs.
+    warm_client(args.container).get_container_properties()
+
+    print(f"{'clients':>8} {'mean (ms)':>10} {'p50 (ms)':>9} {'max (ms)':>9}")
+    for label, get_client in (("cold", cold_client), ("warm", warm_client)):
+        latencies = time_requests(get_client, args.container, args.requests)
+        print(
+            f"{label:>8} {statistics.mean(latencies) * 1000:>10.1f} "
+            f"{statistics.median(latencies) * 1000:>9.1f} "
+            f"{max(latencies) * 1000:>9.1f}"
+        )
+    logger.info(f"Registry: {registry.stats()}")
+    registry.close()
+
+
+if __name__ == "__main__":
+    main()
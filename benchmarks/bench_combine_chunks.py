@@ -0,0 +1,96 @@
+import argparse
+import random
+import time
+from typing import List
+
+from src.azure_search_ai.custom_skills.PDFPartitioner.logic import combine_chunks
+from src.azure_search_ai.custom_skills.PDFPartitioner.tokenizer import get_tokenizer
+from utils.ml_logging import get_logger
+
+# Initialize logging
+logger = get_logger()
+
+WORDS = (
+    "valve actuator pressure controller signal calibration torque seal bonnet "
+    "stem packing flow travel diagnostic positioner supply output port"
+).split()
+
+
+def generate_sections(num_sections: int, seed: int = 42) -> List[str]:
+    """
+    Generates synthetic markdown sections with small headings and short bodies.
+
+    :param num_sections: Number of sections to generate.
+    :param seed: Seed of the random generator, so runs are reproducible.
+    :return: List of section texts.
+    """
+    rng = random.Random(seed)
+    sections = []
+    for i in range(num_sections):
+        body = " ".join(rng.choice(WORDS) for _ in range(rng.randint(3, 40)))
+        sections.append(f"## {i + 1}. {rng.choice(WORDS).title()}\n{body}.\n\n")
+    return sections
+
+
+def reference_combine_chunks(chunks: List[str], min_length: int) -> List[str]:
+    """
+    Combines chunks by re-tokenizing the whole growing chunk after every append.
+
+    :param chunks: List of text chunks to be combined.
+    :param min_length: Minimum length of each combined chunk in tokens.
+    :return: List of combined text chunks.
+    """
+    encoding = get_tokenizer().encoding
+    combined_chunks = []
+    current_chunk = ""
+    for chunk in chunks:
+        current_chunk += chunk
+        if len(encoding.encode(current_chunk)) >= min_length:
+            combined_chunks.append(current_chunk)
+            current_chunk = ""
+    if current_chunk:
+        combined_chunks.append(current_chunk)
+    return combined_chunks
+
+
+def main() -> None:
+    """
+    Times the incremental combine_chunks against the re-tokenizing reference.
+    """
+    parser = argparse.ArgumentParser(
+        description="Benchmark combine_chunks on synthetic inputs. "
+        "Run from the repository root with: python -m benchmarks.bench_combine_chunks"
+    )
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[1000, 2500, 5000, 10000]
+    )
+    parser.add_argument("--min-length", type=int, default=250)
+    args = parser.parse_args()
+
+    tokenizer = get_tokenizer()
+    print(
+        f"{'sections':>10} {'reference (s)':>14} {'incremental (s)':>16} {'speedup':>8}"
+    )
+    for size in args.sizes:
+        sections = generate_sections(size)
+
+        start = time.perf_counter()
+        expected = reference_combine_chunks(sections, args.min_length)
+        reference_time = time.perf_counter() - start
+
+        # Start from a cold count cache so repeated sizes do not benefit from memoization.
+        tokenizer.clear_cache()
+        start = time.perf_counter()
+        combined = combine_chunks(sections, args.min_length)
+        incremental_time = time.perf_counter() - start
+
+        if combined != expected:
+            logger.error(f"Output mismatch for {size} sections")
+        print(
+            f"{size:>10} {reference_time:>14.3f} {incremental_time:>16.3f} "
+            f"{reference_time / incremental_time:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
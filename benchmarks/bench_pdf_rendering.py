@@ -0,0 +1,75 @@
+import argparse
+import os
+import tempfile
+import time
+
+import fitz
+
+from src.extractors.pdf_rendering import render_pdfs
+from utils.ml_logging import get_logger
+
+# Initialize logging
+logger = get_logger()
+
+
+def generate_pdf(path: str, num_pages: int) -> None:
+    """
+    Writes a synthetic PDF with a text block and vector shapes on every page.
+
+    :param path: Path of the PDF file.
+    :param num_pages: Number of pages to generate.
+    """
+    with fitz.open() as doc:
+        for page_number in range(num_pages):
+            page = doc.new_page()
+            text = f"Page {page_number + 1}. " + "Valve actuator calibration. " * 120
+            page.insert_textbox(fitz.Rect(50, 50, 550, 700), text, fontsize=9)
+            for i in range(20):
+                page.draw_rect(fitz.Rect(50 + i * 20, 720, 65 + i * 20, 780))
+        doc.save(path)
+
+
+def main() -> None:
+    """
+    Measures rendering throughput in pages per second for several worker counts.
+    """
+    parser = argparse.ArgumentParser(
+        description="Benchmark multiprocess PDF rasterization on synthetic PDFs. "
+        "Run from the repository root with: python -m benchmarks.bench_pdf_rendering"
+    )
+    parser.add_argument("--files", type=int, default=4)
+    parser.add_argument("--pages", type=int, default=50)
+    parser.add_argument(
+        "--workers", type=int, nargs="+", default=[1, 2, 4, os.cpu_count() or 1]
+    )
+    parser.add_argument("--pages-per-task", type=int, default=8)
+    parser.add_argument("--zoom", type=float, default=2.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_paths = []
+        for i in range(args.files):
+            file_path = os.path.join(temp_dir, f"document-{i}.pdf")
+            generate_pdf(file_path, args.pages)
+            file_paths.append(file_path)
+
+        print(f"{'workers':>8} {'pages':>7} {'seconds':>8} {'pages/s':>8}")
+        for workers in sorted(set(args.workers)):
+            output_dir = os.path.join(temp_dir, f"images-{workers}")
+            start = time.perf_counter()
+            pages = render_pdfs(
+                file_paths,
+                output_dir,
+                zoom=args.zoom,
+                max_workers=workers,
+                pages_per_task=args.pages_per_task,
+            )
+            elapsed = time.perf_counter() - start
+            print(
+                f"{workers:>8} {len(pages):>7} {elapsed:>8.2f} "
+                f"{len(pages) / elapsed:>8.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
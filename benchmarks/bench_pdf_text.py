@@ -0,0 +1,65 @@
+import argparse
+import glob
+import os
+import tempfile
+import time
+from typing import List
+
+from benchmarks.bench_pdf_rendering import generate_pdf
+from src.extractors.pdf_text_backends import TEXT_BACKENDS
+from utils.memory import PeakRSSTracker
+
+
+def main() -> None:
+    """
+    Compares the text extraction backends in pages per second and peak memory.
+    """
+    parser = argparse.ArgumentParser(
+        description="Benchmark PDF text extraction backends. Run from the repository "
+        "root with: python -m benchmarks.bench_pdf_text [--corpus dir]"
+    )
+    parser.add_argument(
+        "--corpus", help="Directory of PDFs to extract, synthetic PDFs by default."
+    )
+    parser.add_argument("--files", type=int, default=4)
+    parser.add_argument("--pages", type=int, default=100)
+    parser.add_argument(
+        "--backends", nargs="+", default=list(TEXT_BACKENDS), choices=TEXT_BACKENDS
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        if args.corpus:
+            file_paths: List[str] = sorted(
+                glob.glob(os.path.join(args.corpus, "**", "*.pdf"), recursive=True)
+            )
+        else:
+            file_paths = []
+            for i in range(args.files):
+                file_path = os.path.join(temp_dir, f"document-{i}.pdf")
+                generate_pdf(file_path, args.pages)
+                file_paths.append(file_path)
+
+        print(
+            f"{'backend':>8} {'files':>6} {'pages':>7} {'chars':>10} "
+            f"{'seconds':>8} {'pages/s':>8} {'peak MiB':>9}"
+        )
+        for name in args.backends:
+            backend = TEXT_BACKENDS[name]
+            pages = chars = 0
+            with PeakRSSTracker(reset_peak=True) as tracker:
+                start = time.perf_counter()
+                for file_path in file_paths:
+                    for text in backend(file_path):
+                        pages += 1
+                        chars += len(text)
+                elapsed = time.perf_counter() - start
+            peak = tracker.stats["peak_increase_bytes"] or 0
+            print(
+                f"{name:>8} {len(file_paths):>6} {pages:>7} {chars:>10} "
+                f"{elapsed:>8.2f} {pages / elapsed:>8.1f} {peak / 1024**2:>9.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
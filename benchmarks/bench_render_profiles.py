@@ -0,0 +1,47 @@
+import argparse
+import os
+import tempfile
+
+from benchmarks.bench_pdf_rendering import generate_pdf
+from src.extractors.ocr_data_extractor import OCRHelper
+from src.extractors.render_profiles import RENDER_PROFILES
+
+
+def main() -> None:
+    """
+    Prints the payload size and vision token cost of each rendering profile.
+    """
+    parser = argparse.ArgumentParser(
+        description="Compare rendering profiles by bytes per page and estimated "
+        "GPT-4 Vision tokens. Run from the repository root with: "
+        "python -m benchmarks.bench_render_profiles [--pdf path]"
+    )
+    parser.add_argument("--pdf", help="PDF to render, a synthetic one by default.")
+    parser.add_argument("--pages", type=int, default=10)
+    parser.add_argument(
+        "--profiles", nargs="+", default=list(RENDER_PROFILES), choices=RENDER_PROFILES
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        pdf_path = args.pdf
+        if pdf_path is None:
+            pdf_path = os.path.join(temp_dir, "document.pdf")
+            generate_pdf(pdf_path, args.pages)
+        report = OCRHelper().compare_render_profiles(pdf_path, args.profiles)
+
+    print(
+        f"{'profile':>15} {'KiB/page':>9} {'base64 KiB':>11} "
+        f"{'tokens/page':>12} {'pages/s':>8}"
+    )
+    for entry in report:
+        print(
+            f"{entry['profile']:>15} {entry['bytes_per_page'] / 1024:>9.1f} "
+            f"{entry['base64_bytes_per_page'] / 1024:>11.1f} "
+            f"{entry['tokens_per_page']:>12.0f} "
+            f"{entry['pages'] / entry['seconds']:>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
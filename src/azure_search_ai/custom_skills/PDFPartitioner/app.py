@@ -1,15 +1,19 @@
+import asyncio
 import logging
-from typing import List
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional
 
 from dotenv import load_dotenv
 from fastapi import FastAPI
 from pydantic import BaseModel
 
-from src.azure_search_ai.custom_skills.PDFPartitioner.logic import (
-    combine_chunks,
-    split_text_by_headings,
+from src.azure_search_ai.custom_skills.PDFPartitioner.chunker import chunk_document
+from src.azure_search_ai.custom_skills.PDFPartitioner.splitter import (
+    section_spans_from_paragraphs,
 )
-from src.ocr.document_intelligence import AzureDocumentIntelligenceManager
+from src.extractors.async_blob_data_extractor import close_async_blob_service_clients
+from src.ocr.async_document_intelligence import AsyncAzureDocumentIntelligenceManager
 
 # Load environment variables
 load_dotenv()
@@ -54,41 +58,109 @@ class RequestBody(BaseModel):
 
 
 # Initialize Azure Document Intelligence client
-document_intelligence_client = AzureDocumentIntelligenceManager()
+document_intelligence_client = AsyncAzureDocumentIntelligenceManager()
+
+# Token budgets of the embedding model
+CHUNK_MIN_TOKENS = int(os.getenv("CHUNK_MIN_TOKENS", "250"))
+CHUNK_MAX_TOKENS = int(os.getenv("CHUNK_MAX_TOKENS", "1000"))
+CHUNK_OVERLAP_TOKENS = int(os.getenv("CHUNK_OVERLAP_TOKENS", "0"))
+
+# Number of records analyzed at the same time, across all requests
+CHUNK_MAX_CONCURRENCY = int(os.getenv("CHUNK_MAX_CONCURRENCY", "4"))
+
+# Number of worker processes used for chunking
+CHUNK_WORKERS = int(os.getenv("CHUNK_WORKERS", str(os.cpu_count() or 1)))
 
 # Initialize FastAPI application
 app = FastAPI()
 
+record_semaphore: Optional[asyncio.Semaphore] = None
+chunking_executor: Optional[ProcessPoolExecutor] = None
+
+
+@app.on_event("startup")
+async def startup() -> None:
+    """
+    Creates the concurrency limit and the chunking worker pool.
+    """
+    global record_semaphore, chunking_executor
+    record_semaphore = asyncio.Semaphore(CHUNK_MAX_CONCURRENCY)
+    chunking_executor = ProcessPoolExecutor(max_workers=CHUNK_WORKERS)
+    logger.info(
+        f"Processing up to {CHUNK_MAX_CONCURRENCY} records at a time "
+        f"with {CHUNK_WORKERS} chunking workers"
+    )
+
+
+@app.on_event("shutdown")
+async def shutdown() -> None:
+    """
+    Closes the Document Intelligence and blob clients and shuts down the chunking worker
+    pool.
+    """
+    await document_intelligence_client.close()
+    await close_async_blob_service_clients()
+    if chunking_executor is not None:
+        chunking_executor.shutdown(wait=True)
+
+
+async def process_record(record: Record) -> Dict[str, Any]:
+    """
+    Analyzes and chunks a single record.
+
+    Document Intelligence calls use the async client so they do not block the event loop,
+    and chunking runs in the worker pool. Failures are reported in the record errors.
+
+    :param record: The record to be processed.
+    :return: The record response, with either chunks or errors.
+    """
+    url = record.data.url
+    async with record_semaphore:
+        logger.info(f"Processing record: {record.recordId} with URL: {url}")
+        try:
+            result_ocr = await document_intelligence_client.analyze_document(
+                document_input=url,
+                model_type="prebuilt-layout",
+                output_format="markdown",
+                features=["OCR_HIGH_RESOLUTION"],
+                string_index_type="unicodeCodePoint",
+            )
+            section_spans = section_spans_from_paragraphs(
+                len(result_ocr.content), result_ocr.paragraphs or []
+            )
+            chunks = await asyncio.get_running_loop().run_in_executor(
+                chunking_executor,
+                chunk_document,
+                result_ocr.content,
+                section_spans,
+                CHUNK_MIN_TOKENS,
+                CHUNK_MAX_TOKENS,
+                CHUNK_OVERLAP_TOKENS,
+            )
+        except Exception as e:
+            logger.error(f"Failed to process record {record.recordId}: {e}")
+            return {
+                "recordId": record.recordId,
+                "data": {},
+                "errors": [{"message": f"Failed to process {url}: {e}"}],
+            }
+    return {"recordId": record.recordId, "data": {"chunks": chunks}, "errors": []}
+
 
 @app.post("/chunk")
 async def split_pdf(request_body: RequestBody):
     """
     Processes a PDF and splits its content into chunks.
 
+    Records are processed concurrently, up to CHUNK_MAX_CONCURRENCY at a time.
+
     :param request_body: The request body containing records to be processed.
     :return: A JSON response containing processed chunks.
     """
-    json_response = {"values": []}
-    for record in request_body.values:
-        url = record.data.url
-        logger.info(f"Processing record: {record.recordId} with URL: {url}")
-        result_ocr = document_intelligence_client.analyze_document(
-            document_input=url,
-            model_type="prebuilt-layout",
-            output_format="markdown",
-            features=["OCR_HIGH_RESOLUTION"],
-        )
-        section_headings = [
-            paragraph.content
-            for paragraph in result_ocr.paragraphs
-            if paragraph.role == "sectionHeading"
-        ]
-        split_text = split_text_by_headings(result_ocr.content, section_headings)
-        chunks = combine_chunks(split_text, 250)
-        json_response["values"].append(
-            {"recordId": record.recordId, "data": {"chunks": chunks}, "errors": []}
-        )
-    return json_response
+    values = await asyncio.gather(
+        *(process_record(record) for record in request_body.values)
+    )
+    return {"values": list(values)}
 
 
 if __name__ == "__main__":
@@ -0,0 +1,293 @@
+import re
+from bisect import bisect_left
+from functools import lru_cache
+from typing import List, NamedTuple, Optional
+
+from src.azure_search_ai.custom_skills.PDFPartitioner.splitter import Span
+from src.azure_search_ai.custom_skills.PDFPartitioner.tokenizer import (
+    DEFAULT_ENCODING_NAME,
+    get_tokenizer,
+)
+from utils.ml_logging import get_logger
+
+# Initialize logging
+logger = get_logger()
+
+PARAGRAPH_SEPARATOR = re.compile(r"\n[ \t]*\n\s*")
+SENTENCE_SEPARATOR = re.compile(r"(?<=[.!?])\s+")
+
+
+class Chunk(NamedTuple):
+    """
+    A chunk of a text, referenced by offsets instead of a copied string.
+
+    :param start: Offset of the first character of the chunk.
+    :param end: Offset just past the last character of the chunk.
+    :param token_count: Number of tokens in the chunk.
+    """
+
+    start: int
+    end: int
+    token_count: int
+
+
+class TokenBudgetChunker:
+    """
+    Chunks a text into pieces that respect a minimum and maximum token budget.
+
+    Sections are combined until they reach ``min_tokens``. Sections larger than the
+    maximum are split recursively on paragraph, then sentence, then token boundaries.
+    Chunks after the first one can start ``overlap_tokens`` tokens before the end of the
+    previous chunk.
+    """
+
+    def __init__(
+        self,
+        min_tokens: int = 250,
+        max_tokens: int = 1000,
+        overlap_tokens: int = 0,
+        encoding_name: str = DEFAULT_ENCODING_NAME,
+    ):
+        """
+        Initialize the TokenBudgetChunker.
+
+        :param min_tokens: Minimum number of tokens of each chunk, except the last one.
+        :param max_tokens: Maximum number of tokens of each chunk, overlap included.
+        :param overlap_tokens: Number of tokens repeated from the end of the previous chunk.
+        :param encoding_name: The name of the tiktoken encoding. Defaults to "cl100k_base".
+        """
+        if max_tokens <= 0:
+            raise ValueError("max_tokens must be a positive integer.")
+        if not 0 <= overlap_tokens < max_tokens:
+            raise ValueError("overlap_tokens must be between 0 and max_tokens - 1.")
+        # Chunks are combined up to max_tokens - overlap_tokens, so a larger minimum
+        # could never be reached.
+        if not 0 <= min_tokens <= max_tokens - overlap_tokens:
+            raise ValueError(
+                "min_tokens must be between 0 and max_tokens - overlap_tokens."
+            )
+        self.min_tokens = min_tokens
+        self.max_tokens = max_tokens
+        self.overlap_tokens = overlap_tokens
+        self.tokenizer = get_tokenizer(encoding_name)
+        # Every chunk is packed with room left for the overlap prepended to it.
+        self.budget = max_tokens - overlap_tokens
+
+    def chunk(self, text: str, spans: Optional[List[Span]] = None) -> List[Chunk]:
+        """
+        Chunks a text, optionally starting from pre-computed section spans.
+
+        :param text: The text to be chunked.
+        :param spans: List of (start, end) section spans. Defaults to the whole text.
+        :return: List of chunks over the original text.
+        """
+        if spans is None:
+            spans = [(0, len(text))]
+        pieces: List[Chunk] = []
+        for start, end in spans:
+            pieces.extend(self._split_span(text, start, end, level=0))
+        chunks = self._combine_pieces(text, pieces)
+        if self.overlap_tokens:
+            chunks = self._add_overlap(text, chunks)
+        logger.info(f"Chunked {len(spans)} sections into {len(chunks)} chunks")
+        return chunks
+
+    def _split_span(self, text: str, start: int, end: int, level: int) -> List[Chunk]:
+        """
+        Splits a span into pieces that fit the token budget.
+
+        :param text: The text the span refers to.
+        :param start: Offset of the first character of the span.
+        :param end: Offset just past the last character of the span.
+        :param level: Separator level to split on: 0 for paragraphs, 1 for sentences,
+            2 for tokens.
+        :return: List of pieces, each within the budget.
+        """
+        if start >= end:
+            return []
+        token_count = self.tokenizer.count_tokens(text[start:end])
+        if token_count <= self.budget:
+            return [Chunk(start, end, token_count)]
+        if level >= 2:
+            return self._split_by_tokens(text, start, end)
+
+        # Paragraph breaks stay with the preceding piece, while the whitespace after a
+        # sentence stays with the following one, as it is tokenized with the next word.
+        if level == 0:
+            cuts = [m.end() for m in PARAGRAPH_SEPARATOR.finditer(text, start, end)]
+        else:
+            cuts = [m.start() for m in SENTENCE_SEPARATOR.finditer(text, start, end)]
+        cuts = [cut for cut in cuts if start < cut < end]
+        if not cuts:
+            return self._split_span(text, start, end, level + 1)
+
+        pieces: List[Chunk] = []
+        boundaries = [start] + cuts + [end]
+        for piece_start, piece_end in zip(boundaries[:-1], boundaries[1:]):
+            pieces.extend(self._split_span(text, piece_start, piece_end, level + 1))
+        return pieces
+
+    def _split_by_tokens(self, text: str, start: int, end: int) -> List[Chunk]:
+        """
+        Splits a span every ``budget`` tokens, as a last resort.
+
+        A cut inside a character that takes several tokens is moved back to the start of
+        that character, and every piece is re-counted, since its text can re-tokenize
+        differently from the span. A single character larger than the budget is kept
+        as a piece of its own.
+
+        :param text: The text the span refers to.
+        :param start: Offset of the first character of the span.
+        :param end: Offset just past the last character of the span.
+        :return: List of pieces, each within the budget unless it is a single character.
+        """
+        tokens = self.tokenizer.encode(text[start:end])
+        # Offset of the character each token starts in, so cuts land on characters.
+        _, offsets = self.tokenizer.encoding.decode_with_offsets(tokens)
+        pieces: List[Chunk] = []
+        piece_start = start
+        while piece_start < end:
+            index = bisect_left(offsets, piece_start - start) + self.budget
+            while True:
+                piece_end = end if index >= len(tokens) else start + offsets[index]
+                if piece_end <= piece_start:
+                    piece_end = piece_start + 1
+                    logger.warning(
+                        f"Character at offset {piece_start} takes more than "
+                        f"{self.budget} tokens"
+                    )
+                token_count = self.tokenizer.count_tokens(text[piece_start:piece_end])
+                if token_count <= self.budget or piece_end == piece_start + 1:
+                    break
+                index = min(index, len(tokens)) - 1
+            pieces.append(Chunk(piece_start, piece_end, token_count))
+            piece_start = piece_end
+        return pieces
+
+    def _combine_pieces(self, text: str, pieces: List[Chunk]) -> List[Chunk]:
+        """
+        Combines consecutive pieces until they reach the minimum without exceeding the budget.
+
+        Piece counts are summed as an estimate and the combined text is only re-counted
+        when the estimate reaches the minimum or the budget, since junctions can shift it.
+
+        :param text: The text the pieces refer to.
+        :param pieces: Consecutive pieces, each within the budget.
+        :return: List of combined chunks.
+        """
+        chunks: List[Chunk] = []
+        i = 0
+        while i < len(pieces):
+            start = pieces[i].start
+            group_end = i + 1
+            token_count = pieces[i].token_count
+            is_exact = True
+            while token_count < self.min_tokens and group_end < len(pieces):
+                next_piece = pieces[group_end]
+                estimated_tokens = token_count + next_piece.token_count
+                if (
+                    estimated_tokens >= self.min_tokens
+                    or estimated_tokens > self.budget
+                ):
+                    exact_tokens = self.tokenizer.count_tokens(
+                        text[start : next_piece.end]
+                    )
+                    if exact_tokens > self.budget:
+                        break
+                    token_count, is_exact = exact_tokens, True
+                else:
+                    token_count, is_exact = estimated_tokens, False
+                group_end += 1
+
+            if not is_exact:
+                token_count = self.tokenizer.count_tokens(
+                    text[start : pieces[group_end - 1].end]
+                )
+                while token_count > self.budget and group_end > i + 1:
+                    group_end -= 1
+                    token_count = self.tokenizer.count_tokens(
+                        text[start : pieces[group_end - 1].end]
+                    )
+            # Only a piece of its own can exceed the budget, as a character that does.
+            assert token_count <= self.budget or group_end == i + 1
+            chunks.append(Chunk(start, pieces[group_end - 1].end, token_count))
+            i = group_end
+        return chunks
+
+    def _add_overlap(self, text: str, chunks: List[Chunk]) -> List[Chunk]:
+        """
+        Moves the start of every chunk back to include the end of the previous one.
+
+        :param text: The text the chunks refer to.
+        :param chunks: Non-overlapping, consecutive chunks.
+        :return: List of overlapping chunks.
+        """
+        encoding = self.tokenizer.encoding
+        overlapped = chunks[:1]
+        for previous, current in zip(chunks, chunks[1:]):
+            tokens = self.tokenizer.encode(text[previous.start : previous.end])
+            if len(tokens) <= self.overlap_tokens:
+                start = previous.start
+            else:
+                _, offsets = encoding.decode_with_offsets(tokens)
+                start = previous.start + offsets[len(tokens) - self.overlap_tokens]
+            token_count = self.tokenizer.count_tokens(text[start : current.end])
+            if token_count > self.max_tokens:
+                overlapped.append(current)
+            else:
+                overlapped.append(Chunk(start, current.end, token_count))
+        return overlapped
+
+
+def chunk_texts(text: str, chunks: List[Chunk]) -> List[str]:
+    """
+    Materializes the text of each chunk.
+
+    :param text: The text the chunks refer to.
+    :param chunks: List of chunks.
+    :return: List of chunk texts.
+    """
+    return [text[chunk.start : chunk.end] for chunk in chunks]
+
+
+@lru_cache(maxsize=None)
+def get_chunker(
+    min_tokens: int = 250,
+    max_tokens: int = 1000,
+    overlap_tokens: int = 0,
+    encoding_name: str = DEFAULT_ENCODING_NAME,
+) -> TokenBudgetChunker:
+    """
+    Returns a TokenBudgetChunker shared by every caller of the process with the same budgets.
+
+    :param min_tokens: Minimum number of tokens of each chunk, except the last one.
+    :param max_tokens: Maximum number of tokens of each chunk, overlap included.
+    :param overlap_tokens: Number of tokens repeated from the end of the previous chunk.
+    :param encoding_name: The name of the tiktoken encoding. Defaults to "cl100k_base".
+    :return: The cached TokenBudgetChunker instance.
+    """
+    return TokenBudgetChunker(min_tokens, max_tokens, overlap_tokens, encoding_name)
+
+
+def chunk_document(
+    text: str,
+    spans: Optional[List[Span]] = None,
+    min_tokens: int = 250,
+    max_tokens: int = 1000,
+    overlap_tokens: int = 0,
+) -> List[str]:
+    """
+    Chunks a text and returns the chunk texts.
+
+    This is a module-level function so it can be submitted to a process pool, where each
+    worker keeps its own chunker and tokenizer.
+
+    :param text: The text to be chunked.
+    :param spans: List of (start, end) section spans. Defaults to the whole text.
+    :param min_tokens: Minimum number of tokens of each chunk, except the last one.
+    :param max_tokens: Maximum number of tokens of each chunk, overlap included.
+    :param overlap_tokens: Number of tokens repeated from the end of the previous chunk.
+    :return: List of chunk texts.
+    """
+    chunker = get_chunker(min_tokens, max_tokens, overlap_tokens)
+    return chunk_texts(text, chunker.chunk(text, spans))
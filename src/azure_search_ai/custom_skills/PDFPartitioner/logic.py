@@ -1,8 +1,14 @@
-import re
+from itertools import islice
 from typing import List
 
-import tiktoken
-
+from src.azure_search_ai.custom_skills.PDFPartitioner.splitter import (
+    Span,
+    find_heading_spans,
+)
+from src.azure_search_ai.custom_skills.PDFPartitioner.tokenizer import (
+    TokenizerService,
+    get_tokenizer,
+)
 from utils.ml_logging import get_logger
 
 # Initialize logging
@@ -17,41 +23,211 @@ def num_tokens_from_string(string: str, encoding_name: str = "cl100k_base") -> i
     :param encoding_name: The name of the encoding to use. Defaults to "cl100k_base".
     :return: The number of tokens in the encoded string.
     """
-    encoding = tiktoken.get_encoding(encoding_name)
-    num_tokens = len(encoding.encode(string))
-    return num_tokens
+    return get_tokenizer(encoding_name).count_tokens(string)
+
+
+def split_text_by_spans(text: str, spans: List[Span]) -> List[str]:
+    """
+    Materializes the text chunks delimited by (start, end) spans.
+
+    :param text: The text the spans refer to.
+    :param spans: List of (start, end) spans.
+    :return: List of text chunks.
+    """
+    return [text[start:end] for start, end in spans]
 
 
 def split_text_by_headings(text: str, section_headings: List[str]) -> List[str]:
     """
     Splits text into chunks based on provided section headings.
 
+    The text is cut before every occurrence of any heading, found in a single pass with
+    an Aho–Corasick automaton. Use ``find_heading_spans`` to get the offsets instead of
+    copied substrings.
+
     :param text: The text to be split.
     :param section_headings: A list of headings used to split the text.
     :return: List of text chunks.
     """
-    pattern = "|".join("(?={})".format(re.escape(sec)) for sec in section_headings)
-    chunks = re.split(pattern, text)
-    for i, chunk in enumerate(chunks):
-        logger.info(f"Number of tokens in chunk {i+1}: {num_tokens_from_string(chunk)}")
+    chunks = split_text_by_spans(text, find_heading_spans(text, section_headings))
+    token_counts = get_tokenizer().count_tokens_batch(chunks)
+    for i, num_tokens in enumerate(token_counts):
+        logger.info(f"Number of tokens in chunk {i+1}: {num_tokens}")
     return chunks
 
 
-def combine_chunks(chunks: List[str], min_length: int) -> List[str]:
+def _text_tail(parts: List[str], length: int) -> str:
+    """
+    Returns the last characters of the concatenation of texts, without joining them all.
+
+    :param parts: The texts, in order.
+    :param length: Number of characters to return.
+    :return: The last ``length`` characters, or all of them if the texts are shorter.
+    """
+    tail_parts = []
+    remaining = length
+    for part in reversed(parts):
+        if remaining <= 0:
+            break
+        tail_parts.append(part[-remaining:])
+        remaining -= len(part)
+    return "".join(reversed(tail_parts))
+
+
+def _leading_piece_ends(
+    tokenizer: TokenizerService, text: str, count: int = 2
+) -> List[int]:
+    """
+    Returns where the first pre-tokenization pieces of a text end.
+
+    :param tokenizer: The tokenizer whose split pattern is used.
+    :param text: The text to split.
+    :param count: Number of pieces.
+    :return: The end offsets of up to ``count`` pieces.
+    """
+    return [
+        match.end() for match in islice(tokenizer.split_pattern.finditer(text), count)
+    ]
+
+
+def _pieces_resynchronize(
+    tokenizer: TokenizerService, joined: str, start: int, junction: int, head: str
+) -> bool:
+    """
+    Checks whether the pieces of a joined text realign with those of its head.
+
+    Once both scans end a piece at the same offset after the junction, they are
+    identical from there on. A truncated head can cut its last piece, so the offset must
+    come before the last two piece boundaries of the head.
+
+    :param tokenizer: The tokenizer whose split pattern is used.
+    :param joined: The text before the junction followed by ``head``.
+    :param start: Offset of a piece boundary of ``joined`` before the junction.
+    :param junction: Offset of the junction in ``joined``.
+    :param head: The text after the junction.
+    :return: Whether the scans share a piece boundary in the head.
+    """
+    head_ends = (match.end() for match in tokenizer.split_pattern.finditer(head))
+    joined_ends = (
+        match.end() - junction
+        for match in tokenizer.split_pattern.finditer(joined, start)
+    )
+    head_end = next(head_ends, None)
+    joined_end = next(joined_ends, None)
+    while head_end is not None and joined_end is not None:
+        if head_end == joined_end:
+            return next(head_ends, len(head)) < len(head)
+        if head_end < joined_end:
+            head_end = next(head_ends, None)
+        else:
+            joined_end = next(joined_ends, None)
+    return False
+
+
+def _boundary_correction(
+    tokenizer: TokenizerService, before: List[str], after: str, window: int = 32
+) -> int:
+    """
+    Computes how many tokens are gained or lost when two texts are concatenated.
+
+    BPE merges and pre-tokenization can change around the junction, so the token count of
+    ``a + b`` is not always ``count(a) + count(b)``. Only a window on each side of the
+    junction is encoded. Tokens never span two pre-tokenization pieces, so the window is
+    doubled until the pieces at both of its edges are the same with and without the
+    junction. A piece spanning a long run of whitespace or letters is then re-encoded
+    whole, while the usual correction stays constant-time.
+
+    :param tokenizer: The tokenizer used to encode the junction window.
+    :param before: The texts before the junction, whose concatenation is ``a``.
+    :param after: The text after the junction, ``b``.
+    :param window: Initial number of characters on each side of the junction.
+    :return: The token count difference caused by the concatenation.
+    """
+    if not after:
+        return 0
+    while True:
+        tail = _text_tail(before, window)
+        if not tail:
+            return 0
+        head = after[:window]
+        joined = tail + head
+        resume = 0
+        settled = True
+        if len(tail) == window:
+            # A truncated tail can cut its first piece, so its first two pieces have to
+            # be left unchanged by the junction.
+            tail_ends = _leading_piece_ends(tokenizer, tail)
+            settled = (
+                len(tail_ends) == 2
+                and tail_ends[1] < len(tail)
+                and tail_ends == _leading_piece_ends(tokenizer, joined)
+            )
+            resume = tail_ends[-1]
+        if settled and len(head) < len(after):
+            settled = _pieces_resynchronize(tokenizer, joined, resume, len(tail), head)
+        if settled:
+            return (
+                len(tokenizer.encode(joined))
+                - len(tokenizer.encode(tail))
+                - len(tokenizer.encode(head))
+            )
+        window *= 2
+
+
+def combine_chunks(
+    chunks: List[str],
+    min_length: int,
+    boundary_window: int = 32,
+    boundary_slack: int = 2,
+) -> List[str]:
     """
     Combines text chunks into larger chunks with a minimum number of tokens.
 
+    Each chunk is tokenized once and the counts are summed as chunks are appended, with a
+    correction for the tokens that change at every junction. The combined text is only
+    re-counted exactly when the running estimate gets within ``boundary_slack`` tokens per
+    junction of ``min_length``, so the output matches counting every growing chunk from
+    scratch while the work stays linear in the number of chunks. When the pre-tokenization
+    pattern of the encoding is unknown, every growing chunk is counted from scratch.
+
     :param chunks: List of text chunks to be combined.
     :param min_length: Minimum length of each combined chunk in tokens.
+    :param boundary_window: Initial number of characters on each side of a junction used to
+        compute the boundary correction.
+    :param boundary_slack: Tolerated estimation error, in tokens per junction, before the
+        combined chunk is re-counted exactly.
     :return: List of combined text chunks.
     """
+    tokenizer = get_tokenizer()
+    chunk_token_counts = tokenizer.count_tokens_batch(chunks)
     combined_chunks = []
-    current_chunk = ""
-    for chunk in chunks:
-        current_chunk += chunk
-        if num_tokens_from_string(current_chunk) >= min_length:
+    current_parts: List[str] = []
+    estimated_tokens = 0
+    junctions = 0
+    for chunk, num_tokens in zip(chunks, chunk_token_counts):
+        if current_parts and tokenizer.split_pattern is None:
+            # Junctions cannot be corrected without the pre-tokenization pattern, so the
+            # combined chunk is re-counted instead.
+            estimated_tokens = len(tokenizer.encode("".join(current_parts) + chunk))
+        elif current_parts:
+            estimated_tokens += num_tokens + _boundary_correction(
+                tokenizer, current_parts, chunk, boundary_window
+            )
+            junctions += 1
+        else:
+            estimated_tokens = num_tokens
+        current_parts.append(chunk)
+
+        if estimated_tokens + boundary_slack * junctions >= min_length:
+            current_chunk = "".join(current_parts)
+            estimated_tokens = len(tokenizer.encode(current_chunk))
+            junctions = 0
+            if estimated_tokens >= min_length:
+                combined_chunks.append(current_chunk)
+                current_parts = []
+                estimated_tokens = 0
+    if current_parts:
+        current_chunk = "".join(current_parts)
+        if current_chunk:
             combined_chunks.append(current_chunk)
-            current_chunk = ""
-    if current_chunk:
-        combined_chunks.append(current_chunk)
     return combined_chunks
@@ -0,0 +1,166 @@
+import re
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+from utils.ml_logging import get_logger
+
+# Initialize logging
+logger = get_logger()
+
+Span = Tuple[int, int]
+
+
+class HeadingMatcher:
+    """
+    Aho–Corasick automaton that finds every occurrence of many headings in one linear pass.
+
+    The automaton reports the same positions as an alternation of ``(?=heading)``
+    lookaheads, including overlapping occurrences, without backtracking over the
+    alternatives at every character.
+    """
+
+    def __init__(self, headings: Iterable[str]):
+        """
+        Builds the automaton for the given headings.
+
+        :param headings: The headings to match. Empty headings are ignored.
+        """
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._lengths: List[Tuple[int, ...]] = [()]
+
+        for heading in set(headings):
+            if heading:
+                self._add(heading)
+        self._build_failure_links()
+
+        first_chars = "".join(sorted(self._goto[0]))
+        self._first_char_pattern = (
+            re.compile("[" + re.escape(first_chars) + "]") if first_chars else None
+        )
+
+    def _add(self, heading: str) -> None:
+        """
+        Adds a heading to the trie.
+
+        :param heading: The heading to add.
+        """
+        state = 0
+        for char in heading:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._lengths.append(())
+                self._goto[state][char] = next_state
+            state = next_state
+        self._lengths[state] = self._lengths[state] + (len(heading),)
+
+    def _build_failure_links(self) -> None:
+        """
+        Computes the failure links and merged outputs in breadth-first order.
+        """
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                self._lengths[next_state] = (
+                    self._lengths[next_state] + self._lengths[self._fail[next_state]]
+                )
+
+    def iter_starts(self, text: str) -> Iterator[int]:
+        """
+        Yields the start offset of every heading occurrence, in order of match end.
+
+        :param text: The text to scan.
+        :return: Iterator of start offsets. Offsets may repeat when headings overlap.
+        """
+        if self._first_char_pattern is None:
+            return
+        goto, fail, lengths = self._goto, self._fail, self._lengths
+        search = self._first_char_pattern.search
+        state = 0
+        i = 0
+        text_length = len(text)
+        while i < text_length:
+            if state == 0:
+                # Jump straight to the next character that can start a heading.
+                match = search(text, i)
+                if match is None:
+                    return
+                i = match.start()
+            char = text[i]
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for length in lengths[state]:
+                yield i - length + 1
+            i += 1
+
+    def find_offsets(self, text: str) -> List[int]:
+        """
+        Returns the sorted, unique start offsets of every heading occurrence.
+
+        :param text: The text to scan.
+        :return: Sorted list of start offsets.
+        """
+        return sorted(set(self.iter_starts(text)))
+
+
+def spans_from_offsets(text_length: int, offsets: Iterable[int]) -> List[Span]:
+    """
+    Cuts a text at the given offsets and returns the (start, end) span of every piece.
+
+    The first span always starts at 0, so a cut at offset 0 yields an empty first span,
+    like ``re.split`` does with a lookahead that matches at the beginning of the text.
+
+    :param text_length: The length of the text being cut.
+    :param offsets: The offsets at which to cut.
+    :return: List of (start, end) spans covering the whole text.
+    """
+    cuts = sorted({offset for offset in offsets if 0 <= offset < text_length})
+    boundaries = [0] + cuts + [text_length]
+    return list(zip(boundaries[:-1], boundaries[1:]))
+
+
+def find_heading_spans(text: str, section_headings: List[str]) -> List[Span]:
+    """
+    Splits a text before every occurrence of the given headings, without copying it.
+
+    :param text: The text to be split.
+    :param section_headings: A list of headings used to split the text.
+    :return: List of (start, end) spans of the text chunks.
+    """
+    return spans_from_offsets(
+        len(text), HeadingMatcher(section_headings).iter_starts(text)
+    )
+
+
+def section_spans_from_paragraphs(
+    text_length: int,
+    paragraphs: Iterable[Any],
+    roles: Tuple[str, ...] = ("sectionHeading",),
+) -> List[Span]:
+    """
+    Splits a Document Intelligence result before every section heading paragraph.
+
+    Uses the paragraph spans returned by the service, so no text search is needed. The
+    offsets are only valid for the result content when the document was analyzed with
+    ``string_index_type="unicodeCodePoint"``, which matches Python string indexing.
+
+    :param text_length: The length of the result content.
+    :param paragraphs: The paragraphs of the AnalyzeResult.
+    :param roles: Paragraph roles that start a new section.
+    :return: List of (start, end) spans of the sections.
+    """
+    offsets = [
+        paragraph.spans[0].offset
+        for paragraph in paragraphs
+        if paragraph.role in roles and paragraph.spans
+    ]
+    logger.info(f"Found {len(offsets)} section headings in paragraph spans")
+    return spans_from_offsets(text_length, offsets)
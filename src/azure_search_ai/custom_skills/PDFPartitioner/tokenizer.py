@@ -0,0 +1,242 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+import regex
+import tiktoken
+
+from utils.ml_logging import get_logger
+
+# Initialize logging
+logger = get_logger()
+
+DEFAULT_ENCODING_NAME = "cl100k_base"
+# Pre-tokenization pattern of cl100k_base, as published in tiktoken_ext.openai_public.
+CL100K_BASE_PATTERN = (
+    r"""'(?i:[sdmt]|ll|ve|re)|[^\r\n\p{L}\p{N}]?+\p{L}++|\p{N}{1,3}+|"""
+    r""" ?[^\s\p{L}\p{N}]++[\r\n]*+|\s++$|\s*[\r\n]|\s+(?!\S)|\s"""
+)
+
+
+@lru_cache(maxsize=None)
+def get_encoding(encoding_name: str = DEFAULT_ENCODING_NAME) -> tiktoken.Encoding:
+    """
+    Loads a tiktoken encoding once per process.
+
+    :param encoding_name: The name of the encoding to load. Defaults to "cl100k_base".
+    :return: The cached tiktoken Encoding instance.
+    """
+    logger.info(f"Loading tiktoken encoding {encoding_name}")
+    return tiktoken.get_encoding(encoding_name)
+
+
+def get_split_pattern(encoding: tiktoken.Encoding) -> Optional["regex.Pattern"]:
+    """
+    Compiles the pre-tokenization pattern of an encoding. Tokens never span two of its
+    matches.
+
+    tiktoken only exposes the pattern as a private attribute, so the published pattern of
+    cl100k_base is used when the attribute is missing.
+
+    :param encoding: The tiktoken encoding.
+    :return: The compiled pattern, or None if it is unknown.
+    """
+    pattern = getattr(encoding, "_pat_str", None)
+    if pattern is None and encoding.name == "cl100k_base":
+        pattern = CL100K_BASE_PATTERN
+    if pattern is None:
+        logger.warning(f"Pre-tokenization pattern of {encoding.name} is unavailable")
+        return None
+    return regex.compile(pattern)
+
+
+class TokenizerService:
+    """
+    Token counting service backed by a process-wide tiktoken encoding.
+
+    Counts are memoized in a bounded LRU cache keyed by a hash of the text, so
+    repeated sections (headers, footers, boilerplate) are only encoded once.
+    """
+
+    def __init__(
+        self,
+        encoding_name: str = DEFAULT_ENCODING_NAME,
+        cache_size: int = 65536,
+        num_threads: int = 8,
+        batch_min_chars: int = 4096,
+    ):
+        """
+        Initialize the TokenizerService.
+
+        :param encoding_name: The name of the tiktoken encoding to use.
+        :param cache_size: Maximum number of memoized token counts. Use 0 to disable caching.
+        :param num_threads: Number of threads used by tiktoken for batch encoding.
+        :param batch_min_chars: Average text length, in characters, from which batches are
+            encoded on tiktoken's thread pool. Shorter texts are cheaper to encode in a loop.
+        """
+        self.encoding_name = encoding_name
+        self.encoding = get_encoding(encoding_name)
+        self.split_pattern = get_split_pattern(self.encoding)
+        self.cache_size = cache_size
+        self.num_threads = num_threads
+        self.batch_min_chars = batch_min_chars
+        self._cache: "OrderedDict[bytes, int]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _hash(text: str) -> bytes:
+        """
+        Computes the cache key of a text.
+
+        :param text: The text to hash.
+        :return: The digest used as cache key.
+        """
+        return hashlib.blake2b(
+            text.encode("utf-8", "surrogatepass"), digest_size=16
+        ).digest()
+
+    def _get_cached(self, key: bytes) -> Optional[int]:
+        """
+        Looks up a memoized token count and marks it as recently used.
+
+        :param key: The cache key of the text.
+        :return: The memoized token count, or None if not cached.
+        """
+        with self._lock:
+            count = self._cache.get(key)
+            if count is None:
+                self.misses += 1
+                return None
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return count
+
+    def _set_cached(self, key: bytes, count: int) -> None:
+        """
+        Memoizes a token count, evicting the least recently used entries.
+
+        :param key: The cache key of the text.
+        :param count: The token count to memoize.
+        """
+        if self.cache_size <= 0:
+            return
+        with self._lock:
+            self._cache[key] = count
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def encode(self, text: str) -> List[int]:
+        """
+        Encodes a text into tokens.
+
+        Special tokens such as "<|endoftext|>" are encoded as ordinary text, whereas
+        tiktoken's ``encode`` rejects them by default, so document text can never fail to
+        count or inject a control token.
+
+        :param text: The text to encode.
+        :return: The list of token ids.
+        """
+        return self.encoding.encode_ordinary(text)
+
+    def count_tokens(self, text: str) -> int:
+        """
+        Counts the tokens of a single text, using the memoized count when available.
+
+        :param text: The text to count.
+        :return: The number of tokens in the text.
+        """
+        if not text:
+            return 0
+        key = self._hash(text)
+        count = self._get_cached(key)
+        if count is None:
+            count = len(self.encode(text))
+            self._set_cached(key, count)
+        return count
+
+    def count_tokens_batch(self, texts: List[str]) -> List[int]:
+        """
+        Counts the tokens of many texts, encoding all cache misses in a single batch.
+
+        :param texts: The texts to count.
+        :return: The number of tokens of each text, in input order.
+        """
+        counts: List[Optional[int]] = [None] * len(texts)
+        pending: Dict[bytes, List[int]] = {}
+        pending_texts: List[str] = []
+        for i, text in enumerate(texts):
+            if not text:
+                counts[i] = 0
+                continue
+            key = self._hash(text)
+            if key in pending:
+                pending[key].append(i)
+                continue
+            cached = self._get_cached(key)
+            if cached is not None:
+                counts[i] = cached
+                continue
+            pending[key] = [i]
+            pending_texts.append(text)
+
+        if pending_texts:
+            total_chars = sum(len(text) for text in pending_texts)
+            if total_chars >= self.batch_min_chars * len(pending_texts):
+                encoded = self.encoding.encode_ordinary_batch(
+                    pending_texts, num_threads=self.num_threads
+                )
+                pending_counts = [len(tokens) for tokens in encoded]
+            else:
+                pending_counts = [len(self.encode(text)) for text in pending_texts]
+            for (key, indices), count in zip(pending.items(), pending_counts):
+                self._set_cached(key, count)
+                for i in indices:
+                    counts[i] = count
+        return counts  # type: ignore[return-value]
+
+    def cache_info(self) -> Dict[str, int]:
+        """
+        Returns statistics about the memoized count cache.
+
+        :return: Dictionary with hits, misses, current size and maximum size.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._cache),
+                "max_size": self.cache_size,
+            }
+
+    def clear_cache(self) -> None:
+        """
+        Clears the memoized count cache and resets its statistics.
+        """
+        with self._lock:
+            self._cache.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+_tokenizers: Dict[str, TokenizerService] = {}
+_tokenizers_lock = threading.Lock()
+
+
+def get_tokenizer(encoding_name: str = DEFAULT_ENCODING_NAME) -> TokenizerService:
+    """
+    Returns the process-wide TokenizerService for an encoding.
+
+    :param encoding_name: The name of the tiktoken encoding. Defaults to "cl100k_base".
+    :return: The shared TokenizerService instance.
+    """
+    with _tokenizers_lock:
+        tokenizer = _tokenizers.get(encoding_name)
+        if tokenizer is None:
+            tokenizer = TokenizerService(encoding_name)
+            _tokenizers[encoding_name] = tokenizer
+        return tokenizer
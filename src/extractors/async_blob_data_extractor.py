@@ -0,0 +1,441 @@
+import asyncio
+import os
+import tempfile
+import time
+from typing import IO, Any, AsyncIterator, Awaitable, Dict, List, Optional, Tuple, Union
+from urllib.parse import quote
+
+import aiohttp
+from azure.core.pipeline.transport import AioHttpTransport
+from azure.storage.blob.aio import BlobServiceClient
+from dotenv import load_dotenv
+
+from src.extractors.blob_data_extractor import (
+    blob_properties_to_metadata,
+    local_blob_paths,
+    sign_blob_url,
+)
+from src.extractors.utils import get_container_and_blob_name_from_url
+from utils.ml_logging import get_logger
+
+# Initialize logger
+logger = get_logger()
+
+# aio clients are bound to the event loop of their aiohttp session, so one client is
+# shared per connection string and event loop.
+_shared_clients: Dict[Tuple[str, asyncio.AbstractEventLoop], BlobServiceClient] = {}
+
+
+def get_async_blob_service_client(
+    connection_string: str, max_connections: int = 100
+) -> BlobServiceClient:
+    """
+    Returns the aio BlobServiceClient shared by the running event loop.
+
+    Args:
+        connection_string (str): Connection string of the storage account.
+        max_connections (int): Size of the connection pool, used when the client is
+            created. Defaults to 100.
+
+    Returns:
+        BlobServiceClient: The shared aio client.
+    """
+    key = (connection_string, asyncio.get_running_loop())
+    client = _shared_clients.get(key)
+    if client is None:
+        session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=max_connections)
+        )
+        client = BlobServiceClient.from_connection_string(
+            connection_string,
+            transport=AioHttpTransport(session=session, session_owner=True),
+        )
+        _shared_clients[key] = client
+    return client
+
+
+async def close_async_blob_service_clients() -> None:
+    """
+    Closes the shared aio clients of the running event loop and their connection pools.
+    """
+    loop = asyncio.get_running_loop()
+    for key in [key for key in _shared_clients if key[1] is loop]:
+        await _shared_clients.pop(key).close()
+
+
+class AsyncAzureBlobDataExtractor:
+    """
+    Asynchronous counterpart of AzureBlobDataExtractor, built on the aio client.
+
+    Every extractor of the process shares one pooled client per storage account and event
+    loop, so creating extractors is cheap and blob I/O never blocks the event loop.
+
+    Attributes:
+        container_name (str): Name of the Azure Blob Storage container.
+        connection_string (str): Connection string of the storage account.
+        max_connections (int): Size of the shared connection pool.
+    """
+
+    def __init__(
+        self,
+        container_name: Optional[str] = None,
+        connection_string: Optional[str] = None,
+        max_connections: int = 100,
+    ):
+        """
+        Initialize the AsyncAzureBlobDataExtractor with a container name.
+
+        Args:
+            container_name (str, optional): Name of the Azure Blob Storage container.
+                Defaults to None.
+            connection_string (str, optional): Connection string of the storage account.
+                Defaults to the AZURE_STORAGE_CONNECTION_STRING environment variable.
+            max_connections (int): Size of the shared connection pool. Defaults to 100.
+        """
+        if connection_string is None:
+            load_dotenv()
+            connection_string = os.getenv("AZURE_STORAGE_CONNECTION_STRING")
+        if connection_string is None:
+            logger.error(
+                "AZURE_STORAGE_CONNECTION_STRING not found in environment variables."
+            )
+            raise EnvironmentError(
+                "AZURE_STORAGE_CONNECTION_STRING not found in environment variables."
+            )
+        self.container_name = container_name
+        self.connection_string = connection_string
+        self.max_connections = max_connections
+
+    @property
+    def blob_service_client(self) -> BlobServiceClient:
+        """
+        Returns the aio client shared by the running event loop.
+        """
+        return get_async_blob_service_client(
+            self.connection_string, self.max_connections
+        )
+
+    @property
+    def container_client(self):
+        """
+        Returns the aio container client of the current container.
+        """
+        return self.blob_service_client.get_container_client(self.container_name)
+
+    def change_container(self, new_container_name: str):
+        """
+        Changes the Azure Blob Storage container.
+
+        Args:
+            new_container_name (str): The name of the new container.
+        """
+        self.container_name = new_container_name
+        logger.info(f"Container changed to {new_container_name}")
+
+    async def extract_content(self, file_path: str) -> bytes:
+        """
+        Downloads a blob into memory.
+
+        Args:
+            file_path (str): URL of the blob.
+
+        Returns:
+            bytes: The content of the blob.
+        """
+        container_name, file_name = get_container_and_blob_name_from_url(file_path)
+        try:
+            downloader = await self.blob_service_client.get_blob_client(
+                container=container_name, blob=file_name
+            ).download_blob()
+            blob_data = await downloader.readall()
+            logger.info(f"Successfully downloaded blob file {file_name}")
+        except Exception as e:
+            logger.error(f"Failed to download blob file {file_name}: {e}")
+            raise
+        return blob_data
+
+    async def download_to_temp_file(
+        self, blob_url: str, max_concurrency: int = 4
+    ) -> IO[bytes]:
+        """
+        Streams a blob into an anonymous temporary file, without holding it in memory.
+
+        Args:
+            blob_url (str): URL of the blob.
+            max_concurrency (int): Number of parallel connections of the download.
+
+        Returns:
+            IO[bytes]: The temporary file, positioned at the start. It is deleted when closed.
+        """
+        container_name, blob_name = get_container_and_blob_name_from_url(blob_url)
+        temp_file = tempfile.TemporaryFile()
+        try:
+            downloader = await self.blob_service_client.get_blob_client(
+                container=container_name, blob=blob_name
+            ).download_blob(max_concurrency=max_concurrency)
+            await downloader.readinto(temp_file)
+            temp_file.seek(0)
+        except Exception as e:
+            temp_file.close()
+            logger.error(f"Failed to download blob file {blob_name}: {e}")
+            raise
+        logger.info(f"Successfully streamed blob file {blob_name} to a temporary file")
+        return temp_file
+
+    def generate_sas_url(
+        self, blob_url: str, expiry_minutes: int = 30
+    ) -> Optional[str]:
+        """
+        Signs a blob URL with a short-lived, read-only SAS token.
+
+        See `AzureBlobDataExtractor.generate_sas_url`.
+
+        Args:
+            blob_url (str): URL of the blob.
+            expiry_minutes (int): Lifetime of the token, in minutes. Defaults to 30.
+
+        Returns:
+            Optional[str]: The signed URL, or None if the client cannot sign.
+        """
+        return sign_blob_url(self.blob_service_client, blob_url, expiry_minutes)
+
+    async def extract_metadata(
+        self, blob_url: str
+    ) -> Dict[str, Optional[Union[str, int]]]:
+        """
+        Extracts metadata from a blob in Azure Blob Storage.
+
+        Args:
+            blob_url (str): URL of the blob.
+
+        Returns:
+            Dict: Dictionary with metadata, empty if the blob cannot be read.
+        """
+        container_name, blob_name = get_container_and_blob_name_from_url(blob_url)
+        try:
+            blob_properties = await self.blob_service_client.get_blob_client(
+                container=container_name, blob=blob_name
+            ).get_blob_properties()
+            return blob_properties_to_metadata(blob_url, blob_name, blob_properties)
+        except Exception as e:
+            logger.error(f"Failed to extract metadata for blob {blob_name}: {e}")
+            return {}
+
+    async def iter_blob_metadata(
+        self, folder_path: str = "", results_per_page: int = 5000
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Streams the metadata of every blob under a folder from the listing itself.
+
+        See `AzureBlobDataExtractor.iter_blob_metadata`.
+
+        Args:
+            folder_path (str): Prefix of the blobs within the container.
+            results_per_page (int): Number of blobs per listing page, at most 5000.
+
+        Yields:
+            Dict: The fields of `extract_metadata`, plus the user "metadata" of the blob.
+        """
+        container_url = self.container_client.url.split("?", 1)[0]
+        async for blob in self.container_client.list_blobs(
+            name_starts_with=folder_path or None,
+            include=["metadata"],
+            results_per_page=results_per_page,
+        ):
+            if blob.name.endswith("/"):
+                continue
+            metadata = blob_properties_to_metadata(
+                f"{container_url}/{quote(blob.name, safe='~/')}", blob.name, blob
+            )
+            metadata["metadata"] = blob.metadata or {}
+            yield metadata
+
+    async def download_blob_to_file(
+        self, blob_name: str, local_path: str, max_concurrency: int = 4
+    ) -> int:
+        """
+        Streams a blob of the container into a local file.
+
+        See `AzureBlobDataExtractor.download_blob_to_file`.
+
+        Args:
+            blob_name (str): Name of the blob in the container.
+            local_path (str): Destination file path.
+            max_concurrency (int): Number of parallel range requests for large blobs.
+
+        Returns:
+            int: Number of bytes downloaded.
+        """
+        os.makedirs(os.path.dirname(local_path) or ".", exist_ok=True)
+        temp_path = f"{local_path}.part"
+        try:
+            with open(temp_path, "wb") as file:
+                downloader = await self.container_client.get_blob_client(
+                    blob_name
+                ).download_blob(max_concurrency=max_concurrency)
+                size = await downloader.readinto(file)
+            os.replace(temp_path, local_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        return size
+
+    async def upload_file(
+        self,
+        local_path: str,
+        blob_name: str,
+        overwrite: bool = True,
+        max_concurrency: int = 4,
+    ) -> int:
+        """
+        Streams a local file into a blob of the container.
+
+        Args:
+            local_path (str): Path of the file to upload.
+            blob_name (str): Name of the destination blob.
+            overwrite (bool): Whether to replace an existing blob. Defaults to True.
+            max_concurrency (int): Number of parallel block uploads for large files.
+
+        Returns:
+            int: Number of bytes uploaded.
+        """
+        size = os.path.getsize(local_path)
+        with open(local_path, "rb") as file:
+            await self.container_client.get_blob_client(blob_name).upload_blob(
+                file, length=size, overwrite=overwrite, max_concurrency=max_concurrency
+            )
+        return size
+
+    async def _run_transfers(
+        self, transfers: Dict[str, Awaitable[int]], description: str
+    ) -> Dict[str, Union[int, float, List[str]]]:
+        """
+        Awaits concurrent transfers and reports their throughput.
+
+        Args:
+            transfers (Dict[str, Awaitable[int]]): Transfers by name, each returning the
+                number of bytes transferred.
+            description (str): Description of the transfers, for the log.
+
+        Returns:
+            Dict: Number of files and bytes transferred, elapsed seconds, throughput in
+            bytes per second, and the names of the transfers that failed.
+        """
+        start_time = time.perf_counter()
+        names = list(transfers)
+        results = await asyncio.gather(*transfers.values(), return_exceptions=True)
+        total_bytes = 0
+        failed: List[str] = []
+        for name, result in zip(names, results):
+            if isinstance(result, BaseException):
+                logger.error(f"Failed to transfer {name}: {result}")
+                failed.append(name)
+            else:
+                total_bytes += result
+        elapsed = time.perf_counter() - start_time
+        stats = {
+            "files": len(names) - len(failed),
+            "bytes": total_bytes,
+            "seconds": elapsed,
+            "bytes_per_second": total_bytes / elapsed if elapsed > 0 else 0.0,
+            "failed": failed,
+        }
+        logger.info(
+            f"{description} {stats['files']} files ({total_bytes / 1024**2:.1f} MiB) "
+            f"in {elapsed:.2f}s, {stats['bytes_per_second'] / 1024**2:.1f} MiB/s"
+        )
+        return stats
+
+    async def download_files_to_folder(
+        self,
+        folder_path: str,
+        local_dir: str,
+        max_in_flight: int = 8,
+        max_concurrency: int = 4,
+        flatten: bool = False,
+    ) -> Dict[str, Union[int, float, List[str]]]:
+        """
+        Downloads all files from a specified folder in Azure Blob Storage to a local directory.
+
+        See `AzureBlobDataExtractor.download_files_to_folder`.
+
+        Args:
+            folder_path (str): The path to the folder within the blob container. Use an
+                empty string for the whole container.
+            local_dir (str): The local directory to which the files will be downloaded.
+            max_in_flight (int): Number of blobs downloaded at once. Defaults to 8.
+            max_concurrency (int): Number of parallel range requests for each large blob.
+            flatten (bool): Whether to save every file directly in `local_dir`.
+
+        Returns:
+            Dict: Transfer statistics, see `_run_transfers`.
+        """
+        if folder_path and not folder_path.endswith("/"):
+            folder_path += "/"
+        blob_names = [
+            blob.name
+            async for blob in self.container_client.list_blobs(
+                name_starts_with=folder_path
+            )
+            if not blob.name.endswith("/")
+        ]
+        local_paths = local_blob_paths(blob_names, folder_path, local_dir, flatten)
+        semaphore = asyncio.Semaphore(max_in_flight)
+
+        async def download(blob_name: str) -> int:
+            if blob_name not in local_paths:
+                raise ValueError(f"Blob {blob_name} resolves outside {local_dir}")
+            async with semaphore:
+                return await self.download_blob_to_file(
+                    blob_name, local_paths[blob_name], max_concurrency
+                )
+
+        return await self._run_transfers(
+            {blob_name: download(blob_name) for blob_name in blob_names},
+            f"Downloaded to {local_dir}",
+        )
+
+    async def upload_files_from_folder(
+        self,
+        local_dir: str,
+        folder_path: str = "",
+        max_in_flight: int = 8,
+        max_concurrency: int = 4,
+        overwrite: bool = True,
+    ) -> Dict[str, Union[int, float, List[str]]]:
+        """
+        Uploads all files of a local directory, recursively, under a folder of the container.
+
+        Args:
+            local_dir (str): The local directory to upload.
+            folder_path (str): The destination folder within the blob container.
+            max_in_flight (int): Number of files uploaded at once. Defaults to 8.
+            max_concurrency (int): Number of parallel block uploads for each large file.
+            overwrite (bool): Whether to replace existing blobs. Defaults to True.
+
+        Returns:
+            Dict: Transfer statistics, see `_run_transfers`.
+        """
+        if folder_path and not folder_path.endswith("/"):
+            folder_path += "/"
+        blob_paths = {}
+        for root, _, files in os.walk(local_dir):
+            for file_name in files:
+                local_path = os.path.join(root, file_name)
+                relative_path = os.path.relpath(local_path, local_dir)
+                blob_paths[folder_path + relative_path.replace(os.sep, "/")] = (
+                    local_path
+                )
+        semaphore = asyncio.Semaphore(max_in_flight)
+
+        async def upload(blob_name: str) -> int:
+            async with semaphore:
+                return await self.upload_file(
+                    blob_paths[blob_name], blob_name, overwrite, max_concurrency
+                )
+
+        return await self._run_transfers(
+            {blob_name: upload(blob_name) for blob_name in blob_paths},
+            f"Uploaded from {local_dir}",
+        )
@@ -0,0 +1,124 @@
+import hashlib
+import mmap
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit, urlunsplit
+
+from src.extractors.disk_cache import BytesLike, DiskLRUCache
+from utils.ml_logging import get_logger
+
+# Initialize logger
+logger = get_logger()
+
+# Each entry starts with the ETag of the cached blob content, followed by a newline.
+ETAG_SEPARATOR = b"\n"
+
+
+class BlobContentCache:
+    """
+    Read-through cache of blob contents on the local disk, validated with ETags.
+
+    Entries are keyed by blob URL, without the query string so SAS tokens do not split
+    the cache, and store the ETag of the content next to it. Hits are returned as
+    read-only memory-mapped views, so repeated reads do not copy the blob into memory.
+
+    Attributes:
+        cache (DiskLRUCache): The size-bounded store of the entries.
+        revalidations (int): Hits confirmed unchanged by the service (304 responses).
+        refreshes (int): Hits replaced because the blob changed.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str,
+        max_size_bytes: int = 1024**3,
+        ttl_seconds: Optional[float] = None,
+    ):
+        """
+        Initialize the BlobContentCache.
+
+        Args:
+            cache_dir (str): Directory holding the cached blobs. Created if missing.
+            max_size_bytes (int): Maximum total size of the cached blobs. Defaults to 1 GiB.
+            ttl_seconds (float, optional): Lifetime of an entry. Defaults to None.
+        """
+        self.cache = DiskLRUCache(
+            cache_dir, max_size_bytes, ttl_seconds=ttl_seconds, suffix=".blob"
+        )
+        self.revalidations = 0
+        self.refreshes = 0
+
+    @staticmethod
+    def key_for(blob_url: str) -> str:
+        """
+        Returns the cache key of a blob URL, ignoring its query string.
+
+        Args:
+            blob_url (str): URL of the blob.
+
+        Returns:
+            str: The SHA-256 hex digest of the URL.
+        """
+        scheme, netloc, path, _, _ = urlsplit(blob_url)
+        return hashlib.sha256(
+            urlunsplit((scheme, netloc, path, "", "")).encode("utf-8")
+        ).hexdigest()
+
+    def get(self, blob_url: str) -> Optional[Tuple[str, memoryview]]:
+        """
+        Looks up a blob and maps its cached content into memory.
+
+        Args:
+            blob_url (str): URL of the blob.
+
+        Returns:
+            Optional[Tuple[str, memoryview]]: The ETag and a read-only view of the
+            content, or None on a miss. The mapping is released with the view.
+        """
+        key = self.key_for(blob_url)
+        path = self.cache.get_path(key)
+        if path is None:
+            return None
+        try:
+            with open(path, "rb") as file:
+                mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (FileNotFoundError, ValueError):
+            # The entry was evicted meanwhile, or is empty and cannot be mapped.
+            self.cache.delete(key)
+            return None
+        header_end = mapped.find(ETAG_SEPARATOR)
+        if header_end < 0:
+            logger.warning(f"Discarding malformed cache entry of {blob_url}")
+            mapped.close()
+            self.cache.delete(key)
+            return None
+        etag = mapped[:header_end].decode("utf-8")
+        return etag, memoryview(mapped)[header_end + len(ETAG_SEPARATOR) :]
+
+    def put(self, blob_url: str, etag: str, data: BytesLike) -> None:
+        """
+        Caches the content of a blob.
+
+        Args:
+            blob_url (str): URL of the blob.
+            etag (str): ETag of the content.
+            data (BytesLike): The content.
+        """
+        if not etag:
+            return
+        # The header and the content are written one after the other, so large blobs
+        # are not copied into a second buffer.
+        self.cache.put_parts(
+            self.key_for(blob_url), (etag.encode("utf-8") + ETAG_SEPARATOR, data)
+        )
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns the cache counters and usage.
+
+        Returns:
+            Dict[str, int]: The DiskLRUCache stats, with revalidations and refreshes.
+        """
+        stats = self.cache.stats()
+        stats["revalidations"] = self.revalidations
+        stats["refreshes"] = self.refreshes
+        return stats
@@ -0,0 +1,183 @@
+import os
+import threading
+from typing import Dict, Optional, Tuple
+
+import requests
+from azure.core.pipeline.transport import RequestsTransport
+from azure.storage.blob import BlobServiceClient, ContainerClient
+from requests.adapters import HTTPAdapter
+
+from utils.ml_logging import get_logger
+
+# Initialize logger
+logger = get_logger()
+
+DEFAULT_POOL_CONNECTIONS = int(os.getenv("AZURE_BLOB_POOL_CONNECTIONS", "10"))
+DEFAULT_POOL_MAXSIZE = int(os.getenv("AZURE_BLOB_POOL_MAXSIZE", "64"))
+
+
+class BlobClientRegistry:
+    """
+    Process-wide registry of Blob Storage clients, so managers share connection pools.
+
+    One BlobServiceClient, with its own HTTP session and connection pool, is created per
+    connection string, and one ContainerClient per connection string and container. The
+    container clients reuse the transport of their service client, so every manager of
+    the process talking to the same account shares connections and TLS sessions.
+
+    Attributes:
+        pool_connections (int): Number of host pools kept by each HTTP session.
+        pool_maxsize (int): Maximum number of connections kept open per host.
+    """
+
+    def __init__(
+        self,
+        pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+    ):
+        """
+        Initialize the BlobClientRegistry.
+
+        Args:
+            pool_connections (int): Number of host pools kept by each HTTP session.
+                Defaults to the AZURE_BLOB_POOL_CONNECTIONS environment variable, or 10.
+            pool_maxsize (int): Maximum number of connections kept open per host. Should
+                be at least the number of threads using the clients. Defaults to the
+                AZURE_BLOB_POOL_MAXSIZE environment variable, or 64.
+        """
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self._lock = threading.Lock()
+        self._sessions: Dict[str, requests.Session] = {}
+        self._service_clients: Dict[str, BlobServiceClient] = {}
+        self._container_clients: Dict[Tuple[str, str], ContainerClient] = {}
+
+    def _create_session(self) -> requests.Session:
+        """
+        Creates an HTTP session with the configured pool sizes.
+
+        Returns:
+            requests.Session: The session.
+        """
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_connections, pool_maxsize=self.pool_maxsize
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def get_blob_service_client(self, connection_string: str) -> BlobServiceClient:
+        """
+        Returns the shared BlobServiceClient of a storage account.
+
+        Args:
+            connection_string (str): Connection string of the storage account.
+
+        Returns:
+            BlobServiceClient: The shared client.
+        """
+        with self._lock:
+            client = self._service_clients.get(connection_string)
+            if client is None:
+                session = self._create_session()
+                client = BlobServiceClient.from_connection_string(
+                    connection_string,
+                    transport=RequestsTransport(session=session, session_owner=False),
+                )
+                self._sessions[connection_string] = session
+                self._service_clients[connection_string] = client
+                logger.info(
+                    f"Created shared BlobServiceClient for {client.account_name} "
+                    f"(pool_maxsize={self.pool_maxsize})"
+                )
+            return client
+
+    def get_container_client(
+        self, connection_string: str, container_name: str
+    ) -> ContainerClient:
+        """
+        Returns the shared ContainerClient of a container.
+
+        Args:
+            connection_string (str): Connection string of the storage account.
+            container_name (str): Name of the container.
+
+        Returns:
+            ContainerClient: The shared client, on the transport of the account client.
+        """
+        key = (connection_string, container_name)
+        client = self._container_clients.get(key)
+        if client is None:
+            service_client = self.get_blob_service_client(connection_string)
+            with self._lock:
+                client = self._container_clients.setdefault(
+                    key, service_client.get_container_client(container_name)
+                )
+        return client
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns the number of shared clients and sessions.
+
+        Returns:
+            Dict[str, int]: Counts of service clients, container clients and sessions.
+        """
+        with self._lock:
+            return {
+                "service_clients": len(self._service_clients),
+                "container_clients": len(self._container_clients),
+                "sessions": len(self._sessions),
+            }
+
+    def close(self) -> None:
+        """
+        Closes every shared session and forgets the clients.
+        """
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+            self._service_clients.clear()
+            self._container_clients.clear()
+
+
+_registry: Optional[BlobClientRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_blob_client_registry() -> BlobClientRegistry:
+    """
+    Returns the process-wide BlobClientRegistry, creating it on first use.
+
+    Returns:
+        BlobClientRegistry: The shared registry.
+    """
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = BlobClientRegistry()
+        return _registry
+
+
+def configure_blob_client_registry(
+    pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+    pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+) -> BlobClientRegistry:
+    """
+    Replaces the process-wide registry with one using the given pool sizes.
+
+    Should be called at startup, before any extractor is created. Clients created by the
+    previous registry keep working but are no longer shared.
+
+    Args:
+        pool_connections (int): Number of host pools kept by each HTTP session.
+        pool_maxsize (int): Maximum number of connections kept open per host.
+
+    Returns:
+        BlobClientRegistry: The new registry.
+    """
+    global _registry
+    with _registry_lock:
+        _registry = BlobClientRegistry(pool_connections, pool_maxsize)
+        return _registry
@@ -1,17 +1,215 @@
+import base64
+import hashlib
+import mimetypes
 import os
 import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta, timezone
 from io import BytesIO
-from typing import Dict, List, Optional, Union
+from typing import IO, Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+from urllib.parse import quote
 
-from azure.storage.blob import BlobServiceClient
+from azure.core import MatchConditions
+from azure.core.exceptions import HttpResponseError, ResourceNotFoundError
+from azure.storage.blob import (
+    BlobBlock,
+    BlobClient,
+    BlobPrefix,
+    BlobSasPermissions,
+    ContentSettings,
+    generate_blob_sas,
+)
 from dotenv import load_dotenv
 
+from src.extractors.blob_cache import BlobContentCache
+from src.extractors.blob_client_registry import (
+    BlobClientRegistry,
+    get_blob_client_registry,
+)
+from src.extractors.blob_index import BlobIndexDelta, BlobMetadataIndex
 from src.extractors.utils import get_container_and_blob_name_from_url
 from utils.ml_logging import get_logger
 
 # Initialize logger
 logger = get_logger()
 
+# Content uploaded in a single request up to this size, and in staged blocks above it.
+DEFAULT_BLOCK_SIZE = 8 * 1024 * 1024
+
+# Batches with up to this many blobs in a folder read their Content-MD5 blob by blob
+# instead of listing the folder.
+MD5_LOOKUP_LIMIT = 16
+
+# File name of the manifest kept by sync_folder in the local directory.
+DEFAULT_MANIFEST_NAME = ".blob_manifest.jsonl"
+
+# Local file path, or in-memory content.
+UploadData = Union[str, bytes, bytearray, memoryview]
+
+
+def sign_blob_url(
+    blob_service_client: Any, blob_url: str, expiry_minutes: int = 30
+) -> Optional[str]:
+    """
+    Signs a blob URL with a short-lived, read-only SAS token.
+
+    Shared by the synchronous and asynchronous extractors, as signing does no I/O.
+
+    Args:
+        blob_service_client: A sync or aio BlobServiceClient of the storage account.
+        blob_url (str): URL of the blob.
+        expiry_minutes (int): Lifetime of the token, in minutes. Defaults to 30.
+
+    Returns:
+        Optional[str]: The signed URL, or None if the client cannot sign.
+    """
+    if "?" in blob_url:
+        return blob_url
+    account_key = getattr(blob_service_client.credential, "account_key", None)
+    if not account_key:
+        logger.warning("No storage account key available to sign a SAS token.")
+        return None
+    container_name, blob_name = get_container_and_blob_name_from_url(blob_url)
+    now = datetime.now(timezone.utc)
+    sas_token = generate_blob_sas(
+        account_name=blob_service_client.account_name,
+        container_name=container_name,
+        blob_name=blob_name,
+        account_key=account_key,
+        permission=BlobSasPermissions(read=True),
+        # Tolerate clock skew between this machine and the storage service.
+        start=now - timedelta(minutes=5),
+        expiry=now + timedelta(minutes=expiry_minutes),
+    )
+    blob_client = blob_service_client.get_blob_client(
+        container=container_name, blob=blob_name
+    )
+    return f"{blob_client.url}?{sas_token}"
+
+
+def blob_properties_to_metadata(
+    blob_url: str, blob_name: str, blob_properties: Any
+) -> Dict[str, Optional[Union[str, int]]]:
+    """
+    Extracts the metadata returned by extract_metadata from blob properties.
+
+    Args:
+        blob_url (str): URL of the blob.
+        blob_name (str): Name of the blob.
+        blob_properties (BlobProperties): Properties of the blob.
+
+    Returns:
+        Dict: URL, name, size, content type, last modification time and ETag.
+    """
+    return {
+        "url": blob_url,
+        "name": blob_name,
+        "size": blob_properties.size,
+        "content_type": blob_properties.content_settings.content_type,
+        "last_modified": blob_properties.last_modified,
+        "etag": blob_properties.etag,
+        # Add other properties as needed
+    }
+
+
+def local_blob_paths(
+    blob_names: List[str], folder_path: str, local_dir: str, flatten: bool = False
+) -> Dict[str, str]:
+    """
+    Maps the blobs of a folder to local file paths.
+
+    Blob names can contain ".." segments, so names that would resolve outside
+    `local_dir` are left out of the mapping, with a warning.
+
+    Args:
+        blob_names (List[str]): Names of the blobs, all starting with `folder_path`.
+        folder_path (str): The folder prefix, ending with "/" unless empty.
+        local_dir (str): The local destination directory.
+        flatten (bool): Whether to use the base names only. Defaults to False.
+
+    Returns:
+        Dict[str, str]: Mapping of the blob names that stay within `local_dir` to
+        local file paths.
+    """
+    root = os.path.realpath(local_dir)
+    local_paths = {}
+    for blob_name in blob_names:
+        relative_path = blob_name[len(folder_path) :]
+        local_path = (
+            os.path.join(local_dir, os.path.basename(relative_path))
+            if flatten
+            else os.path.join(local_dir, *relative_path.split("/"))
+        )
+        resolved_path = os.path.realpath(local_path)
+        if resolved_path == root or os.path.commonpath([root, resolved_path]) != root:
+            logger.warning(
+                f"Skipping blob {blob_name}, it resolves outside {local_dir}"
+            )
+            continue
+        local_paths[blob_name] = local_path
+    return local_paths
+
+
+def upload_data_size(data: UploadData) -> int:
+    """
+    Returns the size of upload content.
+
+    Args:
+        data (UploadData): Local file path, or in-memory content.
+
+    Returns:
+        int: The size in bytes.
+    """
+    if isinstance(data, str):
+        return os.path.getsize(data)
+    return memoryview(data).nbytes
+
+
+def read_upload_range(data: UploadData, offset: int, length: int) -> bytes:
+    """
+    Reads a range of upload content.
+
+    Files are opened by each call, so ranges can be read from several threads at once.
+
+    Args:
+        data (UploadData): Local file path, or in-memory content.
+        offset (int): Offset of the range.
+        length (int): Length of the range.
+
+    Returns:
+        bytes: The content of the range.
+    """
+    if isinstance(data, str):
+        with open(data, "rb") as file:
+            file.seek(offset)
+            return file.read(length)
+    return bytes(memoryview(data)[offset : offset + length])
+
+
+def content_md5(data: UploadData, chunk_size: int = DEFAULT_BLOCK_SIZE) -> bytes:
+    """
+    Computes the MD5 digest of upload content, reading files in chunks.
+
+    MD5 is what Blob Storage keeps in the Content-MD5 property, so digests can be
+    compared with the listing without downloading the blobs.
+
+    Args:
+        data (UploadData): Local file path, or in-memory content.
+        chunk_size (int): Size of the chunks read from files.
+
+    Returns:
+        bytes: The digest.
+    """
+    digest = hashlib.md5()
+    if isinstance(data, str):
+        with open(data, "rb") as file:
+            for chunk in iter(lambda: file.read(chunk_size), b""):
+                digest.update(chunk)
+    else:
+        digest.update(data)
+    return digest.digest()
+
 
 class AzureBlobDataExtractor:
     """
@@ -24,16 +222,35 @@ class AzureBlobDataExtractor:
         container_client: Azure Container Client specific to the container.
     """
 
-    def __init__(self, container_name: Optional[str] = None):
+    def __init__(
+        self,
+        container_name: Optional[str] = None,
+        connection_string: Optional[str] = None,
+        registry: Optional[BlobClientRegistry] = None,
+        blob_cache: Optional[BlobContentCache] = None,
+    ):
         """
         Initialize the AzureBlobManager with a container name.
 
+        Clients come from a registry shared by the whole process, so every extractor of
+        the same storage account reuses one connection pool.
+
         Args:
             container_name (str, optional): Name of the Azure Blob Storage container. Defaults to None.
+            connection_string (str, optional): Connection string of the storage account.
+                Defaults to the AZURE_STORAGE_CONNECTION_STRING environment variable.
+            registry (BlobClientRegistry, optional): Registry of the shared clients.
+                Defaults to the process-wide registry.
+            blob_cache (BlobContentCache, optional): Read-through cache used by
+                `extract_content`. Defaults to None, which downloads every time.
         """
         try:
-            load_dotenv()
-            connect_str = os.getenv("AZURE_STORAGE_CONNECTION_STRING")
+            connect_str = connection_string or os.getenv(
+                "AZURE_STORAGE_CONNECTION_STRING"
+            )
+            if connect_str is None:
+                load_dotenv()
+                connect_str = os.getenv("AZURE_STORAGE_CONNECTION_STRING")
             if connect_str is None:
                 logger.error(
                     "AZURE_STORAGE_CONNECTION_STRING not found in environment variables."
@@ -42,12 +259,15 @@ class AzureBlobDataExtractor:
                     "AZURE_STORAGE_CONNECTION_STRING not found in environment variables."
                 )
             self.container_name = container_name
-            self.blob_service_client = BlobServiceClient.from_connection_string(
+            self.connection_string = connect_str
+            self.blob_cache = blob_cache
+            self.registry = registry or get_blob_client_registry()
+            self.blob_service_client = self.registry.get_blob_service_client(
                 connect_str
             )
             if container_name:
-                self.container_client = self.blob_service_client.get_container_client(
-                    container_name
+                self.container_client = self.registry.get_container_client(
+                    connect_str, container_name
                 )
         except Exception as e:
             logger.error(f"Error initializing AzureBlobManager: {e}")
@@ -61,35 +281,127 @@ class AzureBlobDataExtractor:
             new_container_name (str): The name of the new container.
         """
         self.container_name = new_container_name
-        self.container_client = self.blob_service_client.get_container_client(
-            new_container_name
+        self.container_client = self.registry.get_container_client(
+            self.connection_string, new_container_name
         )
         logger.info(f"Container changed to {new_container_name}")
 
-    def extract_content(self, file_path: str) -> bytes:
+    def extract_content(self, file_path: str) -> Union[bytes, memoryview]:
         """
-        Downloads blobs from a container.
+        Downloads the content of a blob.
+
+        With a blob cache, a cached copy is revalidated with a conditional request
+        (If-None-Match) and returned as a memory-mapped view when it is still current.
 
-        :param filenames: List of filenames to be downloaded from the blob.
-        :return: List of BytesIO objects representing the downloaded blobs.
+        Args:
+            file_path (str): URL of the blob.
+
+        Returns:
+            Union[bytes, memoryview]: The content of the blob, or a read-only view of
+            its cached copy.
+
+        Raises:
+            Exception: The error of the download, after logging it.
         """
         (
             container_name,
             file_name,
         ) = get_container_and_blob_name_from_url(file_path)
         try:
-            blob_data = (
-                self.blob_service_client.get_blob_client(
-                    container=container_name, blob=file_name
-                )
-                .download_blob()
-                .readall()
+            blob_client = self.blob_service_client.get_blob_client(
+                container=container_name, blob=file_name
             )
+            if self.blob_cache is None:
+                blob_data = blob_client.download_blob().readall()
+            else:
+                blob_data = self._read_through_cache(blob_client, file_path)
             logger.info(f"Successfully downloaded blob file {file_name}")
         except Exception as e:
             logger.error(f"Failed to download blob file {file_name}: {e}")
+            raise
         return blob_data
 
+    def _read_through_cache(
+        self, blob_client: BlobClient, blob_url: str
+    ) -> Union[bytes, memoryview]:
+        """
+        Reads a blob through the blob cache.
+
+        Args:
+            blob_client (BlobClient): Client of the blob.
+            blob_url (str): URL of the blob, the key of the cache entry.
+
+        Returns:
+            Union[bytes, memoryview]: A view of the cached copy if the blob is unchanged,
+            otherwise the downloaded content, which replaces the cached copy.
+        """
+        cached = self.blob_cache.get(blob_url)
+        if cached is None:
+            downloader = blob_client.download_blob()
+        else:
+            etag, view = cached
+            try:
+                downloader = blob_client.download_blob(
+                    etag=etag, match_condition=MatchConditions.IfModified
+                )
+            except HttpResponseError as e:
+                if e.status_code != 304:
+                    raise
+                self.blob_cache.revalidations += 1
+                logger.info(f"Cached copy of {blob_client.blob_name} is current")
+                return view
+            view.release()
+            self.blob_cache.refreshes += 1
+        blob_data = downloader.readall()
+        self.blob_cache.put(blob_url, downloader.properties.etag, blob_data)
+        return blob_data
+
+    def download_to_temp_file(
+        self, blob_url: str, max_concurrency: int = 4
+    ) -> IO[bytes]:
+        """
+        Streams a blob into an anonymous temporary file, without holding it in memory.
+
+        Args:
+            blob_url (str): URL of the blob.
+            max_concurrency (int): Number of parallel connections of the download.
+
+        Returns:
+            IO[bytes]: The temporary file, positioned at the start. It is deleted when closed.
+        """
+        container_name, blob_name = get_container_and_blob_name_from_url(blob_url)
+        temp_file = tempfile.TemporaryFile()
+        try:
+            self.blob_service_client.get_blob_client(
+                container=container_name, blob=blob_name
+            ).download_blob(max_concurrency=max_concurrency).readinto(temp_file)
+            temp_file.seek(0)
+        except Exception as e:
+            temp_file.close()
+            logger.error(f"Failed to download blob file {blob_name}: {e}")
+            raise
+        logger.info(f"Successfully streamed blob file {blob_name} to a temporary file")
+        return temp_file
+
+    def generate_sas_url(
+        self, blob_url: str, expiry_minutes: int = 30
+    ) -> Optional[str]:
+        """
+        Signs a blob URL with a short-lived, read-only SAS token.
+
+        A service can then read the blob directly, without the content going through this
+        process. URLs that already carry a SAS token are returned as they are.
+
+        Args:
+            blob_url (str): URL of the blob.
+            expiry_minutes (int): Lifetime of the token, in minutes. Defaults to 30.
+
+        Returns:
+            Optional[str]: The signed URL, or None if the client was not created from an
+            account key and cannot sign.
+        """
+        return sign_blob_url(self.blob_service_client, blob_url, expiry_minutes)
+
     def extract_metadata(self, blob_url: str) -> Dict[str, Optional[Union[str, int]]]:
         """
         Extracts metadata from a blob in Azure Blob Storage.
@@ -103,20 +415,89 @@ class AzureBlobDataExtractor:
                 container=container_name, blob=blob_name
             )
             blob_properties = blob_client.get_blob_properties()
-
-            # Extracting available metadata
-            return {
-                "url": blob_url,
-                "name": blob_name,
-                "size": blob_properties.size,
-                "content_type": blob_properties.content_settings.content_type,
-                "last_modified": blob_properties.last_modified,
-                # Add other properties as needed
-            }
+            return blob_properties_to_metadata(blob_url, blob_name, blob_properties)
         except Exception as e:
             logger.error(f"Failed to extract metadata for blob {blob_name}: {e}")
             return {}
 
+    def iter_blob_metadata(
+        self, folder_path: str = "", results_per_page: int = 5000
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Streams the metadata of every blob under a folder from the listing itself.
+
+        One paginated `list_blobs` request returns the properties and user metadata of
+        up to `results_per_page` blobs, instead of one `get_blob_properties` call per
+        blob. Pages are fetched lazily as the generator is consumed.
+
+        Args:
+            folder_path (str): Prefix of the blobs within the container. Defaults to
+                the whole container.
+            results_per_page (int): Number of blobs per listing page, at most 5000.
+
+        Yields:
+            Dict: The fields of `extract_metadata`, plus the user "metadata" of the blob.
+        """
+        container_url = self.container_client.url.split("?", 1)[0]
+        for blob in self.container_client.list_blobs(
+            name_starts_with=folder_path or None,
+            include=["metadata"],
+            results_per_page=results_per_page,
+        ):
+            if blob.name.endswith("/"):
+                continue
+            metadata = blob_properties_to_metadata(
+                f"{container_url}/{quote(blob.name, safe='~/')}", blob.name, blob
+            )
+            metadata["metadata"] = blob.metadata or {}
+            yield metadata
+
+    def extract_metadata_bulk(
+        self, folder_path: str = "", results_per_page: int = 5000
+    ) -> List[Dict[str, Any]]:
+        """
+        Extracts the metadata of every blob under a folder with paginated listing calls.
+
+        See `iter_blob_metadata` to stream large containers instead.
+
+        Args:
+            folder_path (str): Prefix of the blobs within the container.
+            results_per_page (int): Number of blobs per listing page, at most 5000.
+
+        Returns:
+            List[Dict]: The metadata of each blob.
+        """
+        metadata = list(self.iter_blob_metadata(folder_path, results_per_page))
+        logger.info(f"Listed metadata of {len(metadata)} blobs under '{folder_path}'")
+        return metadata
+
+    def scan_metadata(
+        self, index_path: str, folder_path: str = "", results_per_page: int = 5000
+    ) -> BlobIndexDelta:
+        """
+        Rescans a folder against a local index file and records the new state.
+
+        Blobs are compared by ETag and size, so callers can reprocess only the blobs
+        that were added or modified since the previous scan.
+
+        Args:
+            index_path (str): Path of the index file, created on the first scan.
+            folder_path (str): Prefix of the blobs within the container.
+            results_per_page (int): Number of blobs per listing page, at most 5000.
+
+        Returns:
+            BlobIndexDelta: The names of the added, modified, deleted and unchanged blobs.
+        """
+        index = BlobMetadataIndex(index_path)
+        # Entries outside the listed prefix are kept, not reported as deleted.
+        delta = index.update(
+            self.iter_blob_metadata(folder_path, results_per_page),
+            scope=lambda blob_name: blob_name.startswith(folder_path),
+        )
+        index.save()
+        logger.info(f"Scanned '{folder_path}': {delta.summary()}")
+        return delta
+
     def format_metadata(self, metadata: Dict) -> Dict:
         """
         Format and return file metadata.
@@ -161,31 +542,463 @@ class AzureBlobDataExtractor:
                 )
         return temp_files
 
-    def download_files_to_folder(self, folder_path: str, local_dir: str) -> None:
+    def download_blob_to_file(
+        self, blob_name: str, local_path: str, max_concurrency: int = 4
+    ) -> int:
+        """
+        Streams a blob of the container into a local file.
+
+        The blob is written to a temporary file next to the destination, then renamed, so
+        an interrupted download never leaves a partial file behind.
+
+        Args:
+            blob_name (str): Name of the blob in the container.
+            local_path (str): Destination file path.
+            max_concurrency (int): Number of parallel range requests for large blobs.
+
+        Returns:
+            int: Number of bytes downloaded.
+        """
+        os.makedirs(os.path.dirname(local_path) or ".", exist_ok=True)
+        temp_path = f"{local_path}.part"
+        try:
+            with open(temp_path, "wb") as file:
+                size = (
+                    self.container_client.get_blob_client(blob_name)
+                    .download_blob(max_concurrency=max_concurrency)
+                    .readinto(file)
+                )
+            os.replace(temp_path, local_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        return size
+
+    def _download_blobs(
+        self, local_paths: Dict[str, str], max_workers: int, max_concurrency: int
+    ) -> Tuple[int, List[str]]:
+        """
+        Downloads blobs of the container concurrently.
+
+        Args:
+            local_paths (Dict[str, str]): Destination file paths, keyed by blob name.
+            max_workers (int): Number of blobs downloaded at once.
+            max_concurrency (int): Number of parallel range requests for each large blob.
+
+        Returns:
+            Tuple[int, List[str]]: Number of bytes downloaded, and the names of the blobs
+            that failed.
+        """
+        total_bytes = 0
+        failed: List[str] = []
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(
+                    self.download_blob_to_file,
+                    blob_name,
+                    local_path,
+                    max_concurrency,
+                ): blob_name
+                for blob_name, local_path in local_paths.items()
+            }
+            for future in as_completed(futures):
+                blob_name = futures[future]
+                try:
+                    total_bytes += future.result()
+                    logger.info(f"Downloaded {blob_name}")
+                except Exception as e:
+                    logger.error(f"Failed to download blob file {blob_name}: {e}")
+                    failed.append(blob_name)
+        return total_bytes, failed
+
+    def download_files_to_folder(
+        self,
+        folder_path: str,
+        local_dir: str,
+        max_workers: int = 8,
+        max_concurrency: int = 4,
+        flatten: bool = False,
+    ) -> Dict[str, Union[int, float, List[str]]]:
         """
         Downloads all files from a specified folder in Azure Blob Storage to a local directory.
 
+        Only the blobs under the folder are listed. Blobs are downloaded concurrently and
+        streamed to disk, keeping their path relative to the folder unless `flatten`.
+
         Args:
-            folder_path (str): The path to the folder within the blob container.
+            folder_path (str): The path to the folder within the blob container. Use an
+                empty string for the whole container.
             local_dir (str): The local directory to which the files will be downloaded.
+            max_workers (int): Number of blobs downloaded at once. Defaults to 8.
+            max_concurrency (int): Number of parallel range requests for each large blob.
+                Defaults to 4.
+            flatten (bool): Whether to save every file directly in `local_dir`, under
+                its base name. Defaults to False.
+
+        Returns:
+            Dict: Number of files and bytes downloaded, elapsed seconds, throughput in
+            bytes per second, and the names of the blobs that failed.
+        """
+        # Ensure folder path ends with a '/'
+        if folder_path and not folder_path.endswith("/"):
+            folder_path += "/"
+        logger.info(f"Folder path {folder_path}")
+
+        start_time = time.perf_counter()
+        blob_names = [
+            blob.name
+            for blob in self.container_client.list_blobs(name_starts_with=folder_path)
+            if not blob.name.endswith("/")
+        ]
+        local_paths = local_blob_paths(blob_names, folder_path, local_dir, flatten)
+        total_bytes, failed = self._download_blobs(
+            local_paths, max_workers, max_concurrency
+        )
+        failed.extend(name for name in blob_names if name not in local_paths)
+
+        elapsed = time.perf_counter() - start_time
+        stats = {
+            "files": len(blob_names) - len(failed),
+            "bytes": total_bytes,
+            "seconds": elapsed,
+            "bytes_per_second": total_bytes / elapsed if elapsed > 0 else 0.0,
+            "failed": failed,
+        }
+        logger.info(
+            f"Downloaded {stats['files']} files ({total_bytes / 1024**2:.1f} MiB) "
+            f"to {local_dir} in {elapsed:.2f}s, "
+            f"{stats['bytes_per_second'] / 1024**2:.1f} MiB/s"
+        )
+        return stats
+
+    def sync_folder(
+        self,
+        folder_path: str,
+        local_dir: str,
+        max_workers: int = 8,
+        max_concurrency: int = 4,
+        flatten: bool = False,
+        delete: bool = False,
+        blob_filter: Optional[Callable[[str], bool]] = None,
+        manifest_name: str = DEFAULT_MANIFEST_NAME,
+    ) -> Dict[str, Union[int, float, List[str]]]:
+        """
+        Mirrors a folder of the container into a persistent local directory.
+
+        A manifest of the name, ETag and size of every synced blob is kept in
+        `local_dir`. Each run lists the folder once and only downloads the blobs that are
+        new, changed or missing locally, so repeated runs over a mostly static corpus
+        transfer little more than the listing.
+
+        Args:
+            folder_path (str): The path to the folder within the blob container. Use an
+                empty string for the whole container.
+            local_dir (str): The local directory kept in sync. Created if missing.
+            max_workers (int): Number of blobs downloaded at once. Defaults to 8.
+            max_concurrency (int): Number of parallel range requests for each large blob.
+                Defaults to 4.
+            flatten (bool): Whether to save every file directly in `local_dir`, under
+                its base name. Defaults to False.
+            delete (bool): Whether to remove the local copies of deleted blobs.
+                Defaults to False.
+            blob_filter (Callable[[str], bool], optional): Selects the blobs to sync by
+                name. Defaults to None, every blob of the folder.
+            manifest_name (str): File name of the manifest within `local_dir`.
+
+        Returns:
+            Dict: Number of files and bytes downloaded, elapsed seconds, throughput in
+            bytes per second, and the names of the unchanged, deleted and failed blobs.
+        """
+        if folder_path and not folder_path.endswith("/"):
+            folder_path += "/"
+
+        def in_scope(blob_name: str) -> bool:
+            return blob_name.startswith(folder_path) and (
+                blob_filter is None or blob_filter(blob_name)
+            )
+
+        start_time = time.perf_counter()
+        manifest = BlobMetadataIndex(os.path.join(local_dir, manifest_name))
+        delta = manifest.update(
+            (
+                metadata
+                for metadata in self.iter_blob_metadata(folder_path)
+                if blob_filter is None or blob_filter(metadata["name"])
+            ),
+            scope=in_scope,
+        )
+        listed = delta.added + delta.modified + delta.unchanged
+        local_paths = local_blob_paths(listed, folder_path, local_dir, flatten)
+        unchanged = [
+            blob_name
+            for blob_name in delta.unchanged
+            if blob_name in local_paths and os.path.exists(local_paths[blob_name])
+        ]
+        unchanged_names = set(unchanged)
+        to_download = {
+            blob_name: local_path
+            for blob_name, local_path in local_paths.items()
+            if blob_name not in unchanged_names
+        }
+        total_bytes, failed = self._download_blobs(
+            to_download, max_workers, max_concurrency
+        )
+        downloaded = len(to_download) - len(failed)
+        failed.extend(name for name in listed if name not in local_paths)
+        # Failed blobs are left out of the manifest, so the next run retries them.
+        for blob_name in failed:
+            manifest.entries.pop(blob_name, None)
+
+        if delete:
+            deleted_paths = local_blob_paths(
+                delta.deleted, folder_path, local_dir, flatten
+            )
+            for local_path in deleted_paths.values():
+                if os.path.exists(local_path):
+                    os.remove(local_path)
+        manifest.save()
+
+        elapsed = time.perf_counter() - start_time
+        stats = {
+            "files": downloaded,
+            "bytes": total_bytes,
+            "seconds": elapsed,
+            "bytes_per_second": total_bytes / elapsed if elapsed > 0 else 0.0,
+            "unchanged": unchanged,
+            "deleted": delta.deleted,
+            "failed": failed,
+        }
+        logger.info(
+            f"Synced {local_dir}: downloaded {stats['files']} files "
+            f"({total_bytes / 1024**2:.1f} MiB), {len(unchanged)} unchanged, "
+            f"{len(delta.deleted)} deleted, in {elapsed:.2f}s"
+        )
+        return stats
+
+    def upload_data(
+        self,
+        blob_name: str,
+        data: UploadData,
+        md5: Optional[bytes] = None,
+        content_type: Optional[str] = None,
+        max_concurrency: int = 4,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+    ) -> int:
+        """
+        Uploads a local file or in-memory content to a blob of the container.
+
+        Content up to `block_size` is uploaded in a single request. Larger content is
+        staged as blocks in parallel and committed at once, so readers never see a
+        partially written blob. The MD5 digest is stored as the Content-MD5 property.
+
+        Args:
+            blob_name (str): Name of the destination blob, replaced if it exists.
+            data (UploadData): Local file path, or in-memory content.
+            md5 (bytes, optional): MD5 digest of the content, computed if omitted.
+            content_type (str, optional): Content type of the blob. Guessed from the
+                blob name if omitted.
+            max_concurrency (int): Number of blocks staged at once. Defaults to 4.
+            block_size (int): Size of the staged blocks. Defaults to 8 MiB.
+
+        Returns:
+            int: Number of bytes uploaded.
+        """
+        size = upload_data_size(data)
+        content_settings = ContentSettings(
+            content_type=content_type
+            or mimetypes.guess_type(blob_name)[0]
+            or "application/octet-stream",
+            content_md5=bytearray(md5 or content_md5(data)),
+        )
+        blob_client = self.container_client.get_blob_client(blob_name)
+        if size <= block_size:
+            blob_client.upload_blob(
+                read_upload_range(data, 0, size),
+                overwrite=True,
+                content_settings=content_settings,
+            )
+            return size
+
+        block_ids = [
+            base64.b64encode(f"{index:08d}".encode()).decode()
+            for index in range((size + block_size - 1) // block_size)
+        ]
+
+        def stage(index: int) -> None:
+            blob_client.stage_block(
+                block_ids[index],
+                read_upload_range(data, index * block_size, block_size),
+            )
+
+        with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+            # list() re-raises the first failure of a block.
+            list(executor.map(stage, range(len(block_ids))))
+        blob_client.commit_block_list(
+            [BlobBlock(block_id) for block_id in block_ids],
+            content_settings=content_settings,
+        )
+        return size
+
+    def _remote_md5(self, blob_name: str) -> Optional[bytes]:
+        """
+        Reads the Content-MD5 of an existing blob.
+
+        Args:
+            blob_name (str): Name of the blob.
+
+        Returns:
+            Optional[bytes]: The Content-MD5, or None if the blob is missing or has none.
         """
         try:
-            # Ensure folder path ends with a '/'
-            if not folder_path.endswith("/"):
-                folder_path += "/"
-                logger.info(f"Folder path {folder_path}")
-
-            blob_list = self.container_client.list_blobs()
-            for blob in blob_list:
-                logger.info(f"{blob.name}")
-                local_file_path = os.path.join(local_dir, os.path.basename(blob.name))
-                blob_client = self.container_client.get_blob_client(blob.name)
-                with open(local_file_path, "wb") as file:
-                    downloader = blob_client.download_blob()
-                    file.write(downloader.readall())
-
-                logger.info(f"Downloaded {blob.name} to {local_file_path}")
+            properties = self.container_client.get_blob_client(
+                blob_name
+            ).get_blob_properties()
+        except ResourceNotFoundError:
+            return None
+        md5 = properties.content_settings.content_md5
+        return bytes(md5) if md5 else None
 
-        except Exception as e:
-            logger.error(f"An error occurred while downloading files: {e}")
-            raise
+    def _listed_md5s(
+        self, blob_names: List[str], lookup_limit: int = MD5_LOOKUP_LIMIT
+    ) -> Dict[str, Optional[bytes]]:
+        """
+        Reads the Content-MD5 of existing blobs from folder listings.
+
+        Names are grouped by their parent folder. Folders with more than `lookup_limit`
+        names are listed once, without their subfolders, so a batch never lists more of
+        the container than its own folders. The names of smaller folders are left out,
+        to be looked up blob by blob with `_remote_md5` by the upload workers.
+
+        Args:
+            blob_names (List[str]): Names of the blobs.
+            lookup_limit (int): Number of names of a folder up to which its blobs are
+                looked up one by one instead of listed.
+
+        Returns:
+            Dict[str, Optional[bytes]]: Content-MD5 of every name of the listed folders,
+            None for the missing blobs and those without one.
+        """
+        folders: Dict[str, List[str]] = {}
+        for blob_name in blob_names:
+            folders.setdefault(blob_name[: blob_name.rfind("/") + 1], []).append(
+                blob_name
+            )
+
+        listed_md5s: Dict[str, Optional[bytes]] = {}
+        for folder, names in folders.items():
+            if len(names) <= lookup_limit:
+                continue
+            listed_md5s.update(dict.fromkeys(names))
+            for blob in self.container_client.walk_blobs(
+                name_starts_with=folder or None, delimiter="/"
+            ):
+                # walk_blobs also yields the subfolders, as BlobPrefix items.
+                if isinstance(blob, BlobPrefix) or blob.name not in listed_md5s:
+                    continue
+                md5 = blob.content_settings.content_md5
+                listed_md5s[blob.name] = bytes(md5) if md5 else None
+        return listed_md5s
+
+    def upload_files(
+        self,
+        uploads: Dict[str, UploadData],
+        max_workers: int = 8,
+        max_concurrency: int = 4,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+        skip_unchanged: bool = True,
+    ) -> Dict[str, Union[int, float, List[str]]]:
+        """
+        Uploads many local files or in-memory buffers concurrently.
+
+        Args:
+            uploads (Dict[str, UploadData]): Content to upload, keyed by blob name.
+            max_workers (int): Number of blobs uploaded at once. Defaults to 8.
+            max_concurrency (int): Number of blocks staged at once for each large blob.
+            block_size (int): Size of the staged blocks. Defaults to 8 MiB.
+            skip_unchanged (bool): Whether to skip blobs whose Content-MD5 already
+                matches the content. Defaults to True.
+
+        Returns:
+            Dict: Number of files and bytes uploaded, elapsed seconds, throughput in
+            bytes per second, the names of the skipped blobs and of the blobs that failed.
+        """
+        start_time = time.perf_counter()
+        listed_md5s = self._listed_md5s(list(uploads)) if skip_unchanged else {}
+
+        def upload(blob_name: str) -> Optional[int]:
+            data = uploads[blob_name]
+            md5 = content_md5(data)
+            if skip_unchanged:
+                # Blobs of small folders are looked up here, on the pool, in parallel.
+                remote_md5 = (
+                    listed_md5s[blob_name]
+                    if blob_name in listed_md5s
+                    else self._remote_md5(blob_name)
+                )
+                if remote_md5 == md5:
+                    return None
+            return self.upload_data(
+                blob_name, data, md5, None, max_concurrency, block_size
+            )
+
+        total_bytes = 0
+        skipped: List[str] = []
+        failed: List[str] = []
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(upload, blob_name): blob_name for blob_name in uploads
+            }
+            for future in as_completed(futures):
+                blob_name = futures[future]
+                try:
+                    size = future.result()
+                except Exception as e:
+                    logger.error(f"Failed to upload blob file {blob_name}: {e}")
+                    failed.append(blob_name)
+                    continue
+                if size is None:
+                    skipped.append(blob_name)
+                else:
+                    total_bytes += size
+                    logger.info(f"Uploaded {blob_name}")
+
+        elapsed = time.perf_counter() - start_time
+        stats = {
+            "files": len(uploads) - len(skipped) - len(failed),
+            "bytes": total_bytes,
+            "seconds": elapsed,
+            "bytes_per_second": total_bytes / elapsed if elapsed > 0 else 0.0,
+            "skipped": skipped,
+            "failed": failed,
+        }
+        logger.info(
+            f"Uploaded {stats['files']} files ({total_bytes / 1024**2:.1f} MiB), "
+            f"skipped {len(skipped)} unchanged, in {elapsed:.2f}s, "
+            f"{stats['bytes_per_second'] / 1024**2:.1f} MiB/s"
+        )
+        return stats
+
+    def upload_files_from_folder(
+        self, local_dir: str, folder_path: str = "", **kwargs: Any
+    ) -> Dict[str, Union[int, float, List[str]]]:
+        """
+        Uploads all files of a local directory, recursively, under a folder of the container.
+
+        Args:
+            local_dir (str): The local directory to upload.
+            folder_path (str): The destination folder within the blob container.
+            **kwargs: Keyword arguments passed to `upload_files`.
+
+        Returns:
+            Dict: Transfer statistics, see `upload_files`.
+        """
+        if folder_path and not folder_path.endswith("/"):
+            folder_path += "/"
+        uploads: Dict[str, UploadData] = {}
+        for root, _, files in os.walk(local_dir):
+            for file_name in files:
+                local_path = os.path.join(root, file_name)
+                relative_path = os.path.relpath(local_path, local_dir)
+                uploads[folder_path + relative_path.replace(os.sep, "/")] = local_path
+        return self.upload_files(uploads, **kwargs)
@@ -0,0 +1,147 @@
+import json
+import os
+import tempfile
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional
+
+from utils.ml_logging import get_logger
+
+# Initialize logger
+logger = get_logger()
+
+# Metadata fields persisted in the index, besides the blob name.
+INDEX_FIELDS = ("etag", "size", "content_type", "last_modified")
+
+
+class BlobIndexDelta(NamedTuple):
+    """
+    Changes between two scans of a container, as lists of blob names.
+    """
+
+    added: List[str]
+    modified: List[str]
+    deleted: List[str]
+    unchanged: List[str]
+
+    def summary(self) -> Dict[str, int]:
+        """
+        Returns the number of blobs of each kind of change.
+
+        Returns:
+            Dict[str, int]: Counts of added, modified, deleted and unchanged blobs.
+        """
+        return {field: len(getattr(self, field)) for field in self._fields}
+
+
+class BlobMetadataIndex:
+    """
+    Local index of blob metadata, persisted as one JSON object per line.
+
+    It records the ETag, size, content type and modification time of every blob seen by
+    the last scan, so the next scan can tell which blobs were added, modified or
+    deleted without reading their properties one by one.
+
+    Attributes:
+        path (str): Path of the index file.
+        entries (Dict[str, Dict]): Indexed metadata, keyed by blob name.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize the BlobMetadataIndex and load the index file if it exists.
+
+        Args:
+            path (str): Path of the index file.
+        """
+        self.path = path
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as file:
+                for line in file:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self.entries[entry.pop("name")] = entry
+            logger.info(f"Loaded {len(self.entries)} index entries from {path}")
+
+    @staticmethod
+    def _entry(metadata: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Converts blob metadata into an index entry.
+
+        Args:
+            metadata (Dict): Metadata as returned by `blob_properties_to_metadata`.
+
+        Returns:
+            Dict: The JSON-serializable fields of INDEX_FIELDS.
+        """
+        entry = {field: metadata.get(field) for field in INDEX_FIELDS}
+        if isinstance(entry["last_modified"], datetime):
+            entry["last_modified"] = entry["last_modified"].isoformat()
+        return entry
+
+    def update(
+        self,
+        metadata: Iterable[Dict[str, Any]],
+        scope: Optional[Callable[[str], bool]] = None,
+    ) -> BlobIndexDelta:
+        """
+        Replaces the index with a new scan and computes the changes since the last one.
+
+        Args:
+            metadata (Iterable[Dict]): Metadata of every blob of the scan, with a "name".
+                May be a generator, it is consumed once.
+            scope (Callable[[str], bool], optional): Tells whether a blob name was covered
+                by the scan. Entries outside the scope are kept as they are. Defaults to
+                None, a scan of every blob.
+
+        Returns:
+            BlobIndexDelta: The names of the added, modified, deleted and unchanged blobs.
+        """
+        added: List[str] = []
+        modified: List[str] = []
+        unchanged: List[str] = []
+        entries: Dict[str, Dict[str, Any]] = {}
+        for blob_metadata in metadata:
+            name = blob_metadata["name"]
+            entry = self._entry(blob_metadata)
+            previous = self.entries.get(name)
+            if previous is None:
+                added.append(name)
+            elif (previous.get("etag"), previous.get("size")) != (
+                entry["etag"],
+                entry["size"],
+            ):
+                modified.append(name)
+            else:
+                unchanged.append(name)
+            entries[name] = entry
+        deleted: List[str] = []
+        for name, entry in self.entries.items():
+            if name in entries:
+                continue
+            if scope is None or scope(name):
+                deleted.append(name)
+            else:
+                entries[name] = entry
+        self.entries = entries
+        return BlobIndexDelta(added, modified, deleted, unchanged)
+
+    def save(self) -> None:
+        """
+        Writes the index file, atomically replacing the previous one.
+        """
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".")
+        with os.fdopen(fd, "w", encoding="utf-8") as file:
+            for line in self._lines():
+                file.write(line)
+        os.replace(temp_path, self.path)
+        logger.info(f"Saved {len(self.entries)} index entries to {self.path}")
+
+    def _lines(self) -> Iterator[str]:
+        """
+        Serializes the entries, one JSON object per line.
+        """
+        for name, entry in self.entries.items():
+            yield json.dumps({"name": name, **entry}) + "\n"
@@ -0,0 +1,255 @@
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple, Union
+
+from utils.ml_logging import get_logger
+
+# Initialize logger
+logger = get_logger()
+
+BytesLike = Union[bytes, bytearray, memoryview]
+
+
+class DiskLRUCache:
+    """
+    Size-bounded, file-per-entry cache on the local disk.
+
+    Entries are evicted in least recently used order once the total size exceeds
+    `max_size_bytes`, and expire `ttl_seconds` after they were written. The recency of
+    an entry is kept in the access time of its file, so the order survives restarts.
+
+    Attributes:
+        cache_dir (str): Directory holding the cached files.
+        max_size_bytes (int): Maximum total size of the cached files.
+        ttl_seconds (float, optional): Lifetime of an entry, or None to keep entries until evicted.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str,
+        max_size_bytes: int = 1024**3,
+        ttl_seconds: Optional[float] = None,
+        suffix: str = "",
+    ):
+        """
+        Initialize the DiskLRUCache and index the entries already on disk.
+
+        Args:
+            cache_dir (str): Directory holding the cached files. Created if missing.
+            max_size_bytes (int): Maximum total size of the cached files. Defaults to 1 GiB.
+            ttl_seconds (float, optional): Lifetime of an entry. Defaults to None.
+            suffix (str): File name suffix of the cached files.
+        """
+        self.cache_dir = cache_dir
+        self.max_size_bytes = max_size_bytes
+        self.ttl_seconds = ttl_seconds
+        self.suffix = suffix
+        self._lock = threading.Lock()
+        self._index: "OrderedDict[str, Tuple[int, float]]" = OrderedDict()
+        self._size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        os.makedirs(cache_dir, exist_ok=True)
+        self._load_index()
+
+    def _path(self, key: str) -> str:
+        """
+        Returns the path of the file of an entry.
+
+        Args:
+            key (str): The key of the entry. Must be safe to use as a file name.
+        """
+        return os.path.join(self.cache_dir, key[:2], key + self.suffix)
+
+    def _load_index(self) -> None:
+        """
+        Indexes the entries already on disk, least recently used first.
+        """
+        entries = []
+        for root, _, files in os.walk(self.cache_dir):
+            for file_name in files:
+                if not file_name.endswith(self.suffix) or file_name.startswith("."):
+                    continue
+                stat = os.stat(os.path.join(root, file_name))
+                key = file_name[: len(file_name) - len(self.suffix)]
+                entries.append((stat.st_atime, key, stat.st_size, stat.st_mtime))
+        for _, key, size, written_at in sorted(entries):
+            self._index[key] = (size, written_at)
+            self._size_bytes += size
+        logger.info(
+            f"Indexed {len(self._index)} cached entries ({self._size_bytes} bytes) in {self.cache_dir}"
+        )
+        with self._lock:
+            self._evict()
+
+    def _is_expired(self, written_at: float) -> bool:
+        """
+        Checks whether an entry written at the given time has expired.
+
+        Args:
+            written_at (float): Modification time of the entry file.
+        """
+        return (
+            self.ttl_seconds is not None and time.time() - written_at > self.ttl_seconds
+        )
+
+    def _remove(self, key: str) -> None:
+        """
+        Removes an entry from the index and the disk. Must be called with the lock held.
+
+        Args:
+            key (str): The key of the entry.
+        """
+        size, _ = self._index.pop(key, (0, 0.0))
+        self._size_bytes -= size
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def _evict(self) -> None:
+        """
+        Evicts least recently used entries until the cache fits its size bound.
+        Must be called with the lock held.
+        """
+        while self._size_bytes > self.max_size_bytes and self._index:
+            key = next(iter(self._index))
+            self._remove(key)
+            self.evictions += 1
+
+    def get_path(self, key: str) -> Optional[str]:
+        """
+        Returns the path of a cached entry and marks it as recently used.
+
+        Args:
+            key (str): The key of the entry.
+
+        Returns:
+            Optional[str]: The path of the entry file, or None on a miss.
+        """
+        with self._lock:
+            entry = self._index.get(key)
+            path = self._path(key)
+            if entry is None or not os.path.exists(path):
+                if entry is not None:
+                    self._remove(key)
+                self.misses += 1
+                return None
+            _, written_at = entry
+            if self._is_expired(written_at):
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            # Only the access time changes, the modification time keeps the write time.
+            os.utime(path, (time.time(), written_at))
+            self._index.move_to_end(key)
+            self.hits += 1
+            return path
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Reads a cached entry.
+
+        Args:
+            key (str): The key of the entry.
+
+        Returns:
+            Optional[bytes]: The cached data, or None on a miss.
+        """
+        path = self.get_path(key)
+        if path is None:
+            return None
+        try:
+            with open(path, "rb") as file:
+                return file.read()
+        except FileNotFoundError:
+            return None
+
+    def put(self, key: str, data: bytes) -> str:
+        """
+        Writes an entry, replacing any previous one, and evicts entries if needed.
+
+        Args:
+            key (str): The key of the entry. Must be safe to use as a file name.
+            data (bytes): The data to cache.
+
+        Returns:
+            str: The path of the entry file.
+        """
+        return self.put_parts(key, (data,))
+
+    def put_parts(self, key: str, parts: Iterable[BytesLike]) -> str:
+        """
+        Writes an entry from consecutive parts, without joining them in memory first.
+
+        Args:
+            key (str): The key of the entry. Must be safe to use as a file name.
+            parts (Iterable[BytesLike]): The parts of the data to cache, in order.
+
+        Returns:
+            str: The path of the entry file.
+        """
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write to a temporary file first, so readers never see a partial entry.
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".")
+        size = 0
+        try:
+            with os.fdopen(fd, "wb") as file:
+                for part in parts:
+                    size += file.write(part)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+        with self._lock:
+            if key in self._index:
+                previous_size, _ = self._index.pop(key)
+                self._size_bytes -= previous_size
+            self._index[key] = (size, os.stat(path).st_mtime)
+            self._size_bytes += size
+            self._evict()
+        return path
+
+    def delete(self, key: str) -> None:
+        """
+        Deletes an entry if it exists.
+
+        Args:
+            key (str): The key of the entry.
+        """
+        with self._lock:
+            self._remove(key)
+
+    def clear(self) -> None:
+        """
+        Deletes every entry and resets the counters.
+        """
+        with self._lock:
+            for key in list(self._index):
+                self._remove(key)
+            self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns the cache counters and usage.
+
+        Returns:
+            Dict[str, int]: Hits, misses, evictions, expirations, entries and sizes.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "entries": len(self._index),
+                "size_bytes": self._size_bytes,
+                "max_size_bytes": self.max_size_bytes,
+            }
@@ -1,12 +1,25 @@
 import glob
 import os
 import tempfile
-from typing import Optional
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
 from urllib.parse import urlparse
 
 import fitz
 
 from src.extractors.blob_data_extractor import AzureBlobDataExtractor
+from src.extractors.page_classifier import PageRouting, route_pages
+from src.extractors.pdf_rendering import (
+    DEFAULT_PAGES_PER_TASK,
+    DEFAULT_ZOOM,
+    PageImage,
+    iter_page_images,
+    page_image_path,
+    profile_report,
+    render_pdfs,
+)
+from src.extractors.render_profiles import RENDER_PROFILES, RenderProfile
+from src.extractors.utils import get_container_and_prefix_from_url
 from utils.ml_logging import get_logger
 
 logger = get_logger()
@@ -17,12 +30,28 @@ class OCRHelper:
     Class for OCR functionalities, particularly extracting images from PDF files.
     """
 
-    def __init__(self, container_name: Optional[str] = None):
+    def __init__(
+        self,
+        container_name: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        pages_per_task: int = DEFAULT_PAGES_PER_TASK,
+        skip_text_pages: bool = False,
+    ):
         """
         Initialize the OCRHelper with a container name.
         Args:
             container_name (str): Name of the Azure Blob Storage container.
+            max_workers (int, optional): Number of processes rendering pages. Defaults
+                to the number of CPUs.
+            pages_per_task (int): Number of consecutive pages rendered by one work unit.
+            skip_text_pages (bool): Whether to save the text of text-native pages as
+                "<name>-page-<n>.txt" instead of rendering them. Only scanned pages are
+                rendered. Defaults to False.
         """
+        self.max_workers = max_workers
+        self.pages_per_task = pages_per_task
+        self.skip_text_pages = skip_text_pages
+        self.last_routing_stats: Dict[str, Dict[str, float]] = {}
         self.blob_manager = None
         if container_name:
             self.init_blob_manager(container_name)
@@ -35,24 +64,150 @@ class OCRHelper:
         """
         self.blob_manager = AzureBlobDataExtractor(container_name)
 
-    def extract_images_from_pdf(self, input_path: str, output_path: str) -> None:
+    def extract_images_from_pdf(
+        self, input_path: str, output_path: str, sync_dir: Optional[str] = None
+    ) -> None:
         """
         Extracts pages from a PDF file or a folder of PDF files and saves them as pictures.
         Args:
             input_path (str): Path to the PDF file or folder of PDF files.
             output_path (str): Path to the folder where the pictures will be saved.
+            sync_dir (str, optional): Persistent local directory for blob inputs. When
+                set, blobs are delta-synced into it and only new or changed blobs are
+                downloaded. Defaults to None, a temporary directory per run.
         """
         is_url = urlparse(input_path).scheme in ["http", "https"]
 
         if is_url:
             logger.info(f"Input path is a URL: {input_path}")
+            container_name, folder_path = get_container_and_prefix_from_url(input_path)
+            if container_name != self.blob_manager.container_name:
+                self.blob_manager.change_container(container_name)
+            if sync_dir is not None:
+                local_path = self._sync_pdf_blobs(
+                    folder_path, os.path.join(sync_dir, container_name)
+                )
+                self._process_pdf_path(local_path, output_path)
+                return
             with tempfile.TemporaryDirectory() as temp_dir:
-                self.blob_manager.download_files_to_folder(input_path, temp_dir)
+                if folder_path.lower().endswith(".pdf"):
+                    self.blob_manager.download_blob_to_file(
+                        folder_path,
+                        os.path.join(temp_dir, os.path.basename(folder_path)),
+                    )
+                else:
+                    self.blob_manager.download_files_to_folder(
+                        folder_path, temp_dir, flatten=True
+                    )
                 self._process_pdf_path(temp_dir, output_path)
         else:
             logger.info(f"Input path is a local file or directory: {input_path}")
             self._process_pdf_path(input_path, output_path)
 
+    def _sync_pdf_blobs(self, folder_path: str, container_dir: str) -> str:
+        """
+        Delta-syncs a PDF blob, or the PDF blobs of a folder, into a local directory.
+
+        Other blobs are left out of the listing before the manifest is built, so an
+        empty prefix syncs the PDFs of the whole container and nothing else.
+        Args:
+            folder_path (str): Name of a PDF blob, or prefix of a folder of blobs.
+            container_dir (str): Local directory of the container. Each folder is synced
+                flat into its own subdirectory, like the temporary directory.
+        Returns:
+            str: Local path of the PDF file or of the folder directory.
+        """
+        is_pdf = folder_path.lower().endswith(".pdf")
+        prefix = folder_path.rpartition("/")[0] if is_pdf else folder_path.strip("/")
+        local_dir = os.path.join(container_dir, *prefix.split("/"))
+        self.blob_manager.sync_folder(
+            prefix,
+            local_dir,
+            flatten=True,
+            blob_filter=(
+                (lambda blob_name: blob_name == folder_path)
+                if is_pdf
+                else (lambda blob_name: blob_name.lower().endswith(".pdf"))
+            ),
+        )
+        if is_pdf:
+            return os.path.join(local_dir, os.path.basename(folder_path))
+        return local_dir
+
+    def _open_pdf(
+        self, source: Union[str, bytes, bytearray, memoryview]
+    ) -> fitz.Document:
+        """
+        Opens a PDF from a blob URL, a local path or its content.
+        Args:
+            source (Union[str, bytes, bytearray, memoryview]): Blob URL or local path of
+                the PDF, or its content.
+        Returns:
+            fitz.Document: The opened document.
+        """
+        if isinstance(source, str) and urlparse(source).scheme in ["http", "https"]:
+            if self.blob_manager is None:
+                container_name, _ = get_container_and_prefix_from_url(source)
+                self.init_blob_manager(container_name)
+            return fitz.open(
+                stream=self.blob_manager.extract_content(source), filetype="pdf"
+            )
+        if isinstance(source, str):
+            return fitz.open(source)
+        return fitz.open(stream=source, filetype="pdf")
+
+    def render_pages(
+        self,
+        source: Union[str, bytes, bytearray, memoryview],
+        image_format: str = "png",
+        zoom: float = DEFAULT_ZOOM,
+        quality: int = 85,
+        pages: Optional[Iterable[int]] = None,
+        profile: Optional[Union[str, RenderProfile]] = None,
+    ) -> Iterator[PageImage]:
+        """
+        Renders the pages of a PDF to in-memory images, without touching the filesystem.
+        Args:
+            source (Union[str, bytes, bytearray, memoryview]): Blob URL or local path of
+                the PDF, or its content.
+            image_format (str): "png", "jpeg", "webp", or "raw" for a memoryview of
+                the pixels. Defaults to "png".
+            zoom (float): Zoom factor of the rendered pages. Defaults to 2.
+            quality (int): Quality of the lossy formats, from 1 to 100. Defaults to 85.
+            pages (Iterable[int], optional): 1-based numbers of the pages to render.
+                Defaults to every page.
+            profile (Union[str, RenderProfile], optional): Rendering profile with target
+                DPI, colorspace, format, quality and pixel or token caps, or the name of
+                one of RENDER_PROFILES. Replaces `image_format`, `zoom` and `quality`.
+        Yields:
+            PageImage: The image of each page, rendered lazily as the generator is read.
+        """
+        with self._open_pdf(source) as doc:
+            yield from iter_page_images(
+                doc, image_format, zoom, quality, pages, profile
+            )
+
+    def compare_render_profiles(
+        self,
+        source: Union[str, bytes, bytearray, memoryview],
+        profiles: Optional[Iterable[Union[str, RenderProfile]]] = None,
+        pages: Optional[Iterable[int]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Reports the bytes per page and estimated vision tokens of rendering profiles.
+        Args:
+            source (Union[str, bytes, bytearray, memoryview]): Blob URL or local path of
+                the PDF, or its content.
+            profiles (Iterable[Union[str, RenderProfile]], optional): Profiles to
+                compare. Defaults to every profile of RENDER_PROFILES.
+            pages (Iterable[int], optional): 1-based numbers of the pages to render.
+                Defaults to every page.
+        Returns:
+            List[Dict]: One report per profile, see `profile_report`.
+        """
+        with self._open_pdf(source) as doc:
+            return profile_report(doc, profiles or list(RENDER_PROFILES), pages)
+
     def _process_pdf_path(self, input_path: str, output_path: str) -> None:
         """
         Processes a PDF file or all PDF files in a directory.
@@ -76,9 +231,7 @@ class OCRHelper:
         """
         all_files = glob.glob(os.path.join(directory_path, "*.pdf"))
         logger.info(f"Found {len(all_files)} PDF files in {directory_path}")
-        for file_path in all_files:
-            logger.info(f"Processing file: {file_path}")
-            self._process_single_pdf(file_path, output_path)
+        self._render_pdfs(sorted(all_files), output_path)
 
     def _process_single_pdf(self, file_path: str, output_path: str) -> None:
         """
@@ -87,22 +240,77 @@ class OCRHelper:
             file_path (str): Path to the PDF file.
             output_path (str): Directory where the images will be saved.
         """
-        zoom_x = 2.0  # horizontal zoom
-        zoom_y = 2.0  # vertical zoom
-        mat = fitz.Matrix(zoom_x, zoom_y)  # zoom factor 2 in each dimension
-
         logger.info(f"Opening file: {file_path}")
-        doc = fitz.open(file_path)
-        base_filename = os.path.splitext(os.path.basename(file_path))[0]
+        self._render_pdfs([file_path], output_path)
+
+    def _render_pdfs(self, file_paths: List[str], output_path: str) -> None:
+        """
+        Renders the pages of PDF files on the process pool, at a 2x zoom.
+        Args:
+            file_paths (List[str]): Paths of the PDF files.
+            output_path (str): Directory where the images will be saved.
+        """
+        start_time = time.perf_counter()
+        pages = None
+        if self.skip_text_pages:
+            pages = self._extract_text_pages(file_paths, output_path)
+        rendered = render_pdfs(
+            file_paths,
+            output_path,
+            max_workers=self.max_workers,
+            pages_per_task=self.pages_per_task,
+            pages=pages,
+        )
+        elapsed = time.perf_counter() - start_time
+        logger.info(
+            f"Saved {len(rendered)} images to {output_path} in {elapsed:.2f}s "
+            f"({len(rendered) / elapsed if elapsed > 0 else 0.0:.1f} pages/s)"
+        )
 
-        for page_number, page in enumerate(doc):
-            logger.info(f"Processing page {page_number + 1} of {file_path}")
-            pix = page.get_pixmap(matrix=mat)
-            output_filename = f"{base_filename}-page-{page_number + 1}.png"
-            full_output_path = os.path.join(output_path, output_filename)
+    def _extract_text_pages(
+        self, file_paths: List[str], output_path: str
+    ) -> Dict[str, List[int]]:
+        """
+        Saves the text of the text-native pages of PDF files and lists the other pages.
+        Args:
+            file_paths (List[str]): Paths of the PDF files.
+            output_path (str): Directory where the texts will be saved.
+        Returns:
+            Dict[str, List[int]]: Numbers of the scanned pages to render, by file path.
+        """
+        os.makedirs(output_path, exist_ok=True)
+        scanned_pages = {}
+        self.last_routing_stats = {}
+        for file_path in file_paths:
+            with fitz.open(file_path) as doc:
+                routing = route_pages(doc)
+            for page_number, text in routing.text_pages.items():
+                text_path = os.path.splitext(
+                    page_image_path(file_path, page_number, output_path)
+                )[0]
+                with open(f"{text_path}.txt", "w", encoding="utf-8") as file:
+                    file.write(text)
+            scanned_pages[file_path] = routing.scanned_pages
+            self.last_routing_stats[file_path] = routing.stats
+        return scanned_pages
 
-            # Create the directory if it doesn't exist
-            os.makedirs(os.path.dirname(full_output_path), exist_ok=True)
+    def route_pages(
+        self, source: Union[str, bytes, bytearray, memoryview], **thresholds: float
+    ) -> PageRouting:
+        """
+        Splits the pages of a PDF into text-native pages, with their text, and scanned
+        pages that need rendering, Document Intelligence or GPT-4V.
 
-            pix.save(full_output_path)
-            logger.info(f"Saved image: {full_output_path}")
+        Pass `format_page_ranges(routing.scanned_pages)` as the `pages` option of
+        Document Intelligence, or `routing.scanned_pages` to `render_pages`. A PDF
+        with only text pages has no scanned pages and needs no OCR call at all.
+        Args:
+            source (Union[str, bytes, bytearray, memoryview]): Blob URL or local path of
+                the PDF, or its content.
+            **thresholds: Keyword arguments passed to `classify_page`.
+        Returns:
+            PageRouting: The text of the text pages, the scanned and empty page
+            numbers, the per-page classifications and routing stats.
+        """
+        with self._open_pdf(source) as doc:
+            return route_pages(doc, **thresholds)
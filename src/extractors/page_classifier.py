@@ -0,0 +1,207 @@
+import time
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+import fitz
+
+from utils.ml_logging import get_logger
+
+# Initialize logger
+logger = get_logger()
+
+PAGE_KINDS = ("text", "scanned", "empty")
+
+# A page needs this many extractable characters to count as text-native.
+DEFAULT_MIN_CHARS = 50
+
+# Pages mostly covered by images, with little text area, are scans even when they carry
+# a few text lines such as a stamp or a header.
+DEFAULT_MAX_IMAGE_COVERAGE = 0.5
+DEFAULT_MIN_TEXT_COVERAGE = 0.05
+
+# Share of unmappable characters from which a text layer is unusable, as happens with
+# fonts that lack a Unicode mapping.
+DEFAULT_MAX_INVALID_RATIO = 0.1
+
+
+class PageClassification(NamedTuple):
+    """
+    Whether a page has a usable text layer, with the measures the decision is based on.
+
+    `kind` is "text" for text-native pages, "scanned" for pages that need OCR, and
+    "empty" for pages without text or images. Coverages are fractions of the page area.
+    """
+
+    page_number: int
+    kind: str
+    chars: int
+    text_coverage: float
+    image_coverage: float
+    invalid_ratio: float
+    text: str
+
+
+class PageRouting(NamedTuple):
+    """
+    Pages of a document split by how they should be processed.
+
+    `text_pages` maps the numbers of text-native pages to their extracted text,
+    `scanned_pages` lists the pages to send to rendering, Document Intelligence or
+    GPT-4V, and `stats` counts the pages of each kind.
+    """
+
+    text_pages: Dict[int, str]
+    scanned_pages: List[int]
+    empty_pages: List[int]
+    classifications: List[PageClassification]
+    stats: Dict[str, float]
+
+
+def _coverage(rects: Iterable[fitz.Rect], page_rect: fitz.Rect) -> float:
+    """
+    Computes the fraction of a page covered by rectangles.
+
+    Overlaps are counted once per rectangle, so the result is capped at 1.
+
+    Args:
+        rects (Iterable[fitz.Rect]): The rectangles, in page coordinates.
+        page_rect (fitz.Rect): The rectangle of the page.
+
+    Returns:
+        float: The covered fraction of the page area.
+    """
+    page_area = abs(page_rect)
+    if not page_area:
+        return 0.0
+    covered = sum(abs(fitz.Rect(rect) & page_rect) for rect in rects)
+    return min(covered / page_area, 1.0)
+
+
+def classify_page(
+    page: fitz.Page,
+    min_chars: int = DEFAULT_MIN_CHARS,
+    max_image_coverage: float = DEFAULT_MAX_IMAGE_COVERAGE,
+    min_text_coverage: float = DEFAULT_MIN_TEXT_COVERAGE,
+    max_invalid_ratio: float = DEFAULT_MAX_INVALID_RATIO,
+) -> PageClassification:
+    """
+    Classifies a page as text-native, scanned or empty from its text and images.
+
+    Args:
+        page (fitz.Page): The page.
+        min_chars (int): Minimum number of extractable characters of a text page.
+        max_image_coverage (float): Image coverage from which a page with little text
+            area is a scan.
+        min_text_coverage (float): Text area under which an image-covered page is a
+            scan.
+        max_invalid_ratio (float): Share of unmappable characters from which the text
+            layer is unusable.
+
+    Returns:
+        PageClassification: The classification of the page.
+    """
+    text = page.get_text("text")
+    stripped = "".join(text.split())
+    chars = len(stripped)
+    invalid_ratio = stripped.count("\ufffd") / chars if chars else 0.0
+    page_rect = page.rect
+    text_coverage = _coverage(
+        (block[:4] for block in page.get_text("blocks") if block[6] == 0), page_rect
+    )
+    image_coverage = _coverage(
+        (image["bbox"] for image in page.get_image_info()), page_rect
+    )
+
+    usable_text = chars >= min_chars and invalid_ratio < max_invalid_ratio
+    mostly_image = (
+        image_coverage >= max_image_coverage and text_coverage < min_text_coverage
+    )
+    if usable_text and not mostly_image:
+        kind = "text"
+    elif chars or image_coverage or page.get_drawings():
+        kind = "scanned"
+    else:
+        kind = "empty"
+    return PageClassification(
+        page.number + 1,
+        kind,
+        chars,
+        text_coverage,
+        image_coverage,
+        invalid_ratio,
+        text if kind == "text" else "",
+    )
+
+
+def route_pages(
+    doc: fitz.Document, pages: Optional[Iterable[int]] = None, **thresholds: float
+) -> PageRouting:
+    """
+    Classifies the pages of a document and splits them by processing route.
+
+    Args:
+        doc (fitz.Document): The document.
+        pages (Iterable[int], optional): 1-based numbers of the pages to classify.
+            Defaults to every page.
+        **thresholds: Keyword arguments passed to `classify_page`.
+
+    Returns:
+        PageRouting: The routing of the pages, with counts and timing in `stats`.
+    """
+    start_time = time.perf_counter()
+    if pages is None:
+        pages = range(1, doc.page_count + 1)
+    classifications = [
+        classify_page(doc[page_number - 1], **thresholds) for page_number in pages
+    ]
+    by_kind: Dict[str, List[PageClassification]] = {kind: [] for kind in PAGE_KINDS}
+    for classification in classifications:
+        by_kind[classification.kind].append(classification)
+
+    elapsed = time.perf_counter() - start_time
+    stats = {
+        "pages": len(classifications),
+        **{f"{kind}_pages": len(by_kind[kind]) for kind in PAGE_KINDS},
+        "text_ratio": (
+            len(by_kind["text"]) / len(classifications) if classifications else 0.0
+        ),
+        "seconds": elapsed,
+    }
+    logger.info(
+        f"Routed {stats['pages']} pages: {stats['text_pages']} text, "
+        f"{stats['scanned_pages']} scanned, {stats['empty_pages']} empty "
+        f"in {elapsed:.3f}s"
+    )
+    return PageRouting(
+        {c.page_number: c.text for c in by_kind["text"]},
+        [c.page_number for c in by_kind["scanned"]],
+        [c.page_number for c in by_kind["empty"]],
+        classifications,
+        stats,
+    )
+
+
+def format_page_ranges(page_numbers: Iterable[int]) -> str:
+    """
+    Formats page numbers as the `pages` option of Document Intelligence.
+
+    Args:
+        page_numbers (Iterable[int]): 1-based page numbers.
+
+    Returns:
+        str: Comma-separated pages and ranges, such as "1,3,5-7".
+
+    Raises:
+        ValueError: If there are no page numbers, as an empty `pages` option would
+        analyze every page. Skip the analysis instead.
+    """
+    ranges: List[List[int]] = []
+    for page_number in sorted(set(page_numbers)):
+        if ranges and page_number == ranges[-1][1] + 1:
+            ranges[-1][1] = page_number
+        else:
+            ranges.append([page_number, page_number])
+    if not ranges:
+        raise ValueError("No page numbers to format, skip the analysis instead.")
+    return ",".join(
+        str(first) if first == last else f"{first}-{last}" for first, last in ranges
+    )
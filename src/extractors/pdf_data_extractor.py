@@ -1,6 +1,14 @@
 import io
+from typing import Iterator, Union
 
-from PyPDF2 import PdfFileReader
+from PyPDF2 import PdfReader
+
+from src.extractors.pdf_text_backends import (
+    DEFAULT_TEXT_BACKEND,
+    PDFSource,
+    TextBackend,
+    get_text_backend,
+)
 
 # load logging
 from utils.ml_logging import get_logger
@@ -13,26 +21,30 @@ class PDFHelper:
     It supports loading configuration from environment variables and provides methods for PDF text extraction.
     """
 
-    def __init__(self):
+    def __init__(self, backend: Union[str, TextBackend] = DEFAULT_TEXT_BACKEND):
         """
         Initialize the PDFHelper class.
+        :param backend: Text extraction backend, "pymupdf" or "pypdf2", or a callable
+            yielding the text of each page of a PDF source. Defaults to "pymupdf".
         """
+        self.backend = get_text_backend(backend)
         logger.info("PDFHelper initialized.")
 
+    def iter_pages(self, source: PDFSource) -> Iterator[str]:
+        """
+        Yields the text of each page of a PDF, one page at a time.
+        :param source: Local file path, in-memory content or binary file object.
+        :return: Iterator of the page texts, in page order.
+        """
+        return self.backend(source)
+
     def extract_text_from_pdf_bytes(self, pdf_bytes: bytes) -> str:
         """
         Extracts text from a PDF file provided as a bytes object.
         :param pdf_bytes: Bytes object containing the PDF file data.
         :return: Extracted text from the PDF as a string, or None if extraction fails.
         """
-        try:
-            with io.BytesIO(pdf_bytes) as pdf_stream:
-                return self._extract_text_from_pdf(pdf_stream)
-        except Exception as e:
-            logger.error(
-                f"An unexpected error occurred during PDF text extraction: {e}"
-            )
-            return None
+        return self._extract_text_from_pdf(pdf_bytes)
 
     def extract_text_from_pdf_file(self, file_path: str) -> str:
         """
@@ -40,27 +52,16 @@ class PDFHelper:
         :param file_path: Path to the PDF file.
         :return: Extracted text from the PDF as a string, or None if extraction fails.
         """
-        try:
-            with open(file_path, "rb") as file:
-                return self._extract_text_from_pdf(file)
-        except Exception as e:
-            logger.error(f"An unexpected error occurred when opening the PDF file: {e}")
-            return None
+        return self._extract_text_from_pdf(file_path)
 
-    def _extract_text_from_pdf(self, file_stream) -> str:
+    def _extract_text_from_pdf(self, source: PDFSource) -> str:
         """
-        Helper method to extract text from a PDF file stream.
-        :param file_stream: File stream of the PDF file.
+        Helper method to extract text from a PDF source.
+        :param source: Local file path, in-memory content or binary file object.
         :return: Extracted text from the PDF as a string, or None if extraction fails.
         """
         try:
-            pdf_reader = PdfFileReader(file_stream)
-            text = []
-            for page_num in range(pdf_reader.getNumPages()):
-                page = pdf_reader.getPage(page_num)
-                text.append(page.extractText())
-
-            extracted_text = "\n".join(text)
+            extracted_text = "\n".join(self.iter_pages(source))
             logger.info("Text extraction from PDF was successful.")
             return extracted_text
         except Exception as e:
@@ -78,16 +79,16 @@ class PDFHelper:
         """
         try:
             with io.BytesIO(pdf_bytes) as pdf_stream:
-                pdf = PdfFileReader(pdf_stream)
-                information = pdf.getDocumentInfo()
-                number_of_pages = pdf.getNumPages()
+                pdf = PdfReader(pdf_stream)
+                information = pdf.metadata
+                number_of_pages = len(pdf.pages)
 
                 metadata = {
-                    "Author": information.author,
-                    "Creator": information.creator,
-                    "Producer": information.producer,
-                    "Subject": information.subject,
-                    "Title": information.title,
+                    "Author": information.author if information else None,
+                    "Creator": information.creator if information else None,
+                    "Producer": information.producer if information else None,
+                    "Subject": information.subject if information else None,
+                    "Title": information.title if information else None,
                     "Number of pages": number_of_pages,
                 }
 
@@ -0,0 +1,408 @@
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Union
+
+import fitz
+from PIL import Image
+
+from src.extractors.render_profiles import (
+    COLORSPACES,
+    PDF_DPI,
+    RenderProfile,
+    estimate_vision_tokens,
+    get_render_profile,
+    page_scale,
+)
+from utils.ml_logging import get_logger
+
+# Initialize logger
+logger = get_logger()
+
+# Zoom factor of the rendered pages, 2x in each dimension (144 DPI).
+DEFAULT_ZOOM = 2.0
+
+# Number of consecutive pages rendered by one work unit.
+DEFAULT_PAGES_PER_TASK = 8
+
+# Formats of in-memory page images. "raw" is the uncompressed pixel buffer.
+IMAGE_FORMATS = ("png", "jpeg", "webp", "raw")
+
+# Pillow modes of the pixmaps, by number of channels.
+PIXMAP_MODES = {1: "L", 3: "RGB", 4: "RGBA"}
+
+# Pillow names of the encoded formats.
+PIL_FORMATS = {"png": "PNG", "jpeg": "JPEG", "webp": "WEBP"}
+
+# Gray level from which bilevel pixels are white.
+BILEVEL_THRESHOLD = 128
+
+
+class RenderTask(NamedTuple):
+    """
+    A work unit of the rendering pool: a range of pages of one PDF file.
+    """
+
+    file_path: str
+    first_page: int
+    last_page: int
+    output_dir: str
+    zoom: float
+
+
+class RenderedPage(NamedTuple):
+    """
+    A page rendered to an image file.
+    """
+
+    file_path: str
+    page_number: int
+    output_path: str
+
+
+class PageImage(NamedTuple):
+    """
+    A page rendered to an in-memory image.
+
+    For the "raw" format, `data` is a view of the pixel buffer, rows of
+    `width * channels` bytes, valid as long as the PageImage is referenced.
+    `estimated_tokens` is the GPT-4 Vision cost of the image in "high" detail.
+    """
+
+    page_number: int
+    width: int
+    height: int
+    channels: int
+    image_format: str
+    data: Union[bytes, memoryview]
+    estimated_tokens: int = 0
+    pixmap: Optional[fitz.Pixmap] = None
+
+
+def page_image_path(file_path: str, page_number: int, output_dir: str) -> str:
+    """
+    Returns the path of the image of a page, "<name>-page-<number>.png".
+
+    Args:
+        file_path (str): Path of the PDF file.
+        page_number (int): 1-based page number.
+        output_dir (str): Directory of the images.
+
+    Returns:
+        str: The image path.
+    """
+    base_filename = os.path.splitext(os.path.basename(file_path))[0]
+    return os.path.join(output_dir, f"{base_filename}-page-{page_number}.png")
+
+
+def plan_render_tasks(
+    file_paths: Iterable[str],
+    output_dir: str,
+    zoom: float = DEFAULT_ZOOM,
+    pages_per_task: int = DEFAULT_PAGES_PER_TASK,
+    pages: Optional[Dict[str, Iterable[int]]] = None,
+) -> List[RenderTask]:
+    """
+    Splits PDF files into work units of consecutive pages.
+
+    Args:
+        file_paths (Iterable[str]): Paths of the PDF files.
+        output_dir (str): Directory of the images.
+        zoom (float): Zoom factor of the rendered pages.
+        pages_per_task (int): Maximum number of pages of each work unit.
+        pages (Dict[str, Iterable[int]], optional): 1-based numbers of the pages to
+            render, by file path. Files missing from the mapping are fully rendered.
+
+    Returns:
+        List[RenderTask]: The work units, in file and page order.
+    """
+    if pages_per_task <= 0:
+        raise ValueError("pages_per_task must be a positive integer.")
+    tasks = []
+    for file_path in file_paths:
+        if pages is not None and file_path in pages:
+            page_numbers = sorted(set(pages[file_path]))
+        else:
+            with fitz.open(file_path) as doc:
+                page_numbers = list(range(1, doc.page_count + 1))
+        # Runs of consecutive pages, each split into ranges of pages_per_task pages.
+        first_page = None
+        for index, page_number in enumerate(page_numbers):
+            if first_page is None:
+                first_page = page_number
+            is_last = index + 1 == len(page_numbers)
+            if (
+                is_last
+                or page_numbers[index + 1] != page_number + 1
+                or page_number - first_page + 1 == pages_per_task
+            ):
+                tasks.append(
+                    RenderTask(file_path, first_page, page_number, output_dir, zoom)
+                )
+                first_page = None
+    return tasks
+
+
+def render_task(task: RenderTask) -> List[RenderedPage]:
+    """
+    Renders a work unit. Runs in the worker processes, which open their own document.
+
+    Args:
+        task (RenderTask): The work unit.
+
+    Returns:
+        List[RenderedPage]: The rendered pages, in page order.
+    """
+    matrix = fitz.Matrix(task.zoom, task.zoom)
+    rendered = []
+    os.makedirs(task.output_dir, exist_ok=True)
+    with fitz.open(task.file_path) as doc:
+        for page_number in range(task.first_page, task.last_page + 1):
+            output_path = page_image_path(task.file_path, page_number, task.output_dir)
+            doc[page_number - 1].get_pixmap(matrix=matrix).save(output_path)
+            rendered.append(RenderedPage(task.file_path, page_number, output_path))
+    return rendered
+
+
+def render_pdfs(
+    file_paths: Iterable[str],
+    output_dir: str,
+    zoom: float = DEFAULT_ZOOM,
+    max_workers: Optional[int] = None,
+    pages_per_task: int = DEFAULT_PAGES_PER_TASK,
+    pages: Optional[Dict[str, Iterable[int]]] = None,
+) -> List[RenderedPage]:
+    """
+    Renders every page of PDF files to PNG images on a pool of processes.
+
+    Pages are split into (file, page range) work units so large files are spread over
+    all workers. Each worker opens its own document, as PyMuPDF documents cannot be
+    shared between processes.
+
+    Args:
+        file_paths (Iterable[str]): Paths of the PDF files.
+        output_dir (str): Directory of the images, created if missing.
+        zoom (float): Zoom factor of the rendered pages. Defaults to 2.
+        max_workers (int, optional): Number of worker processes. Defaults to the number
+            of CPUs. With 1, pages are rendered in the calling process.
+        pages_per_task (int): Maximum number of pages of each work unit. Defaults to 8.
+        pages (Dict[str, Iterable[int]], optional): 1-based numbers of the pages to
+            render, by file path. Files missing from the mapping are fully rendered.
+
+    Returns:
+        List[RenderedPage]: The rendered pages, ordered by file and page number.
+    """
+    tasks = plan_render_tasks(file_paths, output_dir, zoom, pages_per_task, pages)
+    max_workers = min(max_workers or os.cpu_count() or 1, len(tasks) or 1)
+    logger.info(f"Rendering {len(tasks)} page ranges on {max_workers} processes")
+    if max_workers == 1:
+        results = [render_task(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            # map keeps the order of the tasks, whatever order they complete in.
+            results = list(executor.map(render_task, tasks))
+    return [page for pages in results for page in pages]
+
+
+def pixmap_to_image(pixmap: fitz.Pixmap) -> Image.Image:
+    """
+    Wraps the pixel buffer of a pixmap in a Pillow image.
+
+    Args:
+        pixmap (fitz.Pixmap): The rendered page.
+
+    Returns:
+        Image.Image: The image.
+    """
+    mode = PIXMAP_MODES[pixmap.n]
+    return Image.frombuffer(
+        mode,
+        (pixmap.width, pixmap.height),
+        pixmap.samples_mv,
+        "raw",
+        mode,
+        pixmap.stride,
+        1,
+    )
+
+
+def encode_image(image: Image.Image, image_format: str, quality: int = 85) -> bytes:
+    """
+    Encodes a Pillow image in memory.
+
+    Args:
+        image (Image.Image): The image.
+        image_format (str): "png", "jpeg" or "webp".
+        quality (int): Quality of the lossy formats, from 1 to 100. Defaults to 85.
+
+    Returns:
+        bytes: The encoded image.
+    """
+    if image_format != "png" and image.mode == "1":
+        # Only PNG stores 1-bit images, the other formats get 8-bit grayscale.
+        image = image.convert("L")
+    buffer = BytesIO()
+    image.save(buffer, format=PIL_FORMATS[image_format], quality=quality)
+    return buffer.getvalue()
+
+
+def encode_pixmap(
+    pixmap: fitz.Pixmap,
+    image_format: str = "png",
+    quality: int = 85,
+    bilevel: bool = False,
+) -> Union[bytes, memoryview]:
+    """
+    Encodes a pixmap in memory.
+
+    Args:
+        pixmap (fitz.Pixmap): The rendered page.
+        image_format (str): One of IMAGE_FORMATS. Defaults to "png".
+        quality (int): Quality of the lossy formats, from 1 to 100. Defaults to 85.
+        bilevel (bool): Whether to threshold a grayscale pixmap to black and white.
+
+    Returns:
+        Union[bytes, memoryview]: The encoded image, or a view of the pixel buffer for
+        the "raw" format.
+    """
+    if image_format not in IMAGE_FORMATS:
+        raise ValueError(
+            f"Unsupported image format {image_format}, use one of {IMAGE_FORMATS}."
+        )
+    if bilevel:
+        image = pixmap_to_image(pixmap).point(
+            lambda value: 255 if value >= BILEVEL_THRESHOLD else 0, mode="1"
+        )
+        if image_format == "raw":
+            return memoryview(image.convert("L").tobytes())
+        return encode_image(image, image_format, quality)
+    if image_format == "png":
+        return pixmap.tobytes("png")
+    if image_format == "jpeg":
+        return pixmap.tobytes("jpg", jpg_quality=quality)
+    if image_format == "webp":
+        # PyMuPDF cannot write WebP, Pillow encodes straight from the pixel buffer.
+        return encode_image(pixmap_to_image(pixmap), image_format, quality)
+    return pixmap.samples_mv
+
+
+def render_page(page: fitz.Page, profile: RenderProfile) -> PageImage:
+    """
+    Renders a page to an in-memory image with a rendering profile.
+
+    Args:
+        page (fitz.Page): The page.
+        profile (RenderProfile): Resolution, colorspace, format and size limits.
+
+    Returns:
+        PageImage: The image of the page.
+    """
+    scale = page_scale(page.rect.width, page.rect.height, profile)
+    colorspace = fitz.csRGB if profile.colorspace == "rgb" else fitz.csGRAY
+    pixmap = page.get_pixmap(matrix=fitz.Matrix(scale, scale), colorspace=colorspace)
+    bilevel = profile.colorspace == "bilevel"
+    return PageImage(
+        page_number=page.number + 1,
+        width=pixmap.width,
+        height=pixmap.height,
+        channels=pixmap.n,
+        image_format=profile.image_format,
+        data=encode_pixmap(pixmap, profile.image_format, profile.quality, bilevel),
+        estimated_tokens=estimate_vision_tokens(pixmap.width, pixmap.height),
+        pixmap=pixmap if profile.image_format == "raw" and not bilevel else None,
+    )
+
+
+def iter_page_images(
+    doc: fitz.Document,
+    image_format: str = "png",
+    zoom: float = DEFAULT_ZOOM,
+    quality: int = 85,
+    pages: Optional[Iterable[int]] = None,
+    profile: Optional[Union[str, RenderProfile]] = None,
+) -> Iterator[PageImage]:
+    """
+    Renders the pages of an open document to in-memory images, one page at a time.
+
+    Args:
+        doc (fitz.Document): The document.
+        image_format (str): One of IMAGE_FORMATS. Defaults to "png".
+        zoom (float): Zoom factor of the rendered pages. Defaults to 2.
+        quality (int): Quality of the lossy formats, from 1 to 100. Defaults to 85.
+        pages (Iterable[int], optional): 1-based numbers of the pages to render.
+            Defaults to every page. An empty iterable renders no page.
+        profile (Union[str, RenderProfile], optional): Rendering profile, or the name
+            of one of RENDER_PROFILES. Replaces `image_format`, `zoom` and `quality`.
+
+    Yields:
+        PageImage: The image of each page, in the order of `pages`.
+    """
+    if profile is None:
+        profile = RenderProfile(
+            dpi=zoom * PDF_DPI, image_format=image_format, quality=quality
+        )
+    profile = get_render_profile(profile)
+    if profile.image_format not in IMAGE_FORMATS:
+        raise ValueError(
+            f"Unsupported image format {profile.image_format}, "
+            f"use one of {IMAGE_FORMATS}."
+        )
+    if profile.colorspace not in COLORSPACES:
+        raise ValueError(
+            f"Unsupported colorspace {profile.colorspace}, use one of {COLORSPACES}."
+        )
+    if pages is None:
+        pages = range(1, doc.page_count + 1)
+    for page_number in pages:
+        yield render_page(doc[page_number - 1], profile)
+
+
+def profile_report(
+    doc: fitz.Document,
+    profiles: Iterable[Union[str, RenderProfile]],
+    pages: Optional[Iterable[int]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Measures the payload size and vision token cost of rendering profiles.
+
+    Args:
+        doc (fitz.Document): The document.
+        profiles (Iterable[Union[str, RenderProfile]]): Profiles, or their names.
+        pages (Iterable[int], optional): 1-based numbers of the pages to render.
+            Defaults to every page.
+
+    Returns:
+        List[Dict]: For each profile, its name, the number of pages, the total and
+        per page bytes, the per page bytes once base64 encoded, the total and per page
+        estimated tokens, and the rendering time in seconds.
+    """
+    pages = list(range(1, doc.page_count + 1) if pages is None else pages)
+    report = []
+    for profile in profiles:
+        profile = get_render_profile(profile)
+        total_bytes = total_tokens = 0
+        start_time = time.perf_counter()
+        for image in iter_page_images(doc, pages=pages, profile=profile):
+            total_bytes += memoryview(image.data).nbytes
+            total_tokens += image.estimated_tokens
+        elapsed = time.perf_counter() - start_time
+        page_count = max(len(pages), 1)
+        report.append(
+            {
+                "profile": profile.name,
+                "pages": len(pages),
+                "bytes": total_bytes,
+                "bytes_per_page": total_bytes / page_count,
+                "base64_bytes_per_page": 4 * math.ceil(total_bytes / page_count / 3),
+                "tokens": total_tokens,
+                "tokens_per_page": total_tokens / page_count,
+                "seconds": elapsed,
+            }
+        )
+        logger.info(
+            f"Profile {profile.name}: {total_bytes / page_count / 1024:.1f} KiB and "
+            f"{total_tokens / page_count:.0f} tokens per page"
+        )
+    return report
@@ -0,0 +1,84 @@
+import io
+from typing import IO, Callable, Dict, Iterator, Union
+
+import fitz
+from PyPDF2 import PdfReader
+
+from utils.ml_logging import get_logger
+
+# Initialize logger
+logger = get_logger()
+
+# Local file path, in-memory content or binary file object of a PDF.
+PDFSource = Union[str, bytes, bytearray, memoryview, IO[bytes]]
+
+# Yields the text of each page of a PDF, in page order.
+TextBackend = Callable[[PDFSource], Iterator[str]]
+
+DEFAULT_TEXT_BACKEND = "pymupdf"
+
+
+def iter_pages_pymupdf(source: PDFSource) -> Iterator[str]:
+    """
+    Yields the text of each page with PyMuPDF, one page at a time.
+
+    Args:
+        source (PDFSource): Local file path, in-memory content or binary file object.
+
+    Yields:
+        str: The text of each page.
+    """
+    if isinstance(source, str):
+        doc = fitz.open(source)
+    elif isinstance(source, io.IOBase):
+        # PyMuPDF only opens streams that are fully in memory.
+        doc = fitz.open(stream=source.read(), filetype="pdf")
+    else:
+        doc = fitz.open(stream=source, filetype="pdf")
+    with doc:
+        for page in doc:
+            yield page.get_text("text")
+
+
+def iter_pages_pypdf2(source: PDFSource) -> Iterator[str]:
+    """
+    Yields the text of each page with PyPDF2, kept for compatibility with its output.
+
+    Args:
+        source (PDFSource): Local file path, in-memory content or binary file object.
+
+    Yields:
+        str: The text of each page.
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        source = io.BytesIO(source)
+    reader = PdfReader(source)
+    for page in reader.pages:
+        yield page.extract_text() or ""
+
+
+TEXT_BACKENDS: Dict[str, TextBackend] = {
+    "pymupdf": iter_pages_pymupdf,
+    "pypdf2": iter_pages_pypdf2,
+}
+
+
+def get_text_backend(backend: Union[str, TextBackend]) -> TextBackend:
+    """
+    Resolves a backend name into a text extraction backend.
+
+    Args:
+        backend (Union[str, TextBackend]): Name of a TEXT_BACKENDS entry, or a callable
+            yielding the text of each page of a PDF source.
+
+    Returns:
+        TextBackend: The backend.
+    """
+    if callable(backend):
+        return backend
+    try:
+        return TEXT_BACKENDS[backend]
+    except KeyError:
+        raise ValueError(
+            f"Unknown text backend {backend}, use one of {list(TEXT_BACKENDS)}."
+        ) from None
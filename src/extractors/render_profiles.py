@@ -0,0 +1,175 @@
+import math
+from typing import Dict, NamedTuple, Optional, Tuple, Union
+
+# Resolution of PDF coordinates, in points per inch.
+PDF_DPI = 72.0
+
+COLORSPACES = ("rgb", "gray", "bilevel")
+
+# Image token accounting of GPT-4 Vision models in "high" detail: the image is fitted
+# within 2048x2048, then scaled down so its shortest side is at most 768 pixels, and
+# costs a base amount plus a fixed amount per 512x512 tile.
+VISION_BASE_TOKENS = 85
+VISION_TILE_TOKENS = 170
+VISION_TILE_SIZE = 512
+VISION_MAX_SIDE = 2048
+VISION_SHORT_SIDE = 768
+
+
+class RenderProfile(NamedTuple):
+    """
+    Settings of the page images sent to OCR and vision models.
+
+    Attributes:
+        name (str): Name of the profile.
+        dpi (float): Target resolution of the rendered pages.
+        colorspace (str): "rgb", "gray", or "bilevel" for black and white.
+        image_format (str): "png", "jpeg", "webp" or "raw".
+        quality (int): Quality of the lossy formats, from 1 to 100.
+        max_pixels (int, optional): Maximum number of pixels of a page image.
+        max_tokens (int, optional): Vision token budget of a page image. Pages are
+            downscaled until their estimated cost fits.
+        fit_to_model (bool): Whether to render no larger than the resolution the vision
+            model rescales images to, since extra pixels only add payload.
+    """
+
+    name: str = "custom"
+    dpi: float = 144.0
+    colorspace: str = "rgb"
+    image_format: str = "png"
+    quality: int = 85
+    max_pixels: Optional[int] = None
+    max_tokens: Optional[int] = None
+    fit_to_model: bool = False
+
+
+RENDER_PROFILES: Dict[str, RenderProfile] = {
+    # The historical OCRHelper output: RGB PNG at a 2x zoom.
+    "default": RenderProfile("default"),
+    # Grayscale PNG at 200 DPI, for OCR of small print.
+    "ocr": RenderProfile("ocr", dpi=200, colorspace="gray"),
+    # Black and white at 300 DPI, for clean text-only scans.
+    "bilevel": RenderProfile("bilevel", dpi=300, colorspace="bilevel"),
+    # RGB JPEG sized to what GPT-4 Vision actually sees.
+    "vision": RenderProfile(
+        "vision", dpi=144, image_format="jpeg", quality=80, fit_to_model=True
+    ),
+    # Grayscale WebP within a 2 tile budget, for cheap vision requests.
+    "vision-compact": RenderProfile(
+        "vision-compact",
+        dpi=144,
+        colorspace="gray",
+        image_format="webp",
+        quality=60,
+        max_tokens=VISION_BASE_TOKENS + 2 * VISION_TILE_TOKENS,
+        fit_to_model=True,
+    ),
+}
+
+
+def get_render_profile(profile: Union[str, RenderProfile]) -> RenderProfile:
+    """
+    Resolves a profile name into a RenderProfile.
+
+    Args:
+        profile (Union[str, RenderProfile]): Name of a RENDER_PROFILES entry, or a
+            profile.
+
+    Returns:
+        RenderProfile: The profile.
+    """
+    if isinstance(profile, RenderProfile):
+        return profile
+    try:
+        return RENDER_PROFILES[profile]
+    except KeyError:
+        raise ValueError(
+            f"Unknown render profile {profile}, use one of {list(RENDER_PROFILES)}."
+        ) from None
+
+
+def vision_model_size(width: int, height: int) -> Tuple[int, int]:
+    """
+    Returns the size a GPT-4 Vision model rescales an image to, in "high" detail.
+
+    Args:
+        width (int): Width of the image, in pixels.
+        height (int): Height of the image, in pixels.
+
+    Returns:
+        Tuple[int, int]: The rescaled width and height.
+    """
+    scale = min(1.0, VISION_MAX_SIDE / max(width, height))
+    scale *= min(1.0, VISION_SHORT_SIDE / (min(width, height) * scale))
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+def estimate_vision_tokens(width: int, height: int, detail: str = "high") -> int:
+    """
+    Estimates the tokens a GPT-4 Vision model charges for an image.
+
+    Args:
+        width (int): Width of the image, in pixels.
+        height (int): Height of the image, in pixels.
+        detail (str): "high", or "low" for the flat base cost.
+
+    Returns:
+        int: The estimated number of tokens.
+    """
+    if detail == "low":
+        return VISION_BASE_TOKENS
+    width, height = vision_model_size(width, height)
+    tiles = math.ceil(width / VISION_TILE_SIZE) * math.ceil(height / VISION_TILE_SIZE)
+    return VISION_BASE_TOKENS + VISION_TILE_TOKENS * tiles
+
+
+def page_scale(page_width: float, page_height: float, profile: RenderProfile) -> float:
+    """
+    Computes the zoom factor of a page under a profile.
+
+    Starts from the target DPI, then only scales down: to the max-pixel cap, to the
+    size seen by the vision model, and until the token budget fits.
+
+    Args:
+        page_width (float): Width of the page, in points.
+        page_height (float): Height of the page, in points.
+        profile (RenderProfile): The profile.
+
+    Returns:
+        float: The zoom factor, in pixels per point.
+    """
+    scale = profile.dpi / PDF_DPI
+    if profile.max_pixels:
+        pixels = page_width * page_height * scale * scale
+        if pixels > profile.max_pixels:
+            scale *= math.sqrt(profile.max_pixels / pixels)
+    if profile.fit_to_model:
+        model_width, _ = vision_model_size(
+            max(1, round(page_width * scale)), max(1, round(page_height * scale))
+        )
+        scale = min(scale, model_width / page_width)
+    if profile.max_tokens:
+        if profile.max_tokens < VISION_BASE_TOKENS + VISION_TILE_TOKENS:
+            raise ValueError(
+                "max_tokens must allow at least one tile, "
+                f"{VISION_BASE_TOKENS + VISION_TILE_TOKENS} tokens."
+            )
+
+        def tokens(candidate: float) -> int:
+            # Pixmap sizes are rounded up, so are the estimated ones.
+            return estimate_vision_tokens(
+                max(1, math.ceil(page_width * candidate)),
+                max(1, math.ceil(page_height * candidate)),
+            )
+
+        if tokens(scale) > profile.max_tokens:
+            # The token cost only grows with the scale, so bisect the largest fit.
+            low, high = 0.0, scale
+            for _ in range(30):
+                middle = (low + high) / 2
+                if tokens(middle) <= profile.max_tokens:
+                    low = middle
+                else:
+                    high = middle
+            scale = low
+    return scale
@@ -1,3 +1,6 @@
+from urllib.parse import unquote, urlparse
+
+
 def get_container_and_blob_name_from_url(blob_url: str) -> tuple:
     """
     Retrieves the container name and the blob name from a blob URL.
@@ -18,3 +21,19 @@ def get_container_and_blob_name_from_url(blob_url: str) -> tuple:
     blob_name = parts[-1]
 
     return container_name, blob_name
+
+
+def get_container_and_prefix_from_url(folder_url: str) -> tuple:
+    """
+    Retrieves the container name and the folder prefix from a blob folder URL.
+
+    The container name is the first part of the URL path and the prefix is the rest of
+    it, so "https://account.blob.core.windows.net/docs/2024/invoices" gives
+    ("docs", "2024/invoices").
+
+    :param folder_url: The blob folder URL.
+    :return: A tuple containing the container name and the prefix.
+    """
+    path = urlparse(folder_url).path.lstrip("/")
+    container_name, _, prefix = path.partition("/")
+    return container_name, unquote(prefix)
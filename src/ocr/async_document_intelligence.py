@@ -0,0 +1,386 @@
+import asyncio
+import os
+from contextlib import ExitStack
+from typing import IO, Any, Dict, List, Optional, Union
+
+import aiohttp
+from azure.ai.documentintelligence import models
+from azure.ai.documentintelligence.aio import DocumentIntelligenceClient
+from azure.ai.documentintelligence.models import AnalyzeDocumentRequest, AnalyzeResult
+from azure.core.credentials import AzureKeyCredential
+from azure.core.pipeline.transport import AioHttpTransport
+from dotenv import load_dotenv
+
+from src.extractors.async_blob_data_extractor import AsyncAzureBlobDataExtractor
+from src.ocr.document_input import (
+    DocumentInput,
+    describe_document_input,
+    is_url,
+    open_document_body,
+)
+from src.ocr.document_intelligence import (
+    build_analyze_kwargs,
+    is_blob_url,
+)
+from src.ocr.polling import (
+    DEFAULT_MODEL_POLLING_CONFIGS,
+    DEFAULT_POLLING_CONFIG,
+    AsyncAdaptiveLROPolling,
+    PollingConfig,
+    resolve_polling_config,
+)
+from src.ocr.result_cache import AnalyzeResultCache
+from src.ocr.sharding import DEFAULT_SHARD_SIZE, merge_analyze_results, shard_inputs
+from utils.memory import PeakRSSTracker
+from utils.ml_logging import get_logger
+
+# Initialize logging
+logger = get_logger()
+
+
+class AsyncAzureDocumentIntelligenceManager:
+    """
+    Asynchronous counterpart of AzureDocumentIntelligenceManager, built on the aio client.
+
+    A single client, and therefore a single HTTP connection pool, is shared by every
+    analysis started from the manager, so many long-running operations can be polled
+    concurrently from one event loop.
+    """
+
+    def __init__(
+        self,
+        azure_endpoint: Optional[str] = None,
+        azure_key: Optional[str] = None,
+        container_name: Optional[str] = None,
+        max_connections: int = 100,
+        polling_config: Optional[PollingConfig] = None,
+        model_polling_configs: Optional[Dict[str, PollingConfig]] = None,
+        result_cache: Optional[AnalyzeResultCache] = None,
+    ):
+        """
+        Initialize the class with configurations for Azure's Document Analysis Client.
+
+        :param azure_endpoint: Endpoint URL for Azure's Document Analysis Client.
+        :param azure_key: API key for Azure's Document Analysis Client.
+        :param container_name: Name of the Azure Blob Storage container.
+        :param max_connections: Maximum number of open connections in the shared pool.
+        :param polling_config: Default polling configuration of analyze calls.
+        :param model_polling_configs: Polling configurations by model type, overriding the
+            defaults tuned for the prebuilt models.
+        :param result_cache: Optional persistent cache of analysis results.
+        """
+        self.azure_endpoint = azure_endpoint
+        self.azure_key = azure_key
+
+        if not self.azure_endpoint or not self.azure_key:
+            self.load_environment_variables_from_env_file()
+
+        if not self.azure_endpoint or not self.azure_key:
+            raise ValueError(
+                "Azure endpoint and key must be provided either as parameters or in a .env file."
+            )
+
+        self.max_connections = max_connections
+        self.polling_config = polling_config or DEFAULT_POLLING_CONFIG
+        self.model_polling_configs = {
+            **DEFAULT_MODEL_POLLING_CONFIGS,
+            **(model_polling_configs or {}),
+        }
+        self.last_polling_stats: Optional[Dict[str, Any]] = None
+        self.last_memory_stats: Optional[Dict[str, Any]] = None
+        self.result_cache = result_cache
+        self.blob_manager = AsyncAzureBlobDataExtractor(container_name=container_name)
+        self._client: Optional[DocumentIntelligenceClient] = None
+
+    def load_environment_variables_from_env_file(self):
+        """
+        Loads required environment variables for the application from a .env file.
+        """
+        load_dotenv()
+
+        self.azure_endpoint = os.getenv("AZURE_DOCUMENT_INTELLIGENCE_ENDPOINT")
+        self.azure_key = os.getenv("AZURE_DOCUMENT_INTELLIGENCE_KEY")
+
+        # Check for any missing required environment variables
+        required_vars = {
+            "AZURE_DOCUMENT_INTELLIGENCE_ENDPOINT": self.azure_endpoint,
+            "AZURE_DOCUMENT_INTELLIGENCE_KEY": self.azure_key,
+        }
+
+        missing_vars = [var for var, value in required_vars.items() if not value]
+
+        if missing_vars:
+            raise EnvironmentError(
+                f"Missing required environment variables: {', '.join(missing_vars)}"
+            )
+
+    @property
+    def document_analysis_client(self) -> DocumentIntelligenceClient:
+        """
+        Returns the shared aio client, creating it on first use.
+
+        The client is created lazily because its aiohttp session has to be bound to the
+        running event loop.
+
+        :return: The shared DocumentIntelligenceClient.
+        """
+        if self._client is None:
+            session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_connections)
+            )
+            self._client = DocumentIntelligenceClient(
+                endpoint=self.azure_endpoint,
+                credential=AzureKeyCredential(self.azure_key),
+                headers={"x-ms-useragent": "langchain-parser/1.0.0"},
+                transport=AioHttpTransport(session=session, session_owner=True),
+            )
+        return self._client
+
+    async def close(self) -> None:
+        """
+        Closes the shared client and its connection pool.
+        """
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+
+    async def __aenter__(self) -> "AsyncAzureDocumentIntelligenceManager":
+        """
+        Enters the async context manager.
+        """
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        """
+        Closes the shared client when leaving the async context manager.
+        """
+        await self.close()
+
+    async def _open_blob_analyze_request(
+        self, blob_url: str, analyze_kwargs: Dict[str, Any], stack: ExitStack
+    ) -> Union[AnalyzeDocumentRequest, IO[bytes]]:
+        """
+        Builds the analyze request of a blob without loading the blob in memory.
+
+        See `open_blob_analyze_request`, of which this is the asynchronous counterpart.
+
+        :param blob_url: URL of the blob.
+        :param analyze_kwargs: Keyword arguments of begin_analyze_document, updated with the
+            content type of the request.
+        :param stack: Exit stack that closes the temporary file, if any.
+        :return: The analyze request, or the file to upload.
+        """
+        sas_url = self.blob_manager.generate_sas_url(blob_url)
+        if sas_url is not None:
+            logger.info("Blob URL detected. Sending a SAS-signed URL.")
+            return AnalyzeDocumentRequest(url_source=sas_url)
+        logger.info("Blob URL detected. Streaming content through a temporary file.")
+        analyze_kwargs["content_type"] = "application/octet-stream"
+        return stack.enter_context(
+            await self.blob_manager.download_to_temp_file(blob_url)
+        )
+
+    async def analyze_document(
+        self,
+        document_input: DocumentInput,
+        model_type: str = "prebuilt-layout",
+        pages: Optional[str] = None,
+        locale: Optional[str] = None,
+        string_index_type: Optional[Union[str, models.StringIndexType]] = None,
+        features: Optional[List[str]] = None,
+        query_fields: Optional[List[str]] = None,
+        output_format: Optional[Union[str, models.ContentFormat]] = None,
+        content_type: Optional[str] = None,
+        polling_config: Optional[PollingConfig] = None,
+        **kwargs: Any,
+    ) -> AnalyzeResult:
+        """
+        Analyzes a document without blocking the event loop.
+
+        Takes the same parameters as `AzureDocumentIntelligenceManager.analyze_document`.
+        The peak RSS is process-wide, so it covers every document analyzed concurrently.
+
+        :param document_input: URL or file path of the document to analyze, or its content
+            as bytes, a memoryview or a binary file object.
+        :param model_type: Type of pre-trained model to use for analysis. Defaults to 'prebuilt-layout'.
+        :param pages: List of 1-based page numbers to analyze.  Ex. "1-3,5,7-9".
+        :param locale: Locale hint for text recognition and document analysis.
+        :param string_index_type: Method used to compute string offset and length.
+        :param features: List of optional analysis features.
+        :param query_fields: List of additional fields to extract.
+        :param output_format: Format of the analyze result top-level content.
+        :param content_type: Body Parameter content-type. Defaults to "application/json" for
+            URLs and "application/octet-stream" for uploaded content.
+        :param polling_config: Polling configuration of this call. Defaults to the configuration
+            of the model type, then to the manager default.
+        :param kwargs: Additional keyword arguments to pass to the analysis method.
+        :return: The AnalyzeResult of the document.
+        """
+        analyze_kwargs = build_analyze_kwargs(
+            document_input,
+            model_type=model_type,
+            pages=pages,
+            locale=locale,
+            string_index_type=string_index_type,
+            features=features,
+            query_fields=query_fields,
+            output_format=output_format,
+            content_type=content_type,
+            **kwargs,
+        )
+        polling_method = AsyncAdaptiveLROPolling(
+            resolve_polling_config(
+                model_type,
+                polling_config,
+                self.model_polling_configs,
+                self.polling_config,
+            ),
+            path_format_arguments={"endpoint": self.azure_endpoint},
+        )
+        analyze_kwargs["polling"] = polling_method
+
+        description = describe_document_input(document_input)
+        cache_key = None
+        if self.result_cache is not None:
+            version = None
+            if is_blob_url(document_input):
+                metadata = await self.blob_manager.extract_metadata(document_input)
+                version = metadata.get("etag")
+            if is_blob_url(document_input) and version is None:
+                logger.warning(f"Not caching {description}, its ETag is unavailable")
+            else:
+                # Hashing local files and reading the cache are blocking I/O.
+                cache_key = await asyncio.to_thread(
+                    self.result_cache.key_for,
+                    document_input,
+                    version,
+                    model_type=model_type,
+                    features=features,
+                    pages=pages,
+                    locale=locale,
+                    output_format=output_format,
+                    string_index_type=string_index_type,
+                    query_fields=",".join(query_fields) if query_fields else None,
+                )
+                cached_result = await asyncio.to_thread(
+                    self.result_cache.get, cache_key
+                )
+                if cached_result is not None:
+                    logger.info(f"Using cached result for {description}")
+                    return cached_result
+
+        with PeakRSSTracker() as memory_tracker, ExitStack() as stack:
+            if is_blob_url(document_input):
+                analyze_request = await self._open_blob_analyze_request(
+                    document_input, analyze_kwargs, stack
+                )
+            elif is_url(document_input):
+                analyze_request = AnalyzeDocumentRequest(url_source=document_input)
+            else:
+                analyze_request = open_document_body(document_input, stack)
+            poller = await self.document_analysis_client.begin_analyze_document(
+                analyze_request=analyze_request, **analyze_kwargs
+            )
+            result = await poller.result()
+
+        self.last_polling_stats = polling_method.stats
+        self.last_memory_stats = memory_tracker.stats
+        logger.info(
+            f"RSS changed by {memory_tracker.stats['rss_increase_bytes']} bytes while "
+            f"analyzing {description}, process peak RSS "
+            f"{memory_tracker.stats['peak_rss_bytes']} bytes"
+        )
+        if cache_key is not None:
+            await asyncio.to_thread(self.result_cache.put, cache_key, result)
+        return result
+
+    async def analyze_document_sharded(
+        self,
+        document_input: DocumentInput,
+        shard_size: int = DEFAULT_SHARD_SIZE,
+        page_count: Optional[int] = None,
+        max_in_flight: int = 4,
+        string_index_type: Union[
+            str, models.StringIndexType
+        ] = models.StringIndexType.UNICODE_CODE_POINT,
+        **kwargs: Any,
+    ) -> AnalyzeResult:
+        """
+        Analyzes a long document as page-range shards concurrently and merges the results.
+
+        See `AzureDocumentIntelligenceManager.analyze_document_sharded`.
+
+        :param document_input: URL or file path of the document to analyze, or its content.
+        :param shard_size: Maximum number of pages of each shard.
+        :param page_count: Number of pages of the document. Required for URLs.
+        :param max_in_flight: Maximum number of shards analyzed at once.
+        :param string_index_type: Method used to compute string offset and length.
+        :param kwargs: Keyword arguments passed to `analyze_document` for every shard.
+        :return: The merged AnalyzeResult of the document.
+        """
+        ranges, shards = await asyncio.to_thread(
+            shard_inputs, document_input, page_count, shard_size
+        )
+        logger.info(
+            f"Analyzing {describe_document_input(document_input)} as {len(shards)} "
+            f"shards of up to {shard_size} pages, {max_in_flight} at a time"
+        )
+        semaphore = asyncio.Semaphore(max_in_flight)
+
+        async def analyze(
+            shard_input: DocumentInput, pages: Optional[str]
+        ) -> AnalyzeResult:
+            async with semaphore:
+                return await self.analyze_document(
+                    shard_input,
+                    pages=pages,
+                    string_index_type=string_index_type,
+                    **kwargs,
+                )
+
+        # Shards share the process RSS, so memory is measured once for the batch.
+        with PeakRSSTracker() as memory_tracker:
+            results = await asyncio.gather(
+                *(analyze(shard_input, pages) for shard_input, pages in shards)
+            )
+        if len(results) == 1:
+            return results[0]
+        self.last_memory_stats = memory_tracker.stats
+        return merge_analyze_results(results, ranges)
+
+    async def analyze_many(
+        self,
+        document_inputs: List[DocumentInput],
+        max_in_flight: int = 8,
+        return_exceptions: bool = True,
+        **kwargs: Any,
+    ) -> List[Union[AnalyzeResult, BaseException]]:
+        """
+        Analyzes many documents, keeping up to `max_in_flight` operations running at once.
+
+        :param document_inputs: URLs, file paths or contents of the documents to analyze.
+        :param max_in_flight: Maximum number of analyze operations in flight at once.
+        :param return_exceptions: Whether to return the exception of a failed document in
+            its position instead of raising it.
+        :param kwargs: Keyword arguments passed to `analyze_document` for every document.
+        :return: The AnalyzeResult (or exception) of each document, in input order.
+        """
+        semaphore = asyncio.Semaphore(max_in_flight)
+
+        async def analyze(document_input: DocumentInput) -> AnalyzeResult:
+            async with semaphore:
+                try:
+                    return await self.analyze_document(document_input, **kwargs)
+                except Exception as e:
+                    logger.error(
+                        f"Failed to analyze {describe_document_input(document_input)}: {e}"
+                    )
+                    raise
+
+        logger.info(
+            f"Analyzing {len(document_inputs)} documents, {max_in_flight} at a time"
+        )
+        return await asyncio.gather(
+            *(analyze(document_input) for document_input in document_inputs),
+            return_exceptions=return_exceptions,
+        )
@@ -0,0 +1,136 @@
+import io
+import os
+from contextlib import ExitStack
+from typing import IO, Union
+
+from utils.ml_logging import get_logger
+
+# Initialize logging
+logger = get_logger()
+
+# A URL, a local file path, in-memory content or a binary file object.
+DocumentInput = Union[str, bytes, bytearray, memoryview, IO[bytes]]
+
+
+class MemoryViewReader(io.RawIOBase):
+    """
+    Read-only, seekable file object over a buffer, reading it without copying it first.
+
+    Unlike io.BytesIO, the buffer is not copied when the reader is created, so bytearray,
+    memoryview and mmap contents can be uploaded in chunks.
+    """
+
+    def __init__(self, buffer: Union[bytes, bytearray, memoryview]):
+        """
+        Initialize the MemoryViewReader.
+
+        :param buffer: Any object supporting the buffer protocol.
+        """
+        super().__init__()
+        self._view = memoryview(buffer).cast("B")
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        """
+        Copies the next bytes of the view into a buffer.
+
+        :param buffer: The writable buffer to fill.
+        :return: The number of bytes copied, 0 at the end of the view.
+        """
+        target = memoryview(buffer).cast("B")
+        count = min(len(target), len(self._view) - self._position)
+        target[:count] = self._view[self._position : self._position + count]
+        self._position += count
+        return count
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self._position + offset
+        elif whence == io.SEEK_END:
+            position = len(self._view) + offset
+        else:
+            raise ValueError(f"Invalid whence: {whence}")
+        if position < 0:
+            raise ValueError(f"Negative seek position {position}")
+        self._position = position
+        return position
+
+    def tell(self) -> int:
+        return self._position
+
+    def __len__(self) -> int:
+        return len(self._view)
+
+    def close(self) -> None:
+        if not self.closed:
+            self._view.release()
+        super().close()
+
+
+def is_url(document_input: DocumentInput) -> bool:
+    """
+    Checks whether a document input is a URL, as opposed to content to upload.
+
+    :param document_input: The document input.
+    :return: True for HTTP(S) URLs.
+    """
+    return isinstance(document_input, str) and document_input.startswith(
+        ("https://", "http://")
+    )
+
+
+def describe_document_input(document_input: DocumentInput) -> str:
+    """
+    Describes a document input for log messages, without printing its content.
+
+    :param document_input: The document input.
+    :return: The URL or path, the file name, or the type of the content.
+    """
+    if isinstance(document_input, str):
+        return document_input
+    name = getattr(document_input, "name", None)
+    if isinstance(name, str):
+        return name
+    return f"<{type(document_input).__name__}>"
+
+
+def open_document_body(
+    document_input: DocumentInput, stack: ExitStack
+) -> Union[bytes, IO[bytes]]:
+    """
+    Prepares local content to be uploaded as the raw body of an analyze request.
+
+    Files are streamed from disk rather than read whole, and buffers are wrapped without
+    a copy. Bytes are returned as they are, since the client sends them directly.
+
+    :param document_input: A local file path, in-memory content or a binary file object.
+    :param stack: Exit stack that closes the files opened here.
+    :return: The request body.
+    :raises FileNotFoundError: If a file path does not exist.
+    """
+    if isinstance(document_input, str):
+        if not os.path.isfile(document_input):
+            raise FileNotFoundError(f"Document not found: {document_input}")
+        logger.info(f"Uploading local file {document_input}")
+        return stack.enter_context(open(document_input, "rb"))
+    if isinstance(document_input, bytes):
+        return document_input
+    if isinstance(document_input, (bytearray, memoryview)):
+        return stack.enter_context(MemoryViewReader(document_input))
+    if isinstance(document_input, io.IOBase):
+        return document_input
+    # Other buffers, such as mmap objects, are read through a memoryview.
+    try:
+        return stack.enter_context(MemoryViewReader(document_input))
+    except TypeError:
+        raise TypeError(
+            f"Unsupported document input type: {type(document_input).__name__}"
+        ) from None
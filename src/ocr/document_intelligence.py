@@ -1,23 +1,134 @@
 import os
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
 from functools import lru_cache
-from typing import Any, Dict, Iterator, List, Optional, Union
+from typing import IO, Any, Dict, Iterator, List, Optional, Tuple, Union
 
 from azure.ai.documentintelligence import DocumentIntelligenceClient, models
 
 # from azure.ai.formrecognizer import DocumentAnalysisClient
-from azure.ai.documentintelligence.models import AnalyzeDocumentRequest, Document
+from azure.ai.documentintelligence.models import (
+    AnalyzeDocumentRequest,
+    AnalyzeResult,
+    Document,
+)
 from azure.core.credentials import AzureKeyCredential
 from azure.core.polling import LROPoller
 from dotenv import load_dotenv
 from langchain_core.documents import Document as LangchainDocument
 
 from src.extractors.blob_data_extractor import AzureBlobDataExtractor
+from src.ocr.document_input import (
+    DocumentInput,
+    describe_document_input,
+    is_url,
+    open_document_body,
+)
+from src.ocr.document_loader import iter_page_documents, iter_section_documents
+from src.ocr.invoice_fields import INVOICE_FIELDS, INVOICE_ITEM_FIELDS
+from src.ocr.polling import (
+    DEFAULT_MODEL_POLLING_CONFIGS,
+    DEFAULT_POLLING_CONFIG,
+    AdaptiveLROPolling,
+    PollingConfig,
+    resolve_polling_config,
+)
+from src.ocr.result_cache import AnalyzeResultCache
+from src.ocr.sharding import DEFAULT_SHARD_SIZE, merge_analyze_results, shard_inputs
+from utils.memory import PeakRSSTracker
 from utils.ml_logging import get_logger
 
 # Initialize logging
 logger = get_logger()
 
 
+def build_analyze_kwargs(
+    document_input: DocumentInput,
+    model_type: str = "prebuilt-layout",
+    pages: Optional[str] = None,
+    locale: Optional[str] = None,
+    string_index_type: Optional[Union[str, models.StringIndexType]] = None,
+    features: Optional[List[str]] = None,
+    query_fields: Optional[List[str]] = None,
+    output_format: Optional[Union[str, models.ContentFormat]] = None,
+    content_type: Optional[str] = None,
+    **kwargs: Any,
+) -> Dict[str, Any]:
+    """
+    Validates a document input and builds the keyword arguments of begin_analyze_document.
+
+    Shared by the synchronous and asynchronous managers, so both accept the same options.
+    See `AzureDocumentIntelligenceManager.analyze_document` for the parameters.
+
+    :return: Keyword arguments for begin_analyze_document, without the analyze request.
+    :raises ValueError: If the document input is an HTTP URL.
+    """
+    if isinstance(document_input, str) and document_input.startswith("http://"):
+        raise ValueError("HTTP URLs are not supported. Please use HTTPS.")
+
+    # Convert feature strings into DocumentAnalysisFeature objects
+    if features is not None:
+        features = [
+            getattr(models.DocumentAnalysisFeature, feature) for feature in features
+        ]
+
+    # URLs are sent in a JSON request, anything else is uploaded as the raw body.
+    if content_type is None:
+        content_type = (
+            "application/json" if is_url(document_input) else "application/octet-stream"
+        )
+
+    return {
+        "model_id": model_type,
+        "pages": pages,
+        "locale": locale,
+        "string_index_type": string_index_type,
+        "features": features,
+        "query_fields": query_fields,
+        "output_content_format": output_format if output_format else "text",
+        "content_type": content_type,
+        **kwargs,
+    }
+
+
+def is_blob_url(document_input: DocumentInput) -> bool:
+    """
+    Checks whether a document input is an Azure Blob Storage URL.
+
+    :param document_input: The document input.
+    :return: True for HTTPS URLs on blob.core.windows.net.
+    """
+    return is_url(document_input) and ("blob.core.windows.net" in document_input)
+
+
+def open_blob_analyze_request(
+    blob_manager: AzureBlobDataExtractor,
+    blob_url: str,
+    analyze_kwargs: Dict[str, Any],
+    stack: ExitStack,
+) -> Union[AnalyzeDocumentRequest, IO[bytes]]:
+    """
+    Builds the analyze request of a blob without loading the blob in memory.
+
+    The service reads the blob itself through a SAS-signed URL. When the URL cannot be
+    signed, the blob is streamed to a temporary file that is uploaded as the raw body.
+
+    :param blob_manager: The blob extractor with access to the blob.
+    :param blob_url: URL of the blob.
+    :param analyze_kwargs: Keyword arguments of begin_analyze_document, updated with the
+        content type of the request.
+    :param stack: Exit stack that closes the temporary file, if any.
+    :return: The analyze request, or the file to upload.
+    """
+    sas_url = blob_manager.generate_sas_url(blob_url)
+    if sas_url is not None:
+        logger.info("Blob URL detected. Sending a SAS-signed URL.")
+        return AnalyzeDocumentRequest(url_source=sas_url)
+    logger.info("Blob URL detected. Streaming content through a temporary file.")
+    analyze_kwargs["content_type"] = "application/octet-stream"
+    return stack.enter_context(blob_manager.download_to_temp_file(blob_url))
+
+
 class AzureDocumentIntelligenceManager:
     """
     A class to interact with Azure's Document Analysis Client.
@@ -28,6 +139,9 @@ class AzureDocumentIntelligenceManager:
         azure_endpoint: Optional[str] = None,
         azure_key: Optional[str] = None,
         container_name: Optional[str] = None,
+        polling_config: Optional[PollingConfig] = None,
+        model_polling_configs: Optional[Dict[str, PollingConfig]] = None,
+        result_cache: Optional[AnalyzeResultCache] = None,
     ):
         """
         Initialize the class with configurations for Azure's Document Analysis Client.
@@ -35,6 +149,10 @@ class AzureDocumentIntelligenceManager:
         :param azure_endpoint: Endpoint URL for Azure's Document Analysis Client.
         :param azure_key: API key for Azure's Document Analysis Client.
         :param container_client: Azure Container Client specific to the container.
+        :param polling_config: Default polling configuration of analyze calls.
+        :param model_polling_configs: Polling configurations by model type, overriding the
+            defaults tuned for the prebuilt models.
+        :param result_cache: Optional persistent cache of analysis results.
         """
         self.azure_endpoint = azure_endpoint
         self.azure_key = azure_key
@@ -48,12 +166,19 @@ class AzureDocumentIntelligenceManager:
             )
 
         self.blob_manager = AzureBlobDataExtractor(container_name=container_name)
+        self.polling_config = polling_config or DEFAULT_POLLING_CONFIG
+        self.model_polling_configs = {
+            **DEFAULT_MODEL_POLLING_CONFIGS,
+            **(model_polling_configs or {}),
+        }
+        self.last_polling_stats: Optional[Dict[str, Any]] = None
+        self.last_memory_stats: Optional[Dict[str, Any]] = None
+        self.result_cache = result_cache
 
         self.document_analysis_client = DocumentIntelligenceClient(
             endpoint=self.azure_endpoint,
             credential=AzureKeyCredential(self.azure_key),
             headers={"x-ms-useragent": "langchain-parser/1.0.0"},
-            polling_interval=30,
         )
 
     @lru_cache(maxsize=1)
@@ -83,7 +208,7 @@ class AzureDocumentIntelligenceManager:
 
     def analyze_document(
         self,
-        document_input: str,
+        document_input: DocumentInput,
         model_type: str = "prebuilt-layout",
         pages: Optional[str] = None,
         locale: Optional[str] = None,
@@ -91,13 +216,15 @@ class AzureDocumentIntelligenceManager:
         features: Optional[List[str]] = None,
         query_fields: Optional[List[str]] = None,
         output_format: Optional[Union[str, models.ContentFormat]] = None,
-        content_type: str = "application/json",
+        content_type: Optional[str] = None,
+        polling_config: Optional[PollingConfig] = None,
         **kwargs: Any,
     ) -> LROPoller:
         """
         Analyzes a document using Azure's Document Analysis Client with pre-trained models.
 
-        :param document_input: URL or file path of the document to analyze.
+        :param document_input: URL or file path of the document to analyze, or its content
+            as bytes, a memoryview or a binary file object.
         :param model_type: Type of pre-trained model to use for analysis. Defaults to 'prebuilt-layout'.
             Options include:
             - 'prebuilt-document': Generic document understanding.
@@ -128,105 +255,147 @@ class AzureDocumentIntelligenceManager:
             - "STYLE_FONT": Detects and analyzes font styles in the document.
         :param query_fields: List of additional fields to extract.
         :param output_content_format: Format of the analyze result top-level content.
-        :param content_type: Body Parameter content-type. Content type parameter for JSON body.
+        :param content_type: Body Parameter content-type. Defaults to "application/json" for
+            URLs and "application/octet-stream" for uploaded content.
+        :param polling_config: Polling configuration of this call. Defaults to the configuration
+            of the model type, then to the manager default.
         :param kwargs: Additional keyword arguments to pass to the analysis method.
         :return: An instance of LROPoller that returns AnalyzeResult.
         """
-        # Convert feature strings into DocumentAnalysisFeature objects
-        if features is not None:
-            features = [
-                getattr(models.DocumentAnalysisFeature, feature) for feature in features
-            ]
-
-        # Check if the document_input is a URL
-        if document_input.startswith(("http://", "https://")):
-            # If it's an HTTP URL, raise an error
-            if document_input.startswith("http://"):
-                raise ValueError("HTTP URLs are not supported. Please use HTTPS.")
-            # If it's an HTTPS URL but contains "blob.core.windows.net", process it as a blob
-            elif "blob.core.windows.net" in document_input:
-                logger.info("Blob URL detected. Extracting content.")
-                content_bytes = self.blob_manager.extract_content(document_input)
-                poller = self.document_analysis_client.begin_analyze_document(
-                    model_id=model_type,
-                    analyze_request=AnalyzeDocumentRequest(base64_source=content_bytes),
-                    pages=pages,
-                    locale=locale,
-                    string_index_type=string_index_type,
-                    features=features,
-                    query_fields=query_fields,
-                    output_content_format=output_format if output_format else "text",
-                    content_type=content_type,
-                    **kwargs,
-                )
+        analyze_kwargs = build_analyze_kwargs(
+            document_input,
+            model_type=model_type,
+            pages=pages,
+            locale=locale,
+            string_index_type=string_index_type,
+            features=features,
+            query_fields=query_fields,
+            output_format=output_format,
+            content_type=content_type,
+            **kwargs,
+        )
+        polling_method = AdaptiveLROPolling(
+            resolve_polling_config(
+                model_type,
+                polling_config,
+                self.model_polling_configs,
+                self.polling_config,
+            ),
+            path_format_arguments={"endpoint": self.azure_endpoint},
+        )
+        analyze_kwargs["polling"] = polling_method
+
+        description = describe_document_input(document_input)
+        cache_key = None
+        if self.result_cache is not None:
+            version = None
+            if is_blob_url(document_input):
+                version = self.blob_manager.extract_metadata(document_input).get("etag")
+            if is_blob_url(document_input) and version is None:
+                logger.warning(f"Not caching {description}, its ETag is unavailable")
             else:
-                poller = self.document_analysis_client.begin_analyze_document(
-                    model_id=model_type,
-                    analyze_request=AnalyzeDocumentRequest(url_source=document_input),
-                    pages=pages,
-                    locale=locale,
-                    string_index_type=string_index_type,
+                cache_key = self.result_cache.key_for(
+                    document_input,
+                    version,
+                    model_type=model_type,
                     features=features,
-                    query_fields=query_fields,
-                    output_content_format=output_format if output_format else "text",
-                    content_type=content_type,
-                    **kwargs,
-                )
-        else:
-            with open(document_input, "rb") as f:
-                # FIXME: local upload is not working
-                poller = self.document_analysis_client.begin_analyze_document(
-                    model_id=model_type,
-                    analyze_request=f,
                     pages=pages,
                     locale=locale,
+                    output_format=output_format,
                     string_index_type=string_index_type,
-                    features=features,
-                    query_fields=query_fields,
-                    output_content_format=output_format if output_format else "text",
-                    content_type=content_type,
-                    **kwargs,
+                    query_fields=",".join(query_fields) if query_fields else None,
+                )
+                cached_result = self.result_cache.get(cache_key)
+                if cached_result is not None:
+                    logger.info(f"Using cached result for {description}")
+                    return cached_result
+
+        with PeakRSSTracker() as memory_tracker, ExitStack() as stack:
+            if is_blob_url(document_input):
+                analyze_request = open_blob_analyze_request(
+                    self.blob_manager, document_input, analyze_kwargs, stack
                 )
+            elif is_url(document_input):
+                analyze_request = AnalyzeDocumentRequest(url_source=document_input)
+            else:
+                analyze_request = open_document_body(document_input, stack)
+            poller = self.document_analysis_client.begin_analyze_document(
+                analyze_request=analyze_request, **analyze_kwargs
+            )
+            result = poller.result()
+
+        self.last_polling_stats = polling_method.stats
+        self.last_memory_stats = memory_tracker.stats
+        logger.info(
+            f"RSS changed by {memory_tracker.stats['rss_increase_bytes']} bytes while "
+            f"analyzing {description}, process peak RSS "
+            f"{memory_tracker.stats['peak_rss_bytes']} bytes"
+        )
+        if cache_key is not None:
+            self.result_cache.put(cache_key, result)
+        return result
+
+    def analyze_document_sharded(
+        self,
+        document_input: DocumentInput,
+        shard_size: int = DEFAULT_SHARD_SIZE,
+        page_count: Optional[int] = None,
+        max_workers: int = 4,
+        string_index_type: Union[
+            str, models.StringIndexType
+        ] = models.StringIndexType.UNICODE_CODE_POINT,
+        **kwargs: Any,
+    ) -> AnalyzeResult:
+        """
+        Analyzes a long document as page-range shards in parallel and merges the results.
 
-        return poller.result()
+        Local PDFs are split into smaller PDFs, while URLs are analyzed with the `pages`
+        option. The merged result has document page numbers, and offsets into the merged
+        content, which is why the string index type cannot be "textElements".
+
+        :param document_input: URL or file path of the document to analyze, or its content.
+        :param shard_size: Maximum number of pages of each shard.
+        :param page_count: Number of pages of the document. Required for URLs.
+        :param max_workers: Maximum number of shards analyzed at once.
+        :param string_index_type: Method used to compute string offset and length.
+        :param kwargs: Keyword arguments passed to `analyze_document` for every shard.
+        :return: The merged AnalyzeResult of the document.
+        """
+        ranges, shards = shard_inputs(document_input, page_count, shard_size)
+        logger.info(
+            f"Analyzing {describe_document_input(document_input)} as {len(shards)} "
+            f"shards of up to {shard_size} pages, {max_workers} at a time"
+        )
+
+        def analyze(shard: Tuple[DocumentInput, Optional[str]]) -> AnalyzeResult:
+            shard_input, pages = shard
+            return self.analyze_document(
+                shard_input,
+                pages=pages,
+                string_index_type=string_index_type,
+                **kwargs,
+            )
+
+        if len(shards) == 1:
+            return analyze(shards[0])
+        # Shards share the process RSS, so memory is measured once for the batch.
+        with PeakRSSTracker() as memory_tracker:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                results = list(executor.map(analyze, shards))
+        self.last_memory_stats = memory_tracker.stats
+        return merge_analyze_results(results, ranges)
 
     def process_invoice(self, invoice: Document) -> Dict:
         """
         Processes a single invoice and returns a dictionary with the data.
 
+        To process many invoices, `normalize_invoices` builds columnar tables instead.
+
         :param invoice: The invoice to process.
         :return: A dictionary with the processed data.
         """
         invoice_data = {}
-        fields = [
-            "VendorName",
-            "VendorAddress",
-            "VendorAddressRecipient",
-            "CustomerName",
-            "CustomerId",
-            "CustomerAddress",
-            "CustomerAddressRecipient",
-            "InvoiceId",
-            "InvoiceDate",
-            "InvoiceTotal",
-            "DueDate",
-            "PurchaseOrder",
-            "BillingAddress",
-            "BillingAddressRecipient",
-            "ShippingAddress",
-            "ShippingAddressRecipient",
-            "SubTotal",
-            "TotalTax",
-            "PreviousUnpaidBalance",
-            "AmountDue",
-            "ServiceStartDate",
-            "ServiceEndDate",
-            "ServiceAddress",
-            "ServiceAddressRecipient",
-            "RemittanceAddress",
-            "RemittanceAddressRecipient",
-        ]
-        for field in fields:
+        for field in INVOICE_FIELDS:
             field_data = invoice.fields.get(
                 field, {"content": None, "confidence": None}
             )
@@ -239,17 +408,7 @@ class AzureDocumentIntelligenceManager:
             invoice.fields.get("Items", {"valueArray": []}).get("valueArray")
         ):
             item_data = {}
-            item_fields = [
-                "Description",
-                "Quantity",
-                "Unit",
-                "UnitPrice",
-                "ProductCode",
-                "Date",
-                "Tax",
-                "Amount",
-            ]
-            for item_field in item_fields:
+            for item_field in INVOICE_ITEM_FIELDS:
                 item_field_data = item.get("valueObject").get(
                     item_field, {"content": None, "confidence": None}
                 )
@@ -264,6 +423,37 @@ class AzureDocumentIntelligenceManager:
     def _generate_docs_single(self, result: Any) -> Iterator[LangchainDocument]:
         yield LangchainDocument(page_content=result.content, metadata={})
 
-    def load(self, result: Any) -> List[LangchainDocument]:
-        """Load given path as pages."""
-        return list(self._generate_docs_single(result))
+    def lazy_load(
+        self, result: Any, mode: str = "single", source: Optional[str] = None
+    ) -> Iterator[LangchainDocument]:
+        """
+        Lazily converts an analysis result into LangChain documents.
+
+        Page and section documents are sliced from the result spans one at a time, so
+        they can be embedded while the rest of the result is still being converted.
+
+        :param result: The AnalyzeResult, preferably analyzed with
+            string_index_type="unicodeCodePoint" so offsets match Python strings.
+        :param mode: "single" for one document with the whole content, "page" for one
+            document per page, or "section" for one document per titled section.
+        :param source: Optional source of the document, added to the page and section
+            metadata.
+        :return: Iterator of LangChain documents.
+        :raises ValueError: If the mode is unknown.
+        """
+        if mode == "single":
+            yield from self._generate_docs_single(result)
+        elif mode == "page":
+            yield from iter_page_documents(result, source=source)
+        elif mode == "section":
+            yield from iter_section_documents(result, source=source)
+        else:
+            raise ValueError(
+                f"Invalid mode: {mode}. Expected 'single', 'page' or 'section'."
+            )
+
+    def load(
+        self, result: Any, mode: str = "single", source: Optional[str] = None
+    ) -> List[LangchainDocument]:
+        """Load given path as pages. See `lazy_load` for the parameters."""
+        return list(self.lazy_load(result, mode=mode, source=source))
@@ -0,0 +1,208 @@
+from collections import defaultdict
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from langchain_core.documents import Document as LangchainDocument
+
+from utils.ml_logging import get_logger
+
+# Initialize logging
+logger = get_logger()
+
+DEFAULT_HEADING_ROLES = ("title", "sectionHeading")
+
+
+def _check_string_index_type(result: Any) -> None:
+    """
+    Warns when span offsets of a result may not match Python string indexes.
+
+    :param result: The AnalyzeResult.
+    """
+    string_index_type = getattr(result, "string_index_type", None)
+    if string_index_type and string_index_type != "unicodeCodePoint":
+        logger.warning(
+            f"Result offsets are in {string_index_type} units, texts may be misaligned. "
+            "Analyze with string_index_type='unicodeCodePoint'."
+        )
+
+
+def _span_text(content: str, spans: Optional[Iterable[Any]]) -> str:
+    """
+    Returns the text covered by a list of spans.
+
+    :param content: The content of the result.
+    :param spans: The spans, with offset and length.
+    :return: The concatenated text of the spans.
+    """
+    return "".join(
+        content[span.offset : span.offset + span.length] for span in spans or []
+    )
+
+
+def _bounding_regions_metadata(regions: Optional[Iterable[Any]]) -> List[Dict]:
+    """
+    Converts bounding regions into metadata.
+
+    :param regions: The bounding regions of an element.
+    :return: List of {"page_number", "polygon"} dictionaries.
+    """
+    return [
+        {"page_number": region.page_number, "polygon": list(region.polygon or [])}
+        for region in regions or []
+    ]
+
+
+def _table_metadata(index: int, table: Any) -> Dict:
+    """
+    Converts a table into metadata.
+
+    :param index: Index of the table in the result.
+    :param table: The table.
+    :return: The table index, size, offset and bounding regions.
+    """
+    return {
+        "table_index": index,
+        "row_count": table.row_count,
+        "column_count": table.column_count,
+        "offset": table.spans[0].offset if table.spans else None,
+        "bounding_regions": _bounding_regions_metadata(table.bounding_regions),
+    }
+
+
+def _tables_by_page(result: Any) -> Dict[int, List[Dict]]:
+    """
+    Indexes the tables of a result by page number.
+
+    :param result: The AnalyzeResult.
+    :return: Mapping of page numbers to the metadata of the tables on the page.
+    """
+    tables: Dict[int, List[Dict]] = defaultdict(list)
+    for index, table in enumerate(result.tables or []):
+        metadata = _table_metadata(index, table)
+        for page_number in sorted(
+            {region.page_number for region in table.bounding_regions or []}
+        ):
+            tables[page_number].append(metadata)
+    return tables
+
+
+def iter_page_documents(
+    result: Any, source: Optional[str] = None
+) -> Iterator[LangchainDocument]:
+    """
+    Yields one document per page of a result, built from the page spans.
+
+    :param result: The AnalyzeResult.
+    :param source: Optional source of the document, added to the metadata.
+    :return: Iterator of documents with page number, size and table metadata.
+    """
+    _check_string_index_type(result)
+    content = result.content or ""
+    tables = _tables_by_page(result)
+    for page in result.pages or []:
+        metadata = {
+            "page_number": page.page_number,
+            "width": page.width,
+            "height": page.height,
+            "unit": page.unit,
+            "tables": tables.get(page.page_number, []),
+        }
+        if source is not None:
+            metadata["source"] = source
+        yield LangchainDocument(
+            page_content=_span_text(content, page.spans), metadata=metadata
+        )
+
+
+def _sorted_by_offset(elements: Optional[Iterable[Any]]) -> List[Tuple[int, int, Any]]:
+    """
+    Sorts elements with spans by the offset of their first span.
+
+    :param elements: Paragraphs, tables or other elements of a result.
+    :return: Sorted (offset, index, element) tuples.
+    """
+    return sorted(
+        (
+            (element.spans[0].offset, index, element)
+            for index, element in enumerate(elements or [])
+            if element.spans
+        ),
+        key=lambda entry: entry[:2],
+    )
+
+
+def _section_boundaries(
+    paragraphs: List[Tuple[int, int, Any]], heading_roles: Tuple[str, ...]
+) -> List[Tuple[int, Optional[Any]]]:
+    """
+    Finds the start of every section, at the paragraphs with a heading role.
+
+    :param paragraphs: Paragraphs sorted by offset, see `_sorted_by_offset`.
+    :param heading_roles: Paragraph roles that start a section.
+    :return: Sorted (offset, heading paragraph) pairs, starting at offset 0.
+    """
+    boundaries: List[Tuple[int, Optional[Any]]] = [(0, None)]
+    for offset, _, paragraph in paragraphs:
+        if paragraph.role not in heading_roles:
+            continue
+        if offset == boundaries[-1][0]:
+            boundaries[-1] = (offset, paragraph)
+        else:
+            boundaries.append((offset, paragraph))
+    return boundaries
+
+
+def iter_section_documents(
+    result: Any,
+    heading_roles: Tuple[str, ...] = DEFAULT_HEADING_ROLES,
+    source: Optional[str] = None,
+) -> Iterator[LangchainDocument]:
+    """
+    Yields one document per section of a result, split at its heading paragraphs.
+
+    :param result: The AnalyzeResult.
+    :param heading_roles: Paragraph roles that start a section.
+    :param source: Optional source of the document, added to the metadata.
+    :return: Iterator of documents with title, page numbers, bounding regions and
+        table metadata.
+    """
+    _check_string_index_type(result)
+    content = result.content or ""
+    paragraphs = _sorted_by_offset(result.paragraphs)
+    tables = _sorted_by_offset(result.tables)
+    boundaries = _section_boundaries(paragraphs, heading_roles)
+    ends = [offset for offset, _ in boundaries[1:]] + [len(content)]
+
+    # Paragraphs and tables are assigned to sections in one pass, in offset order.
+    paragraph_position = table_position = 0
+
+    for (start, heading), end in zip(boundaries, ends):
+        regions: List[Dict] = []
+        while (
+            paragraph_position < len(paragraphs)
+            and paragraphs[paragraph_position][0] < end
+        ):
+            regions.extend(
+                _bounding_regions_metadata(
+                    paragraphs[paragraph_position][2].bounding_regions
+                )
+            )
+            paragraph_position += 1
+        section_tables: List[Dict] = []
+        while table_position < len(tables) and tables[table_position][0] < end:
+            _, index, table = tables[table_position]
+            section_tables.append(_table_metadata(index, table))
+            table_position += 1
+
+        text = content[start:end]
+        if not text.strip():
+            continue
+        metadata = {
+            "title": heading.content if heading is not None else None,
+            "offset": start,
+            "page_numbers": sorted({region["page_number"] for region in regions}),
+            "bounding_regions": regions,
+            "tables": section_tables,
+        }
+        if source is not None:
+            metadata["source"] = source
+        yield LangchainDocument(page_content=text, metadata=metadata)
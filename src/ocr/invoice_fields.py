@@ -0,0 +1,41 @@
+# Fields of the prebuilt-invoice model.
+INVOICE_FIELDS = (
+    "VendorName",
+    "VendorAddress",
+    "VendorAddressRecipient",
+    "CustomerName",
+    "CustomerId",
+    "CustomerAddress",
+    "CustomerAddressRecipient",
+    "InvoiceId",
+    "InvoiceDate",
+    "InvoiceTotal",
+    "DueDate",
+    "PurchaseOrder",
+    "BillingAddress",
+    "BillingAddressRecipient",
+    "ShippingAddress",
+    "ShippingAddressRecipient",
+    "SubTotal",
+    "TotalTax",
+    "PreviousUnpaidBalance",
+    "AmountDue",
+    "ServiceStartDate",
+    "ServiceEndDate",
+    "ServiceAddress",
+    "ServiceAddressRecipient",
+    "RemittanceAddress",
+    "RemittanceAddressRecipient",
+)
+
+# Fields of each line item of the prebuilt-invoice model.
+INVOICE_ITEM_FIELDS = (
+    "Description",
+    "Quantity",
+    "Unit",
+    "UnitPrice",
+    "ProductCode",
+    "Date",
+    "Tax",
+    "Amount",
+)
@@ -0,0 +1,172 @@
+import math
+import os
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, NamedTuple
+
+from azure.ai.documentintelligence.models import AnalyzeResult
+
+from src.ocr.invoice_fields import INVOICE_FIELDS, INVOICE_ITEM_FIELDS
+from utils.ml_logging import get_logger
+
+if TYPE_CHECKING:
+    # Only for annotations. _ColumnBuilder.columns and normalize_invoices import pandas
+    # and NumPy when they build tables, so importing this module does not load them.
+    import pandas as pd
+
+# Initialize logging
+logger = get_logger()
+
+CONFIDENCE_SUFFIX = "_confidence"
+
+
+class InvoiceTables(NamedTuple):
+    """
+    Columnar invoice data, with one row per invoice and one row per line item.
+
+    Each field has a string content column and a float32 confidence column named
+    `<field>_confidence`, NaN where the field was not found. Line items reference their
+    invoice through the `invoice_row` column.
+    """
+
+    invoices: "pd.DataFrame"
+    items: "pd.DataFrame"
+
+    def to_parquet(self, directory: str, **kwargs: Any) -> None:
+        """
+        Writes the tables to invoices.parquet and items.parquet.
+
+        :param directory: Output directory, created if missing.
+        :param kwargs: Keyword arguments passed to DataFrame.to_parquet.
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.invoices.to_parquet(
+            os.path.join(directory, "invoices.parquet"), index=False, **kwargs
+        )
+        self.items.to_parquet(
+            os.path.join(directory, "items.parquet"), index=False, **kwargs
+        )
+
+
+class _ColumnBuilder:
+    """
+    Accumulates the content and confidence of a set of fields, column by column.
+    """
+
+    def __init__(self, fields: Iterable[str]):
+        """
+        Initialize the _ColumnBuilder.
+
+        :param fields: Names of the fields.
+        """
+        self.fields = tuple(fields)
+        self.contents: Dict[str, List[Any]] = {field: [] for field in self.fields}
+        self.confidences: Dict[str, List[float]] = {field: [] for field in self.fields}
+
+    def append(self, values: Any) -> None:
+        """
+        Appends a row.
+
+        :param values: Mapping of field names to DocumentField values.
+        """
+        for field in self.fields:
+            field_data = values.get(field) if values else None
+            if field_data is None:
+                self.contents[field].append(None)
+                self.confidences[field].append(math.nan)
+            else:
+                self.contents[field].append(field_data.get("content"))
+                confidence = field_data.get("confidence")
+                self.confidences[field].append(
+                    math.nan if confidence is None else confidence
+                )
+
+    def columns(self) -> Dict[str, Any]:
+        """
+        Returns the accumulated columns.
+
+        :return: Mapping of column names to pandas string arrays and NumPy arrays.
+        """
+        import numpy as np
+        import pandas as pd
+
+        columns: Dict[str, Any] = {}
+        for field in self.fields:
+            columns[field] = pd.array(self.contents[field], dtype="string")
+            columns[field + CONFIDENCE_SUFFIX] = np.asarray(
+                self.confidences[field], dtype=np.float32
+            )
+        return columns
+
+
+def _iter_documents(invoices: Iterable[Any]) -> Iterator[Any]:
+    """
+    Flattens results and documents into a stream of documents.
+
+    :param invoices: AnalyzeResult objects of the prebuilt-invoice model, or their
+        documents.
+    :return: The invoice documents, in order.
+    """
+    for invoice in invoices:
+        if isinstance(invoice, AnalyzeResult):
+            yield from invoice.documents or []
+        else:
+            yield invoice
+
+
+def normalize_invoices(
+    invoices: Iterable[Any],
+    fields: Iterable[str] = INVOICE_FIELDS,
+    item_fields: Iterable[str] = INVOICE_ITEM_FIELDS,
+) -> InvoiceTables:
+    """
+    Normalizes many invoices into columnar tables in a single pass.
+
+    Values are appended column by column instead of building one dictionary per invoice
+    and field, and confidences are stored as float32 NumPy arrays.
+
+    :param invoices: AnalyzeResult objects of the prebuilt-invoice model, or their
+        documents. May be a generator.
+    :param fields: Invoice fields to extract.
+    :param item_fields: Line item fields to extract.
+    :return: The invoice and line item tables.
+    """
+    import numpy as np
+    import pandas as pd
+
+    invoice_columns = _ColumnBuilder(fields)
+    item_columns = _ColumnBuilder(item_fields)
+    doc_types: List[str] = []
+    invoice_confidences: List[float] = []
+    item_invoice_rows: List[int] = []
+    item_indexes: List[int] = []
+
+    for row, invoice in enumerate(_iter_documents(invoices)):
+        invoice_fields = invoice.fields or {}
+        invoice_columns.append(invoice_fields)
+        doc_types.append(invoice.doc_type)
+        invoice_confidences.append(
+            math.nan if invoice.confidence is None else invoice.confidence
+        )
+        items = invoice_fields.get("Items")
+        for item_index, item in enumerate((items or {}).get("valueArray") or []):
+            item_columns.append(item.get("valueObject"))
+            item_invoice_rows.append(row)
+            item_indexes.append(item_index)
+
+    invoices_table = pd.DataFrame(
+        {
+            "doc_type": pd.array(doc_types, dtype="string"),
+            "confidence": np.asarray(invoice_confidences, dtype=np.float32),
+            **invoice_columns.columns(),
+        }
+    )
+    items_table = pd.DataFrame(
+        {
+            "invoice_row": np.asarray(item_invoice_rows, dtype=np.int64),
+            "item_index": np.asarray(item_indexes, dtype=np.int32),
+            **item_columns.columns(),
+        }
+    )
+    logger.info(
+        f"Normalized {len(invoices_table)} invoices with {len(items_table)} line items"
+    )
+    return InvoiceTables(invoices_table, items_table)
@@ -0,0 +1,268 @@
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Optional
+
+from azure.core.polling.async_base_polling import AsyncLROBasePolling
+from azure.core.polling.base_polling import LROBasePolling
+
+from utils.ml_logging import get_logger
+
+# Initialize logging
+logger = get_logger()
+
+
+class PollingConfig:
+    """
+    Exponential backoff settings for polling Document Intelligence operations.
+
+    The first poll happens after `initial_interval` seconds and every following wait is
+    multiplied by `backoff_factor`, up to `max_interval`.
+    """
+
+    def __init__(
+        self,
+        initial_interval: float = 1.0,
+        max_interval: float = 15.0,
+        backoff_factor: float = 2.0,
+        honor_retry_after: bool = True,
+    ):
+        """
+        Initialize the PollingConfig.
+
+        :param initial_interval: Seconds to wait before the first poll.
+        :param max_interval: Maximum seconds to wait between two polls.
+        :param backoff_factor: Multiplier applied to the wait after every poll.
+        :param honor_retry_after: Whether to wait at least as long as the Retry-After
+            header of the service asks for.
+        """
+        if initial_interval <= 0 or max_interval < initial_interval:
+            raise ValueError(
+                "initial_interval must be positive and not greater than max_interval."
+            )
+        if backoff_factor < 1:
+            raise ValueError("backoff_factor must be greater than or equal to 1.")
+        self.initial_interval = initial_interval
+        self.max_interval = max_interval
+        self.backoff_factor = backoff_factor
+        self.honor_retry_after = honor_retry_after
+
+    def interval(self, attempt: int) -> float:
+        """
+        Returns the backoff interval before a poll.
+
+        :param attempt: Zero-based index of the poll.
+        :return: Seconds to wait before the poll.
+        """
+        return min(
+            self.max_interval, self.initial_interval * self.backoff_factor**attempt
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"PollingConfig(initial_interval={self.initial_interval}, "
+            f"max_interval={self.max_interval}, backoff_factor={self.backoff_factor}, "
+            f"honor_retry_after={self.honor_retry_after})"
+        )
+
+
+DEFAULT_POLLING_CONFIG = PollingConfig()
+
+# Small prebuilt models usually finish in a few seconds, layout takes longer.
+DEFAULT_MODEL_POLLING_CONFIGS: Dict[str, PollingConfig] = {
+    "prebuilt-read": PollingConfig(initial_interval=0.5, max_interval=5.0),
+    "prebuilt-receipt": PollingConfig(initial_interval=0.5, max_interval=5.0),
+    "prebuilt-invoice": PollingConfig(initial_interval=0.5, max_interval=5.0),
+    "prebuilt-idDocument": PollingConfig(initial_interval=0.5, max_interval=5.0),
+    "prebuilt-businessCard": PollingConfig(initial_interval=0.5, max_interval=5.0),
+    "prebuilt-layout": PollingConfig(initial_interval=1.0, max_interval=10.0),
+}
+
+
+def resolve_polling_config(
+    model_type: str,
+    polling_config: Optional[PollingConfig] = None,
+    model_polling_configs: Optional[Dict[str, PollingConfig]] = None,
+    default_config: PollingConfig = DEFAULT_POLLING_CONFIG,
+) -> PollingConfig:
+    """
+    Picks the polling configuration of a call.
+
+    :param model_type: The model used by the call.
+    :param polling_config: Configuration passed to the call, which takes precedence.
+    :param model_polling_configs: Configurations by model, used when none is passed.
+    :param default_config: Configuration used for models without one.
+    :return: The polling configuration to use.
+    """
+    if polling_config is not None:
+        return polling_config
+    return (model_polling_configs or {}).get(model_type, default_config)
+
+
+def _parse_service_datetime(value: Optional[str]) -> Optional[datetime]:
+    """
+    Parses a datetime returned in an operation status.
+
+    :param value: ISO 8601 datetime, as returned by the service.
+    :return: The parsed datetime, or None if missing or invalid.
+    """
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
+
+def get_retry_after(pipeline_response: Any) -> Optional[float]:
+    """
+    Reads the delay a response asks for before the next request.
+
+    The "retry-after-ms" and "x-ms-retry-after-ms" headers are in milliseconds, while
+    "Retry-After" holds seconds or an HTTP date.
+
+    :param pipeline_response: The pipeline response of the last poll.
+    :return: The delay in seconds, or None if the response does not ask for one.
+    """
+    headers = {
+        name.lower(): value
+        for name, value in pipeline_response.http_response.headers.items()
+    }
+    for header in ("retry-after-ms", "x-ms-retry-after-ms"):
+        if header in headers:
+            try:
+                return float(headers[header]) / 1000
+            except ValueError:
+                pass
+    retry_after = headers.get("retry-after")
+    if not retry_after:
+        return None
+    try:
+        return float(retry_after)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(retry_after)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class _AdaptivePollingMixin:
+    """
+    Backoff and timing logic shared by the synchronous and asynchronous polling methods.
+    """
+
+    def _init_adaptive(self, config: PollingConfig) -> None:
+        """
+        Resets the backoff and timing state.
+
+        :param config: The polling configuration.
+        """
+        self.config = config
+        self._attempt = 0
+        self._started_at: Optional[float] = None
+        self.stats: Dict[str, Any] = {
+            "poll_count": 0,
+            "wait_seconds": 0.0,
+            "elapsed_seconds": None,
+            "service_seconds": None,
+        }
+
+    def _extract_delay(self) -> float:
+        """
+        Computes the next wait from the backoff and the Retry-After header.
+
+        :return: Seconds to wait before the next poll.
+        """
+        delay = self.config.interval(self._attempt)
+        if self.config.honor_retry_after:
+            retry_after = get_retry_after(self._pipeline_response)
+            if retry_after:
+                delay = max(delay, retry_after)
+        self._attempt += 1
+        self.stats["poll_count"] += 1
+        self.stats["wait_seconds"] += delay
+        return delay
+
+    def _start_timer(self) -> None:
+        """
+        Records when polling started.
+        """
+        self._started_at = time.monotonic()
+
+    def _stop_timer(self) -> None:
+        """
+        Records the elapsed time and the analysis time reported by the service.
+        """
+        if self._started_at is not None:
+            self.stats["elapsed_seconds"] = time.monotonic() - self._started_at
+        try:
+            status = self._pipeline_response.http_response.json()
+        except Exception:
+            status = {}
+        created = _parse_service_datetime(status.get("createdDateTime"))
+        updated = _parse_service_datetime(status.get("lastUpdatedDateTime"))
+        if created and updated:
+            self.stats["service_seconds"] = (updated - created).total_seconds()
+        logger.info(
+            f"Operation finished after {self.stats['poll_count']} polls: "
+            f"waited {self.stats['wait_seconds']:.1f}s, "
+            f"service analyzed for {self.stats['service_seconds']}s"
+        )
+
+
+class AdaptiveLROPolling(_AdaptivePollingMixin, LROBasePolling):
+    """
+    LRO polling method that starts fast and backs off exponentially.
+    """
+
+    def __init__(self, config: PollingConfig = DEFAULT_POLLING_CONFIG, **kwargs: Any):
+        """
+        Initialize the AdaptiveLROPolling.
+
+        :param config: The polling configuration.
+        :param kwargs: Keyword arguments passed to LROBasePolling, such as
+            path_format_arguments.
+        """
+        super().__init__(timeout=config.initial_interval, **kwargs)
+        self._init_adaptive(config)
+
+    def run(self) -> None:
+        """
+        Polls the operation until it finishes, recording timing statistics.
+        """
+        self._start_timer()
+        try:
+            super().run()
+        finally:
+            self._stop_timer()
+
+
+class AsyncAdaptiveLROPolling(_AdaptivePollingMixin, AsyncLROBasePolling):
+    """
+    Asynchronous LRO polling method that starts fast and backs off exponentially.
+    """
+
+    def __init__(self, config: PollingConfig = DEFAULT_POLLING_CONFIG, **kwargs: Any):
+        """
+        Initialize the AsyncAdaptiveLROPolling.
+
+        :param config: The polling configuration.
+        :param kwargs: Keyword arguments passed to AsyncLROBasePolling, such as
+            path_format_arguments.
+        """
+        super().__init__(timeout=config.initial_interval, **kwargs)
+        self._init_adaptive(config)
+
+    async def run(self) -> None:
+        """
+        Polls the operation until it finishes, recording timing statistics.
+        """
+        self._start_timer()
+        try:
+            await super().run()
+        finally:
+            self._stop_timer()
@@ -0,0 +1,218 @@
+import hashlib
+import io
+import json
+import os
+import zlib
+from typing import IO, Any, Dict, List, Optional, Union
+
+from azure.ai.documentintelligence import __version__ as SDK_VERSION
+from azure.ai.documentintelligence.models import AnalyzeResult
+
+from src.extractors.disk_cache import DiskLRUCache
+from src.ocr.document_input import DocumentInput, is_url
+from utils.ml_logging import get_logger
+
+# Initialize logging
+logger = get_logger()
+
+DEFAULT_CACHE_DIR = os.path.join(
+    os.path.expanduser("~"), ".cache", "document-intelligence", "results"
+)
+# The managers use the default API version of the SDK, which is pinned by its version.
+DEFAULT_API_VERSION = f"sdk-{SDK_VERSION}"
+
+
+def digest_bytes(content: Union[bytes, bytearray, memoryview]) -> str:
+    """
+    Computes the content digest of a document held in memory.
+
+    :param content: The document content.
+    :return: The hex SHA-256 digest of the content.
+    """
+    return hashlib.sha256(content).hexdigest()
+
+
+def digest_stream(stream: IO[bytes], chunk_size: int = 1024 * 1024) -> str:
+    """
+    Computes the content digest of a binary stream, from its current position.
+
+    :param stream: The stream to read.
+    :param chunk_size: Number of bytes read at a time.
+    :return: The hex SHA-256 digest of the content.
+    """
+    digest = hashlib.sha256()
+    for chunk in iter(lambda: stream.read(chunk_size), b""):
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+def digest_file(file_path: str, chunk_size: int = 1024 * 1024) -> str:
+    """
+    Computes the content digest of a local document without loading it in memory.
+
+    :param file_path: Path to the document.
+    :param chunk_size: Number of bytes read at a time.
+    :return: The hex SHA-256 digest of the content.
+    """
+    with open(file_path, "rb") as file:
+        return digest_stream(file, chunk_size)
+
+
+class AnalyzeResultCache:
+    """
+    Persistent cache of AnalyzeResult objects, keyed by document content and options.
+
+    Results are stored as zlib-compressed JSON, in a size-bounded LRU cache on disk with
+    an optional time to live.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        max_size_bytes: int = 1024**3,
+        ttl_seconds: Optional[float] = None,
+        compression_level: int = 6,
+    ):
+        """
+        Initialize the AnalyzeResultCache.
+
+        :param cache_dir: Directory of the cache. Defaults to the ANALYZE_RESULT_CACHE_DIR
+            environment variable, then to ~/.cache/document-intelligence/results.
+        :param max_size_bytes: Maximum total size of the cached results. Defaults to 1 GiB.
+        :param ttl_seconds: Lifetime of a cached result. Defaults to no expiration.
+        :param compression_level: zlib compression level of the stored results.
+        """
+        cache_dir = cache_dir or os.getenv(
+            "ANALYZE_RESULT_CACHE_DIR", DEFAULT_CACHE_DIR
+        )
+        self.store = DiskLRUCache(
+            cache_dir, max_size_bytes, ttl_seconds, suffix=".json.z"
+        )
+        self.compression_level = compression_level
+
+    @staticmethod
+    def make_key(
+        document_digest: str,
+        model_type: str,
+        api_version: Optional[str] = None,
+        features: Optional[List[str]] = None,
+        pages: Optional[str] = None,
+        locale: Optional[str] = None,
+        output_format: Optional[str] = None,
+        **options: Any,
+    ) -> str:
+        """
+        Computes the cache key of an analysis.
+
+        :param document_digest: Digest of the document content, see `digest_bytes` and
+            `digest_file`.
+        :param model_type: The model used for the analysis.
+        :param api_version: The API version of the analysis. Defaults to the default API
+            version of the installed SDK.
+        :param features: The optional analysis features.
+        :param pages: The analyzed pages.
+        :param locale: The locale hint.
+        :param output_format: The format of the result content.
+        :param options: Any other option that changes the result, such as string_index_type.
+        :return: The hex SHA-256 cache key.
+        """
+        parameters = {
+            "model_type": model_type,
+            "api_version": api_version or DEFAULT_API_VERSION,
+            "features": sorted(str(feature) for feature in features or []),
+            "pages": pages,
+            "locale": locale,
+            "output_format": str(output_format) if output_format else None,
+            **{
+                name: str(value) for name, value in options.items() if value is not None
+            },
+        }
+        key_material = document_digest + json.dumps(parameters, sort_keys=True)
+        return hashlib.sha256(key_material.encode("utf-8")).hexdigest()
+
+    def key_for(
+        self,
+        document_input: DocumentInput,
+        version: Optional[str] = None,
+        **parameters: Any,
+    ) -> Optional[str]:
+        """
+        Computes the cache key of an analyze_document call.
+
+        Local content is hashed. URLs are not downloaded by the managers, so the URL is
+        hashed instead, together with a version of its content such as the blob ETag,
+        which changes whenever the blob is overwritten.
+
+        :param document_input: URL, file path, in-memory content or binary file object.
+        :param version: Version of the content behind a URL.
+        :param parameters: The analysis options, see `make_key`.
+        :return: The hex SHA-256 cache key, or None for a file object that cannot be
+            rewound after hashing.
+        """
+        if isinstance(document_input, str):
+            if is_url(document_input):
+                document_digest = digest_bytes(
+                    f"{document_input}\n{version or ''}".encode()
+                )
+            else:
+                document_digest = digest_file(document_input)
+        elif isinstance(document_input, io.IOBase):
+            if not document_input.seekable():
+                return None
+            position = document_input.tell()
+            document_digest = digest_stream(document_input)
+            document_input.seek(position)
+        else:
+            document_digest = digest_bytes(document_input)
+        return self.make_key(document_digest, **parameters)
+
+    def get(self, key: str) -> Optional[AnalyzeResult]:
+        """
+        Returns a cached result.
+
+        :param key: The cache key, see `make_key`.
+        :return: The cached AnalyzeResult, or None on a miss.
+        """
+        data = self.store.get(key)
+        if data is None:
+            return None
+        try:
+            return AnalyzeResult(json.loads(zlib.decompress(data)))
+        except (zlib.error, ValueError) as e:
+            logger.error(f"Discarding corrupted cached result {key}: {e}")
+            self.store.delete(key)
+            return None
+
+    def put(self, key: str, result: AnalyzeResult) -> None:
+        """
+        Caches a result.
+
+        :param key: The cache key, see `make_key`.
+        :param result: The AnalyzeResult to cache.
+        """
+        serialized = json.dumps(result.as_dict(), separators=(",", ":"))
+        self.store.put(
+            key, zlib.compress(serialized.encode("utf-8"), self.compression_level)
+        )
+
+    @property
+    def hits(self) -> int:
+        """
+        Number of lookups that returned a cached result.
+        """
+        return self.store.hits
+
+    @property
+    def misses(self) -> int:
+        """
+        Number of lookups that found no valid cached result.
+        """
+        return self.store.misses
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns the cache counters and usage.
+
+        :return: Hits, misses, evictions, expirations, entries and sizes.
+        """
+        return self.store.stats()
@@ -0,0 +1,245 @@
+import copy
+import io
+import re
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from azure.ai.documentintelligence.models import AnalyzeResult
+
+from src.ocr.document_input import DocumentInput
+from utils.ml_logging import get_logger
+
+if TYPE_CHECKING:
+    # PyMuPDF is only imported when a local PDF is split, so analyses that never shard
+    # do not depend on it.
+    import fitz
+
+# Initialize logging
+logger = get_logger()
+
+PageRange = Tuple[int, int]
+
+DEFAULT_SHARD_SIZE = 50
+
+# Element references, such as "/paragraphs/12" in sections and figures.
+ELEMENT_REF_PATTERN = re.compile(r"^/(\w+)/(\d+)$")
+
+
+def page_ranges(
+    page_count: int, shard_size: int = DEFAULT_SHARD_SIZE
+) -> List[PageRange]:
+    """
+    Splits the pages of a document into consecutive ranges.
+
+    :param page_count: Number of pages of the document.
+    :param shard_size: Maximum number of pages of each range.
+    :return: List of 1-based, inclusive (first_page, last_page) ranges.
+    """
+    if shard_size <= 0:
+        raise ValueError("shard_size must be a positive integer.")
+    return [
+        (first_page, min(first_page + shard_size - 1, page_count))
+        for first_page in range(1, page_count + 1, shard_size)
+    ]
+
+
+def open_pdf(document_input: DocumentInput) -> "fitz.Document":
+    """
+    Opens local document content with PyMuPDF.
+
+    :param document_input: A local file path, in-memory content or a binary file object.
+    :return: The opened document.
+    """
+    import fitz
+
+    if isinstance(document_input, str):
+        return fitz.open(document_input)
+    if isinstance(document_input, io.IOBase):
+        # PyMuPDF only opens streams that are fully in memory.
+        position = document_input.tell()
+        content = document_input.read()
+        document_input.seek(position)
+        return fitz.open(stream=content)
+    return fitz.open(stream=document_input)
+
+
+def extract_pages(document: "fitz.Document", first_page: int, last_page: int) -> bytes:
+    """
+    Copies a range of pages of a PDF into a new PDF.
+
+    :param document: The source document.
+    :param first_page: 1-based number of the first page to copy.
+    :param last_page: 1-based number of the last page to copy.
+    :return: The content of the new PDF.
+    """
+    import fitz
+
+    with fitz.open() as shard:
+        shard.insert_pdf(document, from_page=first_page - 1, to_page=last_page - 1)
+        return shard.tobytes(garbage=3, deflate=True)
+
+
+def _content_length(content: str, string_index_type: str) -> int:
+    """
+    Measures a text in the units of the span offsets.
+
+    :param content: The text.
+    :param string_index_type: The string index type of the result.
+    :return: The length of the text in offset units.
+    """
+    if string_index_type == "utf16CodeUnit":
+        return len(content.encode("utf-16-le")) // 2
+    if string_index_type == "unicodeCodePoint":
+        return len(content)
+    raise ValueError(
+        f"Cannot merge results indexed by {string_index_type}, "
+        "use unicodeCodePoint or utf16CodeUnit."
+    )
+
+
+def _shift_element_ref(ref: str, element_offsets: Dict[str, int]) -> str:
+    """
+    Shifts the index of an element reference.
+
+    :param ref: The reference, such as "/paragraphs/12".
+    :param element_offsets: Number of elements of each collection in previous shards.
+    :return: The shifted reference.
+    """
+    match = ELEMENT_REF_PATTERN.match(ref)
+    if not match:
+        return ref
+    collection, index = match.group(1), int(match.group(2))
+    return f"/{collection}/{index + element_offsets.get(collection, 0)}"
+
+
+def _shift(
+    value: Any, offset: int, page_offset: int, element_offsets: Dict[str, int]
+) -> None:
+    """
+    Shifts the spans, page numbers and element references of a result, in place.
+
+    :param value: Part of a result, as returned by AnalyzeResult.as_dict.
+    :param offset: Offset of the shard content in the merged content.
+    :param page_offset: Number added to the page numbers of the shard.
+    :param element_offsets: Number of elements of each collection in previous shards.
+    """
+    if isinstance(value, list):
+        for item in value:
+            _shift(item, offset, page_offset, element_offsets)
+        return
+    if not isinstance(value, dict):
+        return
+    for key, item in value.items():
+        if key == "span" and isinstance(item, dict):
+            item["offset"] += offset
+        elif key == "spans" and isinstance(item, list):
+            for span in item:
+                span["offset"] += offset
+        elif key == "pageNumber" and isinstance(item, int):
+            value[key] = item + page_offset
+        elif key == "elements" and isinstance(item, list):
+            value[key] = [_shift_element_ref(ref, element_offsets) for ref in item]
+        else:
+            _shift(item, offset, page_offset, element_offsets)
+
+
+def merge_analyze_results(
+    results: List[AnalyzeResult],
+    shard_ranges: List[PageRange],
+    separator: str = "\n",
+) -> AnalyzeResult:
+    """
+    Merges the results of consecutive page ranges of a document into one result.
+
+    Shards analyzed with the `pages` option already carry document page numbers, while
+    shards analyzed as separate files start at page 1 and are renumbered. Span offsets
+    are shifted to the merged content, and element references such as "/paragraphs/3"
+    to the merged collections. Each shard keeps its own root section.
+
+    :param results: The result of each shard, in page order.
+    :param shard_ranges: The (first_page, last_page) range of each shard.
+    :param separator: Text inserted between the contents of two shards.
+    :return: The merged AnalyzeResult.
+    :raises ValueError: If the results are indexed by text elements, whose lengths
+        cannot be computed here.
+    """
+    if len(results) != len(shard_ranges):
+        raise ValueError("Expected one page range per result.")
+    merged: Dict[str, Any] = {}
+    contents: List[str] = []
+    offset = 0
+    element_offsets: Dict[str, int] = {}
+
+    for result, (first_page, _) in zip(results, shard_ranges):
+        shard = copy.deepcopy(result.as_dict())
+        shard_content = shard.pop("content", "") or ""
+        page_numbers = [page["pageNumber"] for page in shard.get("pages", [])]
+        page_offset = first_page - min(page_numbers) if page_numbers else 0
+        if page_offset < 0:
+            page_offset = 0
+
+        if contents:
+            offset += _content_length(
+                separator, shard.get("stringIndexType", "textElements")
+            )
+        _shift(shard, offset, page_offset, element_offsets)
+        if page_offset:
+            for figure in shard.get("figures", []):
+                page, _, index = str(figure.get("id", "")).partition(".")
+                if page.isdigit() and index:
+                    figure["id"] = f"{int(page) + page_offset}.{index}"
+
+        for key, value in shard.items():
+            if isinstance(value, list):
+                merged.setdefault(key, []).extend(value)
+                element_offsets[key] = element_offsets.get(key, 0) + len(value)
+            else:
+                merged.setdefault(key, value)
+        contents.append(shard_content)
+        offset += _content_length(
+            shard_content, shard.get("stringIndexType", "textElements")
+        )
+
+    merged["content"] = separator.join(contents)
+    logger.info(
+        f"Merged {len(results)} shards into {len(merged.get('pages', []))} pages"
+    )
+    return AnalyzeResult(merged)
+
+
+def shard_inputs(
+    document_input: DocumentInput,
+    page_count: Optional[int] = None,
+    shard_size: int = DEFAULT_SHARD_SIZE,
+) -> Tuple[List[PageRange], List[Tuple[DocumentInput, Optional[str]]]]:
+    """
+    Splits a document into the inputs of the shard analyses.
+
+    Local PDFs are split into smaller PDFs, so each request only uploads its pages. URLs
+    are analyzed in place with the `pages` option, which requires the page count.
+
+    :param document_input: URL or file path of the document, or its content.
+    :param page_count: Number of pages of the document. Read from local PDFs if omitted.
+    :param shard_size: Maximum number of pages of each shard.
+    :return: The page range of each shard, and its (document_input, pages) arguments.
+    :raises ValueError: If the page count of a URL is missing.
+    """
+    if isinstance(document_input, str) and document_input.startswith("https://"):
+        if page_count is None:
+            raise ValueError("page_count is required to shard a document URL.")
+        ranges = page_ranges(page_count, shard_size)
+        return ranges, [
+            (document_input, f"{first_page}-{last_page}")
+            for first_page, last_page in ranges
+        ]
+
+    with open_pdf(document_input) as document:
+        if not document.is_pdf:
+            logger.warning("Only PDFs can be sharded, analyzing as a single shard.")
+            return [(1, document.page_count)], [(document_input, None)]
+        ranges = page_ranges(page_count or document.page_count, shard_size)
+        if len(ranges) == 1:
+            return ranges, [(document_input, None)]
+        return ranges, [
+            (extract_pages(document, first_page, last_page), None)
+            for first_page, last_page in ranges
+        ]
@@ -8,6 +8,7 @@ from dotenv import load_dotenv
 from IPython.display import Image, display
 from requests.exceptions import RequestException
 
+from src.extractors.blob_cache import BlobContentCache
 from src.extractors.blob_data_extractor import AzureBlobDataExtractor
 from utils.ml_logging import get_logger
 
@@ -33,6 +34,7 @@ class GPT4VisionManager:
         openai_api_version: Optional[str] = None,
         openai_api_key: Optional[str] = None,
         container_name: Optional[str] = None,
+        blob_cache: Optional[BlobContentCache] = None,
     ):
         """
         Initialize the GPT4Vision class with OpenAI API configurations.
@@ -42,6 +44,7 @@ class GPT4VisionManager:
         :param openai_api_version: API version.
         :param openai_api_key: OpenAI API key.
         :param container_client: Azure Container Client specific to the container.
+        :param blob_cache: Optional read-through cache of the blob images.
         """
         self.openai_api_base = openai_api_base
         self.deployment_name = deployment_name
@@ -50,7 +53,9 @@ class GPT4VisionManager:
         if not self.openai_api_base or not self.openai_api_key:
             self.load_environment_variables_from_env_file()
 
-        self.blob_manager = AzureBlobDataExtractor(container_name=container_name)
+        self.blob_manager = AzureBlobDataExtractor(
+            container_name=container_name, blob_cache=blob_cache
+        )
 
     def load_environment_variables_from_env_file(self):
         """
@@ -0,0 +1,88 @@
+import asyncio
+import importlib
+from concurrent.futures import ProcessPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("azure.ai.documentintelligence.aio")
+
+
+@pytest.fixture
+def app_module(monkeypatch):
+    monkeypatch.setenv("AZURE_DOCUMENT_INTELLIGENCE_ENDPOINT", "https://di.example.com")
+    monkeypatch.setenv("AZURE_DOCUMENT_INTELLIGENCE_KEY", "key")
+    monkeypatch.setenv(
+        "AZURE_STORAGE_CONNECTION_STRING",
+        "DefaultEndpointsProtocol=https;AccountName=testaccount;"
+        "AccountKey=dGVzdGtleQ==;EndpointSuffix=core.windows.net",
+    )
+    module = pytest.importorskip(
+        "src.azure_search_ai.custom_skills.PDFPartitioner.app", exc_type=ImportError
+    )
+    return importlib.reload(module)
+
+
+def make_request(app_module, urls):
+    return app_module.RequestBody(
+        values=[
+            {"recordId": str(index), "data": {"url": url}}
+            for index, url in enumerate(urls)
+        ]
+    )
+
+
+def test_records_run_concurrently_and_fail_independently(app_module, monkeypatch):
+    running = 0
+    max_running = 0
+
+    async def analyze_document(document_input, **kwargs):
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        if document_input.endswith("broken.pdf"):
+            raise ValueError("unreadable")
+        return SimpleNamespace(content=f"content of {document_input}", paragraphs=[])
+
+    monkeypatch.setattr(
+        app_module.document_intelligence_client, "analyze_document", analyze_document
+    )
+    monkeypatch.setattr(
+        app_module, "chunk_document", lambda content, *args: [content.upper()]
+    )
+    urls = [f"https://docs/{name}.pdf" for name in ("a", "broken", "c", "d", "e")]
+
+    async def run():
+        app_module.record_semaphore = asyncio.Semaphore(2)
+        # The default thread pool stands in for the chunking processes.
+        app_module.chunking_executor = None
+        return await app_module.split_pdf(make_request(app_module, urls))
+
+    response = asyncio.run(run())
+
+    values = response["values"]
+    assert [value["recordId"] for value in values] == ["0", "1", "2", "3", "4"]
+    assert values[0] == {
+        "recordId": "0",
+        "data": {"chunks": ["CONTENT OF HTTPS://DOCS/A.PDF"]},
+        "errors": [],
+    }
+    assert values[1]["data"] == {}
+    assert "unreadable" in values[1]["errors"][0]["message"]
+    assert all(value["errors"] == [] for value in values[2:])
+    assert max_running == 2
+
+
+def test_startup_creates_the_semaphore_and_worker_pool(app_module, monkeypatch):
+    monkeypatch.setattr(app_module, "CHUNK_MAX_CONCURRENCY", 3)
+    monkeypatch.setattr(app_module, "CHUNK_WORKERS", 1)
+
+    asyncio.run(app_module.startup())
+    try:
+        assert app_module.record_semaphore._value == 3
+        assert isinstance(app_module.chunking_executor, ProcessPoolExecutor)
+    finally:
+        app_module.chunking_executor.shutdown(wait=True)
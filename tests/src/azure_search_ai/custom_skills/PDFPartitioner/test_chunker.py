@@ -0,0 +1,65 @@
+import pytest
+
+pytest.importorskip("tiktoken")
+
+from src.azure_search_ai.custom_skills.PDFPartitioner.chunker import (  # noqa: E402
+    TokenBudgetChunker,
+)
+from src.azure_search_ai.custom_skills.PDFPartitioner.tokenizer import (  # noqa: E402
+    get_tokenizer,
+)
+
+TEXT = (
+    "## Overview\nThe valve controller adjusts the stem travel. It reports its status.\n\n"
+    + "## Maintenance\n"
+    + " ".join(["Check the packing and replace the seal."] * 120)
+    + "\n\n"
+    + "## Specifications\n"
+    + "x" * 3000
+)
+
+
+def exact_count(text, chunk):
+    return len(get_tokenizer().encode(text[chunk.start : chunk.end]))
+
+
+def test_chunks_respect_max_tokens_and_cover_text():
+    chunks = TokenBudgetChunker(min_tokens=20, max_tokens=60).chunk(TEXT)
+
+    assert chunks[0].start == 0
+    assert chunks[-1].end == len(TEXT)
+    assert all(a.end == b.start for a, b in zip(chunks, chunks[1:]))
+    assert all(chunk.token_count == exact_count(TEXT, chunk) for chunk in chunks)
+    assert all(chunk.token_count <= 60 for chunk in chunks)
+
+
+def test_chunks_overlap_previous_chunk():
+    chunks = TokenBudgetChunker(min_tokens=20, max_tokens=60, overlap_tokens=10).chunk(
+        TEXT
+    )
+
+    assert all(b.start < a.end for a, b in zip(chunks, chunks[1:]))
+    assert all(chunk.token_count <= 60 for chunk in chunks)
+
+
+def test_invalid_budgets_raise():
+    with pytest.raises(ValueError):
+        TokenBudgetChunker(min_tokens=10, max_tokens=10, overlap_tokens=10)
+    with pytest.raises(ValueError):
+        TokenBudgetChunker(min_tokens=5, max_tokens=10, overlap_tokens=12)
+    with pytest.raises(ValueError):
+        TokenBudgetChunker(min_tokens=100, max_tokens=10)
+    with pytest.raises(ValueError):
+        TokenBudgetChunker(min_tokens=60, max_tokens=100, overlap_tokens=50)
+    with pytest.raises(ValueError):
+        TokenBudgetChunker(min_tokens=-1, max_tokens=100)
+
+
+@pytest.mark.parametrize("text", ["🙂" * 400, "漢字とカタカナ" * 120])
+def test_token_splits_keep_multi_token_characters_within_max_tokens(text):
+    chunks = TokenBudgetChunker(min_tokens=0, max_tokens=10).chunk(text)
+
+    assert chunks[-1].end == len(text)
+    assert all(a.end == b.start for a, b in zip(chunks, chunks[1:]))
+    assert all(chunk.token_count == exact_count(text, chunk) for chunk in chunks)
+    assert all(chunk.token_count <= 10 for chunk in chunks)
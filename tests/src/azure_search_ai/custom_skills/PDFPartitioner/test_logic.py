@@ -0,0 +1,114 @@
+import random
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("tiktoken")
+
+from src.azure_search_ai.custom_skills.PDFPartitioner.logic import (  # noqa: E402
+    _boundary_correction,
+    combine_chunks,
+)
+from src.azure_search_ai.custom_skills.PDFPartitioner.tokenizer import (  # noqa: E402
+    CL100K_BASE_PATTERN,
+    get_split_pattern,
+    get_tokenizer,
+)
+
+
+def reference_combine_chunks(chunks, min_length):
+    encoding = get_tokenizer().encoding
+    combined_chunks = []
+    current_chunk = ""
+    for chunk in chunks:
+        current_chunk += chunk
+        if len(encoding.encode(current_chunk)) >= min_length:
+            combined_chunks.append(current_chunk)
+            current_chunk = ""
+    if current_chunk:
+        combined_chunks.append(current_chunk)
+    return combined_chunks
+
+
+@pytest.mark.parametrize("min_length", [0, 1, 20, 250])
+def test_combine_chunks_matches_reference(min_length):
+    rng = random.Random(7)
+    pieces = ["valve ", "  ", "\n", "## ", "12345", "é", "!?", ".", "stem", " the"]
+    text = "".join(rng.choice(pieces) for _ in range(5000))
+    cuts = sorted(rng.sample(range(len(text)), 200))
+    chunks = [text[i:j] for i, j in zip([0] + cuts, cuts + [len(text)])]
+
+    assert combine_chunks(chunks, min_length) == reference_combine_chunks(
+        chunks, min_length
+    )
+
+
+def test_count_tokens_batch_matches_single_counts():
+    tokenizer = get_tokenizer()
+    texts = ["", "hello world", "hello world", "## Heading\nBody text."]
+
+    assert tokenizer.count_tokens_batch(texts) == [
+        tokenizer.count_tokens(text) for text in texts
+    ]
+
+
+@pytest.mark.parametrize("run", [" ", "\n", "\r\n", "x", "7", "!", "é", " stem"])
+@pytest.mark.parametrize("lengths", [(1, 1), (33, 1), (33, 33), (100, 7), (7, 200)])
+def test_boundary_correction_matches_exact_count_on_long_runs(run, lengths):
+    tokenizer = get_tokenizer()
+    before = "The valve " + run * lengths[0]
+    after = run * lengths[1] + " the seal."
+
+    exact = (
+        len(tokenizer.encode(before + after))
+        - len(tokenizer.encode(before))
+        - len(tokenizer.encode(after))
+    )
+    # The text before the junction is given in parts, as combine_chunks keeps it.
+    middle = len(before) // 2
+    parts = [before[:middle], before[middle:]]
+    assert _boundary_correction(tokenizer, parts, after, window=8) == exact
+
+
+def test_boundary_correction_matches_exact_count_on_random_junctions():
+    tokenizer = get_tokenizer()
+    rng = random.Random(11)
+    pieces = [" ", "\n", "\t", "x", "7", "!", ".", "valve", "stem ", "é", "'s", "##"]
+
+    def random_text():
+        return "".join(
+            rng.choice(pieces) * rng.choice([1, 2, 17, 90])
+            for _ in range(rng.randint(1, 6))
+        )
+
+    for _ in range(500):
+        before, after = random_text(), random_text()
+        exact = (
+            len(tokenizer.encode(before + after))
+            - len(tokenizer.encode(before))
+            - len(tokenizer.encode(after))
+        )
+        assert _boundary_correction(tokenizer, [before], after) == exact
+
+
+def test_special_tokens_are_counted_as_ordinary_text():
+    tokenizer = get_tokenizer()
+    text = "Before <|endoftext|> after"
+
+    assert tokenizer.count_tokens(text) == len(tokenizer.encoding.encode_ordinary(text))
+    assert combine_chunks([text, text], 1) == [text, text]
+
+
+def test_split_pattern_falls_back_when_the_encoding_hides_it():
+    cl100k = SimpleNamespace(name="cl100k_base")
+    assert get_split_pattern(cl100k).pattern == CL100K_BASE_PATTERN
+    assert get_split_pattern(SimpleNamespace(name="custom")) is None
+
+
+def test_combine_chunks_counts_from_scratch_without_a_split_pattern(monkeypatch):
+    monkeypatch.setattr(get_tokenizer(), "split_pattern", None)
+    rng = random.Random(11)
+    chunks = ["".join(rng.choice([" ", "\n", "valve", "7"]) for _ in range(20))]
+    chunks *= 30
+
+    assert combine_chunks(chunks, 25) == reference_combine_chunks(chunks, 25)
@@ -0,0 +1,39 @@
+import random
+import re
+
+from src.azure_search_ai.custom_skills.PDFPartitioner.splitter import (
+    HeadingMatcher,
+    find_heading_spans,
+    spans_from_offsets,
+)
+
+
+def lookahead_split(text, section_headings):
+    pattern = "|".join("(?={})".format(re.escape(sec)) for sec in section_headings)
+    return re.split(pattern, text)
+
+
+def test_find_heading_spans_matches_lookahead_split():
+    rng = random.Random(3)
+    alphabet = "ab# \n"
+    for _ in range(500):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 60)))
+        headings = [
+            "".join(rng.choice(alphabet) for _ in range(rng.randint(1, 4)))
+            for _ in range(rng.randint(1, 5))
+        ]
+        spans = find_heading_spans(text, headings)
+
+        assert [text[start:end] for start, end in spans] == lookahead_split(
+            text, headings
+        )
+
+
+def test_heading_matcher_reports_overlapping_occurrences():
+    matcher = HeadingMatcher(["## Intro", "Intro", "ro"])
+
+    assert matcher.find_offsets("x ## Intro") == [2, 5, 8]
+
+
+def test_spans_from_offsets_ignores_out_of_range_offsets():
+    assert spans_from_offsets(10, [4, 4, -1, 10, 12]) == [(0, 4), (4, 10)]
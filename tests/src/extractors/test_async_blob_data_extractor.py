@@ -0,0 +1,107 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("aiohttp")
+
+from src.extractors import async_blob_data_extractor  # noqa: E402
+from src.extractors.async_blob_data_extractor import (  # noqa: E402
+    AsyncAzureBlobDataExtractor,
+    close_async_blob_service_clients,
+)
+
+CONNECTION_STRING = (
+    "DefaultEndpointsProtocol=https;AccountName=testaccount;"
+    "AccountKey=dGVzdGtleQ==;EndpointSuffix=core.windows.net"
+)
+
+
+class FakeAsyncContainerClient:
+    """
+    In-memory aio container, with blobs as {name: content}.
+    """
+
+    def __init__(self, blobs):
+        self.blobs = blobs
+        self.failing = set()
+
+    async def list_blobs(self, name_starts_with=None, **kwargs):
+        for name in sorted(self.blobs):
+            if name.startswith(name_starts_with or ""):
+                yield SimpleNamespace(name=name)
+
+    def get_blob_client(self, blob_name):
+        async def readinto(file):
+            return file.write(self.blobs[blob_name])
+
+        async def download_blob(max_concurrency=1):
+            if blob_name in self.failing:
+                raise OSError("connection reset")
+            return SimpleNamespace(readinto=readinto)
+
+        return SimpleNamespace(download_blob=download_blob)
+
+
+def test_clients_are_shared_per_event_loop_and_closed_with_it():
+    async def use_clients():
+        first = AsyncAzureBlobDataExtractor("docs", connection_string=CONNECTION_STRING)
+        second = AsyncAzureBlobDataExtractor(
+            "images", connection_string=CONNECTION_STRING
+        )
+        client = first.blob_service_client
+        assert second.blob_service_client is client
+        assert len(async_blob_data_extractor._shared_clients) == 1
+        await close_async_blob_service_clients()
+        assert async_blob_data_extractor._shared_clients == {}
+        return client
+
+    first_loop_client = asyncio.run(use_clients())
+    second_loop_client = asyncio.run(use_clients())
+
+    assert second_loop_client is not first_loop_client
+
+
+def test_download_files_to_folder_lists_only_the_folder_prefix(tmp_path, monkeypatch):
+    container_client = FakeAsyncContainerClient(
+        {
+            "docs/a.pdf": b"a",
+            "docs/sub/b.pdf": b"bb",
+            "docs-archive/c.pdf": b"c",
+        }
+    )
+    container_client.failing.add("docs/a.pdf")
+    monkeypatch.setattr(
+        AsyncAzureBlobDataExtractor, "container_client", container_client
+    )
+    extractor = AsyncAzureBlobDataExtractor("docs", connection_string=CONNECTION_STRING)
+
+    stats = asyncio.run(
+        extractor.download_files_to_folder("docs", str(tmp_path), max_in_flight=2)
+    )
+
+    assert stats["files"] == 1 and stats["bytes"] == 2
+    assert stats["failed"] == ["docs/a.pdf"]
+    assert (tmp_path / "sub" / "b.pdf").read_bytes() == b"bb"
+    assert not (tmp_path / "a.pdf").exists()
+    assert not (tmp_path / "a.pdf.part").exists()
+
+
+def test_download_files_to_folder_rejects_names_escaping_the_directory(
+    tmp_path, monkeypatch
+):
+    container_client = FakeAsyncContainerClient(
+        {"docs/a.pdf": b"a", "docs/../../escaped.pdf": b"x"}
+    )
+    monkeypatch.setattr(
+        AsyncAzureBlobDataExtractor, "container_client", container_client
+    )
+    extractor = AsyncAzureBlobDataExtractor("docs", connection_string=CONNECTION_STRING)
+    local_dir = tmp_path / "nested" / "dest"
+
+    stats = asyncio.run(extractor.download_files_to_folder("docs", str(local_dir)))
+
+    assert stats["files"] == 1
+    assert stats["failed"] == ["docs/../../escaped.pdf"]
+    assert (local_dir / "a.pdf").read_bytes() == b"a"
+    assert not (tmp_path / "escaped.pdf").exists()
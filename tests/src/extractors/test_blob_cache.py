@@ -0,0 +1,34 @@
+from src.extractors.blob_cache import BlobContentCache
+
+BLOB_URL = "https://account.blob.core.windows.net/docs/report.pdf"
+
+
+def test_hits_are_memory_mapped_and_ignore_sas_tokens(tmp_path):
+    cache = BlobContentCache(str(tmp_path), max_size_bytes=1024)
+    assert cache.get(BLOB_URL) is None
+
+    cache.put(BLOB_URL, '"0x8DC"', b"%PDF-1.7 content")
+    etag, view = cache.get(BLOB_URL + "?sv=2024&sig=abc")
+    assert etag == '"0x8DC"'
+    assert isinstance(view, memoryview)
+    assert bytes(view) == b"%PDF-1.7 content"
+    assert cache.stats()["hits"] == 1
+
+
+def test_entries_are_evicted_by_size(tmp_path):
+    cache = BlobContentCache(str(tmp_path), max_size_bytes=100)
+    cache.put(BLOB_URL, "etag-1", b"a" * 60)
+    cache.put(BLOB_URL.replace("report", "other"), "etag-2", b"b" * 60)
+    assert cache.get(BLOB_URL) is None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_put_writes_header_and_content_without_joining(tmp_path):
+    cache = BlobContentCache(str(tmp_path), max_size_bytes=1024)
+    content = bytearray(b"%PDF-1.7 content")
+
+    cache.put(BLOB_URL, "etag-1", memoryview(content))
+
+    etag, view = cache.get(BLOB_URL)
+    assert (etag, bytes(view)) == ("etag-1", bytes(content))
+    assert cache.stats()["size_bytes"] == len(b"etag-1\n") + len(content)
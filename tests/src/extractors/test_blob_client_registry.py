@@ -0,0 +1,26 @@
+from src.extractors.blob_client_registry import BlobClientRegistry
+
+CONNECTION_STRING = (
+    "DefaultEndpointsProtocol=https;AccountName=testaccount;"
+    "AccountKey=dGVzdGtleQ==;EndpointSuffix=core.windows.net"
+)
+
+
+def test_clients_are_shared_per_account_and_container():
+    registry = BlobClientRegistry(pool_maxsize=8)
+    service_client = registry.get_blob_service_client(CONNECTION_STRING)
+    assert registry.get_blob_service_client(CONNECTION_STRING) is service_client
+
+    container_client = registry.get_container_client(CONNECTION_STRING, "docs")
+    assert registry.get_container_client(CONNECTION_STRING, "docs") is container_client
+    assert registry.get_container_client(CONNECTION_STRING, "images") is not (
+        container_client
+    )
+    assert registry.stats() == {
+        "service_clients": 1,
+        "container_clients": 2,
+        "sessions": 1,
+    }
+
+    registry.close()
+    assert registry.stats()["service_clients"] == 0
@@ -0,0 +1,406 @@
+import hashlib
+import os
+import threading
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+from azure.core.exceptions import HttpResponseError, ResourceNotFoundError
+from azure.storage.blob import BlobServiceClient
+
+from src.extractors.blob_data_extractor import (
+    MD5_LOOKUP_LIMIT,
+    AzureBlobDataExtractor,
+    content_md5,
+    local_blob_paths,
+    read_upload_range,
+    sign_blob_url,
+    upload_data_size,
+)
+
+CONNECTION_STRING = (
+    "DefaultEndpointsProtocol=https;AccountName=testaccount;"
+    "AccountKey=dGVzdGtleQ==;EndpointSuffix=core.windows.net"
+)
+
+
+def test_upload_helpers_read_files_and_buffers_alike(tmp_path):
+    content = bytes(range(256)) * 100
+    path = tmp_path / "page.png"
+    path.write_bytes(content)
+
+    for data in (str(path), content, memoryview(content)):
+        assert upload_data_size(data) == len(content)
+        assert read_upload_range(data, 300, 50) == content[300:350]
+        assert content_md5(data, chunk_size=1000) == hashlib.md5(content).digest()
+
+
+def make_extractor(container_client):
+    registry = MagicMock()
+    registry.get_container_client.return_value = container_client
+    return AzureBlobDataExtractor(
+        "docs", connection_string=CONNECTION_STRING, registry=registry
+    )
+
+
+def blob_properties(name, content):
+    return SimpleNamespace(
+        name=name,
+        content_settings=SimpleNamespace(
+            content_md5=bytearray(hashlib.md5(content).digest())
+        ),
+    )
+
+
+def test_upload_files_skips_blobs_with_matching_md5():
+    container_client = MagicMock()
+    blob_clients = {}
+
+    def get_blob_client(blob_name):
+        blob_client = blob_clients.setdefault(blob_name, MagicMock())
+        if blob_name == "docs/same.txt":
+            blob_client.get_blob_properties.return_value = blob_properties(
+                blob_name, b"same"
+            )
+        elif blob_name == "docs/changed.txt":
+            blob_client.get_blob_properties.return_value = blob_properties(
+                blob_name, b"old"
+            )
+        else:
+            blob_client.get_blob_properties.side_effect = ResourceNotFoundError()
+        return blob_client
+
+    container_client.get_blob_client.side_effect = get_blob_client
+    extractor = make_extractor(container_client)
+
+    stats = extractor.upload_files(
+        {
+            "docs/same.txt": b"same",
+            "docs/changed.txt": b"new",
+            "images/new.png": b"png",
+        }
+    )
+
+    assert stats["skipped"] == ["docs/same.txt"]
+    assert stats["files"] == 2 and stats["failed"] == []
+    blob_clients["docs/same.txt"].upload_blob.assert_not_called()
+    for blob_name, content in (
+        ("docs/changed.txt", b"new"),
+        ("images/new.png", b"png"),
+    ):
+        upload_blob = blob_clients[blob_name].upload_blob
+        upload_blob.assert_called_once()
+        assert upload_blob.call_args.args[0] == content
+        settings = upload_blob.call_args.kwargs["content_settings"]
+        assert bytes(settings.content_md5) == hashlib.md5(content).digest()
+    # Small batches are looked up blob by blob, never by listing the container.
+    container_client.list_blobs.assert_not_called()
+    container_client.walk_blobs.assert_not_called()
+
+
+def test_listed_md5s_list_each_folder_of_large_batches():
+    container_client = MagicMock()
+    container_client.walk_blobs.side_effect = lambda name_starts_with, delimiter: [
+        blob_properties(f"{name_starts_with}0.txt", b"0"),
+        blob_properties("other.txt", b"other"),
+    ]
+    extractor = make_extractor(container_client)
+
+    listed_md5s = extractor._listed_md5s(
+        ["a/0.txt", "a/1.txt", "b/0.txt", "b/1.txt", "c/0.txt"], lookup_limit=1
+    )
+
+    assert listed_md5s == {
+        "a/0.txt": hashlib.md5(b"0").digest(),
+        "a/1.txt": None,
+        "b/0.txt": hashlib.md5(b"0").digest(),
+        "b/1.txt": None,
+    }
+    prefixes = [
+        call.kwargs["name_starts_with"]
+        for call in container_client.walk_blobs.call_args_list
+    ]
+    assert prefixes == ["a/", "b/"]
+    container_client.get_blob_client.assert_not_called()
+
+
+def test_upload_files_looks_up_small_folders_on_the_pool():
+    large_folder = {
+        f"big/{index}.txt": str(index).encode() for index in range(MD5_LOOKUP_LIMIT + 1)
+    }
+    container_client = MagicMock()
+    container_client.walk_blobs.return_value = [
+        blob_properties(name, content) for name, content in large_folder.items()
+    ]
+    lookup_threads = set()
+
+    def get_blob_client(blob_name):
+        blob_client = MagicMock()
+
+        def get_blob_properties():
+            lookup_threads.add(threading.current_thread())
+            return blob_properties(blob_name, b"small")
+
+        blob_client.get_blob_properties.side_effect = get_blob_properties
+        return blob_client
+
+    container_client.get_blob_client.side_effect = get_blob_client
+    extractor = make_extractor(container_client)
+
+    stats = extractor.upload_files(
+        {**large_folder, "small/a.txt": b"small", "small/b.txt": b"changed"},
+        max_workers=2,
+    )
+
+    assert sorted(stats["skipped"]) == sorted(large_folder) + ["small/a.txt"]
+    assert stats["files"] == 1
+    assert lookup_threads and threading.main_thread() not in lookup_threads
+    container_client.walk_blobs.assert_called_once_with(
+        name_starts_with="big/", delimiter="/"
+    )
+
+
+def test_upload_data_commits_staged_blocks_in_order():
+    container_client = MagicMock()
+    blob_client = container_client.get_blob_client.return_value
+    extractor = make_extractor(container_client)
+    content = bytes(range(250))
+
+    size = extractor.upload_data("big.bin", content, block_size=100, max_concurrency=3)
+
+    assert size == 250
+    blob_client.upload_blob.assert_not_called()
+    staged = {
+        call.args[0]: call.args[1] for call in blob_client.stage_block.call_args_list
+    }
+    committed = [block.id for block in blob_client.commit_block_list.call_args.args[0]]
+    assert len(committed) == 3
+    assert b"".join(staged[block_id] for block_id in committed) == content
+    assert committed == sorted(committed)
+
+
+def test_upload_files_reports_failed_staging_without_committing():
+    container_client = MagicMock()
+    blob_client = container_client.get_blob_client.return_value
+    blob_client.get_blob_properties.side_effect = ResourceNotFoundError()
+    blob_client.stage_block.side_effect = [None, HttpResponseError("boom"), None]
+    extractor = make_extractor(container_client)
+
+    stats = extractor.upload_files(
+        {"big.bin": bytes(250)}, block_size=100, max_concurrency=1
+    )
+
+    assert stats["failed"] == ["big.bin"]
+    assert stats["files"] == 0
+    blob_client.commit_block_list.assert_not_called()
+
+
+class FakeContainerClient:
+    """
+    In-memory container, with blobs as {name: (etag, content)}.
+    """
+
+    url = "https://testaccount.blob.core.windows.net/docs"
+
+    def __init__(self, blobs):
+        self.blobs = dict(blobs)
+        self.failing = set()
+        self.downloads = []
+
+    def list_blobs(self, name_starts_with=None, **kwargs):
+        for name, (etag, content) in sorted(self.blobs.items()):
+            if name.startswith(name_starts_with or ""):
+                yield SimpleNamespace(
+                    name=name,
+                    etag=etag,
+                    size=len(content),
+                    content_settings=SimpleNamespace(content_type=None),
+                    last_modified=None,
+                    metadata={},
+                )
+
+    def get_blob_client(self, blob_name):
+        def download_blob(max_concurrency=1):
+            if blob_name in self.failing:
+                raise HttpResponseError("boom")
+            self.downloads.append(blob_name)
+            content = self.blobs[blob_name][1]
+            return SimpleNamespace(readinto=lambda file: file.write(content))
+
+        return SimpleNamespace(download_blob=download_blob)
+
+
+def test_sync_folder_downloads_only_changes_and_retries_failures(tmp_path):
+    container_client = FakeContainerClient(
+        {
+            "docs/a.pdf": ("1", b"a1"),
+            "docs/b.pdf": ("1", b"b1"),
+            "docs/sub/c.pdf": ("1", b"c1"),
+            "docs/e.pdf": ("1", b"e1"),
+            "other/x.pdf": ("1", b"x1"),
+        }
+    )
+    container_client.failing.add("docs/b.pdf")
+    extractor = make_extractor(container_client)
+
+    stats = extractor.sync_folder("docs", str(tmp_path))
+
+    assert stats["failed"] == ["docs/b.pdf"]
+    assert stats["files"] == 3
+    assert sorted(container_client.downloads) == [
+        "docs/a.pdf",
+        "docs/e.pdf",
+        "docs/sub/c.pdf",
+    ]
+    assert (tmp_path / "sub" / "c.pdf").read_bytes() == b"c1"
+    assert not (tmp_path / "b.pdf").exists()
+
+    container_client.failing.clear()
+    container_client.downloads.clear()
+    container_client.blobs["docs/a.pdf"] = ("2", b"a2")
+    container_client.blobs["docs/d.pdf"] = ("1", b"d1")
+    del container_client.blobs["docs/sub/c.pdf"]
+
+    stats = extractor.sync_folder("docs", str(tmp_path), delete=True)
+
+    # Modified, new and previously failed blobs are downloaded, the rest is kept.
+    assert sorted(container_client.downloads) == [
+        "docs/a.pdf",
+        "docs/b.pdf",
+        "docs/d.pdf",
+    ]
+    assert stats["unchanged"] == ["docs/e.pdf"]
+    assert stats["deleted"] == ["docs/sub/c.pdf"]
+    assert stats["failed"] == []
+    assert (tmp_path / "a.pdf").read_bytes() == b"a2"
+    assert (tmp_path / "b.pdf").read_bytes() == b"b1"
+    assert not (tmp_path / "sub" / "c.pdf").exists()
+
+    # A local copy removed out of band is downloaded again.
+    container_client.downloads.clear()
+    (tmp_path / "e.pdf").unlink()
+    stats = extractor.sync_folder("docs", str(tmp_path))
+    assert container_client.downloads == ["docs/e.pdf"]
+    assert stats["files"] == 1
+
+
+def test_scan_metadata_keeps_entries_of_other_prefixes(tmp_path):
+    container_client = FakeContainerClient(
+        {"docs/a.pdf": ("1", b"a"), "other/x.pdf": ("1", b"x")}
+    )
+    extractor = make_extractor(container_client)
+    index_path = str(tmp_path / "index.jsonl")
+
+    assert extractor.scan_metadata(index_path, "docs/").added == ["docs/a.pdf"]
+    delta = extractor.scan_metadata(index_path, "other/")
+
+    assert delta.added == ["other/x.pdf"]
+    assert delta.deleted == []
+    assert extractor.scan_metadata(index_path, "docs/").unchanged == ["docs/a.pdf"]
+
+
+def test_extract_content_raises_download_errors():
+    extractor = make_extractor(MagicMock())
+    extractor.blob_service_client = MagicMock()
+    blob_client = extractor.blob_service_client.get_blob_client.return_value
+    blob_client.download_blob.side_effect = ResourceNotFoundError("missing")
+
+    with pytest.raises(ResourceNotFoundError):
+        extractor.extract_content(
+            "https://testaccount.blob.core.windows.net/docs/missing.pdf"
+        )
+
+
+def test_download_files_to_folder_lists_only_the_folder_prefix(tmp_path):
+    container_client = FakeContainerClient(
+        {
+            "docs/a.pdf": ("1", b"a"),
+            "docs/sub/b.pdf": ("1", b"b"),
+            "docs-archive/c.pdf": ("1", b"c"),
+        }
+    )
+    extractor = make_extractor(container_client)
+
+    stats = extractor.download_files_to_folder("docs", str(tmp_path / "tree"))
+
+    assert sorted(container_client.downloads) == ["docs/a.pdf", "docs/sub/b.pdf"]
+    assert stats["files"] == 2 and stats["bytes"] == 2 and stats["failed"] == []
+    assert (tmp_path / "tree" / "sub" / "b.pdf").read_bytes() == b"b"
+
+    container_client.failing.add("docs/a.pdf")
+    stats = extractor.download_files_to_folder(
+        "docs/", str(tmp_path / "flat"), flatten=True
+    )
+
+    assert stats["failed"] == ["docs/a.pdf"]
+    assert sorted(path.name for path in (tmp_path / "flat").iterdir()) == ["b.pdf"]
+
+
+def test_local_blob_paths_skip_names_escaping_the_directory(tmp_path):
+    local_dir = str(tmp_path / "dest")
+    names = ["docs/a.pdf", "docs/../../etc/x", "docs/sub/../b.pdf", "docs/.."]
+
+    assert local_blob_paths(names, "docs/", local_dir) == {
+        "docs/a.pdf": os.path.join(local_dir, "a.pdf"),
+        "docs/sub/../b.pdf": os.path.join(local_dir, "sub", "..", "b.pdf"),
+    }
+    assert list(local_blob_paths(names, "docs/", local_dir, flatten=True)) == [
+        "docs/a.pdf",
+        "docs/../../etc/x",
+        "docs/sub/../b.pdf",
+    ]
+
+
+def test_downloads_never_write_outside_the_directory(tmp_path):
+    container_client = FakeContainerClient(
+        {"docs/a.pdf": ("1", b"a"), "docs/../../escaped.pdf": ("1", b"x")}
+    )
+    extractor = make_extractor(container_client)
+    local_dir = tmp_path / "nested" / "dest"
+
+    stats = extractor.download_files_to_folder("docs", str(local_dir))
+    assert stats["files"] == 1 and stats["failed"] == ["docs/../../escaped.pdf"]
+
+    stats = extractor.sync_folder("docs", str(local_dir))
+    assert stats["failed"] == ["docs/../../escaped.pdf"]
+
+    assert container_client.downloads == ["docs/a.pdf", "docs/a.pdf"]
+    assert not (tmp_path / "escaped.pdf").exists()
+
+
+BLOB_URL = "https://testaccount.blob.core.windows.net/docs/report.pdf"
+
+
+def test_sign_blob_url_adds_a_read_only_sas_token():
+    client = BlobServiceClient.from_connection_string(CONNECTION_STRING)
+
+    signed_url = sign_blob_url(client, BLOB_URL, expiry_minutes=5)
+
+    url, token = signed_url.split("?")
+    assert url == BLOB_URL
+    assert "sp=r&" in token and "sig=" in token
+
+
+def test_sign_blob_url_keeps_signed_urls_and_needs_an_account_key():
+    client = BlobServiceClient.from_connection_string(CONNECTION_STRING)
+    assert sign_blob_url(client, BLOB_URL + "?sv=2024&sig=abc") == (
+        BLOB_URL + "?sv=2024&sig=abc"
+    )
+
+    keyless_client = BlobServiceClient(
+        "https://testaccount.blob.core.windows.net", credential=None
+    )
+    assert sign_blob_url(keyless_client, BLOB_URL) is None
+
+
+def test_download_to_temp_file_streams_into_a_rewound_file():
+    extractor = make_extractor(MagicMock())
+    extractor.blob_service_client = MagicMock()
+    download = extractor.blob_service_client.get_blob_client.return_value.download_blob
+    download.return_value.readinto.side_effect = lambda file: file.write(b"%PDF")
+
+    with extractor.download_to_temp_file(BLOB_URL) as temp_file:
+        assert temp_file.read() == b"%PDF"
+    extractor.blob_service_client.get_blob_client.assert_called_once_with(
+        container="docs", blob="report.pdf"
+    )
@@ -0,0 +1,47 @@
+from datetime import datetime, timezone
+
+from src.extractors.blob_index import BlobMetadataIndex
+
+
+def _metadata(name, etag, size=10):
+    return {
+        "name": name,
+        "etag": etag,
+        "size": size,
+        "content_type": "application/pdf",
+        "last_modified": datetime(2024, 1, 1, tzinfo=timezone.utc),
+    }
+
+
+def test_rescan_reports_changes_since_the_saved_index(tmp_path):
+    index_path = str(tmp_path / "index.jsonl")
+    index = BlobMetadataIndex(index_path)
+    first = index.update([_metadata("a.pdf", "1"), _metadata("b.pdf", "1")])
+    assert first.added == ["a.pdf", "b.pdf"]
+    index.save()
+
+    index = BlobMetadataIndex(index_path)
+    delta = index.update((_metadata("a.pdf", "2"), _metadata("c.pdf", "1")))
+    assert delta.added == ["c.pdf"]
+    assert delta.modified == ["a.pdf"]
+    assert delta.deleted == ["b.pdf"]
+    assert delta.summary() == {
+        "added": 1,
+        "modified": 1,
+        "deleted": 1,
+        "unchanged": 0,
+    }
+    assert index.entries["c.pdf"]["last_modified"] == "2024-01-01T00:00:00+00:00"
+
+
+def test_update_keeps_entries_outside_the_scope(tmp_path):
+    index = BlobMetadataIndex(str(tmp_path / "index.jsonl"))
+    index.update([_metadata("docs/a.pdf", "1"), _metadata("images/b.png", "1")])
+
+    delta = index.update(
+        [_metadata("docs/c.pdf", "1")], scope=lambda name: name.startswith("docs/")
+    )
+
+    assert delta.added == ["docs/c.pdf"]
+    assert delta.deleted == ["docs/a.pdf"]
+    assert set(index.entries) == {"docs/c.pdf", "images/b.png"}
@@ -0,0 +1,47 @@
+import os
+import time
+
+from src.extractors.disk_cache import DiskLRUCache
+
+
+def test_put_get_and_counters(tmp_path):
+    cache = DiskLRUCache(str(tmp_path), max_size_bytes=100)
+
+    assert cache.get("aa01") is None
+    cache.put("aa01", b"hello")
+
+    assert cache.get("aa01") == b"hello"
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_evicts_least_recently_used_entry(tmp_path):
+    cache = DiskLRUCache(str(tmp_path), max_size_bytes=10)
+    cache.put("aa01", b"12345")
+    cache.put("bb02", b"12345")
+    cache.get("aa01")
+    cache.put("cc03", b"12345")
+
+    assert cache.get("bb02") is None
+    assert cache.get("aa01") == b"12345"
+    assert cache.stats()["evictions"] == 1
+
+
+def test_expired_entries_are_misses(tmp_path):
+    cache = DiskLRUCache(str(tmp_path), ttl_seconds=60)
+    path = cache.put("aa01", b"hello")
+    old = time.time() - 120
+    os.utime(path, (old, old))
+    cache._index["aa01"] = (5, old)
+
+    assert cache.get("aa01") is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_index_is_rebuilt_from_disk(tmp_path):
+    DiskLRUCache(str(tmp_path), suffix=".bin").put("aa01", b"hello")
+
+    cache = DiskLRUCache(str(tmp_path), suffix=".bin")
+
+    assert cache.stats()["entries"] == 1
+    assert cache.get("aa01") == b"hello"
@@ -0,0 +1,114 @@
+import os
+
+import fitz
+
+from src.extractors.blob_data_extractor import DEFAULT_MANIFEST_NAME
+from src.extractors.blob_index import BlobMetadataIndex
+from src.extractors.ocr_data_extractor import OCRHelper
+from tests.src.extractors.test_blob_data_extractor import (
+    FakeContainerClient,
+    make_extractor,
+)
+
+
+def _pdf_bytes(num_pages):
+    with fitz.open() as doc:
+        for page_number in range(num_pages):
+            doc.new_page(width=100, height=50).insert_text(
+                (10, 30), f"Page {page_number + 1}"
+            )
+        return doc.tobytes()
+
+
+def test_render_pages_yields_in_memory_images():
+    content = _pdf_bytes(3)
+    helper = OCRHelper()
+
+    png = list(helper.render_pages(content, zoom=1.0))
+    assert [image.page_number for image in png] == [1, 2, 3]
+    assert png[0].data.startswith(b"\x89PNG")
+    assert (png[0].width, png[0].height) == (100, 50)
+
+    jpeg, webp = (
+        next(helper.render_pages(memoryview(content), image_format=image_format))
+        for image_format in ("jpeg", "webp")
+    )
+    assert jpeg.data.startswith(b"\xff\xd8")
+    assert webp.data[8:12] == b"WEBP"
+
+    (raw,) = helper.render_pages(content, image_format="raw", zoom=1.0, pages=[2])
+    assert raw.page_number == 2
+    assert isinstance(raw.data, memoryview)
+    assert len(raw.data) == raw.width * raw.height * raw.channels
+
+
+def test_render_profiles_trade_bytes_for_tokens():
+    content = _pdf_bytes(2)
+    helper = OCRHelper()
+
+    (bilevel,) = helper.render_pages(content, pages=[1], profile="bilevel")
+    assert bilevel.channels == 1
+    assert bilevel.data.startswith(b"\x89PNG")
+
+    report = {
+        entry["profile"]: entry
+        for entry in helper.compare_render_profiles(content, ["default", "vision"])
+    }
+    assert report["default"]["pages"] == 2
+    assert report["vision"]["tokens_per_page"] == 255
+    assert report["default"]["bytes"] > 0
+
+
+def test_text_pages_skip_rendering(tmp_path):
+    pdf_path = str(tmp_path / "mixed.pdf")
+    with fitz.open() as doc:
+        doc.new_page().insert_textbox(fitz.Rect(50, 50, 550, 400), "Text page. " * 20)
+        doc.new_page().draw_rect(fitz.Rect(50, 50, 300, 300), fill=(0, 0, 0))
+        doc.save(pdf_path)
+    output_dir = tmp_path / "out"
+
+    helper = OCRHelper(max_workers=1, skip_text_pages=True)
+    helper.extract_images_from_pdf(pdf_path, str(output_dir))
+
+    assert sorted(os.listdir(output_dir)) == ["mixed-page-1.txt", "mixed-page-2.png"]
+    assert helper.last_routing_stats[pdf_path]["scanned_pages"] == 1
+
+
+def test_text_only_pdf_routes_no_page_to_rendering():
+    with fitz.open() as doc:
+        for _ in range(3):
+            doc.new_page().insert_textbox(
+                fitz.Rect(50, 50, 550, 400), "Text page. " * 20
+            )
+        content = doc.tobytes()
+    helper = OCRHelper()
+
+    routing = helper.route_pages(content)
+
+    assert sorted(routing.text_pages) == [1, 2, 3]
+    assert routing.scanned_pages == []
+    assert list(helper.render_pages(content, pages=routing.scanned_pages)) == []
+    (report,) = helper.compare_render_profiles(
+        content, ["default"], routing.scanned_pages
+    )
+    assert report["pages"] == 0 and report["bytes"] == 0
+
+
+def test_sync_of_the_container_root_keeps_only_pdfs(tmp_path):
+    container_client = FakeContainerClient(
+        {
+            "a.pdf": ("1", b"a"),
+            "notes.txt": ("1", b"notes"),
+            "docs/b.PDF": ("1", b"b"),
+            "docs/image.png": ("1", b"png"),
+        }
+    )
+    helper = OCRHelper()
+    helper.blob_manager = make_extractor(container_client)
+
+    local_dir = helper._sync_pdf_blobs("", str(tmp_path))
+
+    assert sorted(container_client.downloads) == ["a.pdf", "docs/b.PDF"]
+    assert sorted(os.listdir(local_dir)) == [DEFAULT_MANIFEST_NAME, "a.pdf", "b.PDF"]
+    manifest = BlobMetadataIndex(os.path.join(local_dir, DEFAULT_MANIFEST_NAME))
+    assert sorted(manifest.entries) == ["a.pdf", "docs/b.PDF"]
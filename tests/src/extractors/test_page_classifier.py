@@ -0,0 +1,41 @@
+import fitz
+import pytest
+
+from src.extractors.page_classifier import format_page_ranges, route_pages
+
+TEXT = "Valve actuator calibration procedure for the positioner. " * 5
+
+
+def _mixed_pdf():
+    doc = fitz.open()
+    doc.new_page().insert_textbox(fitz.Rect(50, 50, 550, 400), TEXT)
+    scan = fitz.Pixmap(fitz.csGRAY, fitz.IRect(0, 0, 200, 280), False)
+    scan.clear_with(200)
+    doc.new_page().insert_image(doc[1].rect, pixmap=scan)
+    doc.new_page()
+    return doc
+
+
+def test_pages_are_routed_by_text_layer():
+    with _mixed_pdf() as doc:
+        routing = route_pages(doc)
+    assert list(routing.text_pages) == [1]
+    assert "Valve actuator" in routing.text_pages[1]
+    assert routing.scanned_pages == [2]
+    assert routing.empty_pages == [3]
+    assert routing.classifications[1].image_coverage > 0.9
+    assert routing.stats["text_pages"] == 1
+    assert routing.stats["text_ratio"] == 1 / 3
+
+
+def test_format_page_ranges():
+    assert format_page_ranges([7, 1, 3, 5, 6]) == "1,3,5-7"
+    with pytest.raises(ValueError):
+        format_page_ranges([])
+
+
+def test_empty_page_list_classifies_no_page():
+    with _mixed_pdf() as doc:
+        routing = route_pages(doc, pages=[])
+    assert routing.classifications == []
+    assert routing.stats["pages"] == 0
@@ -0,0 +1,28 @@
+import fitz
+import pytest
+
+from src.extractors.pdf_data_extractor import PDFHelper
+
+
+def _pdf_bytes():
+    with fitz.open() as doc:
+        for page_number in range(3):
+            doc.new_page().insert_text((72, 72), f"Page number {page_number + 1}")
+        doc.set_metadata({"title": "Manual"})
+        return doc.tobytes()
+
+
+@pytest.mark.parametrize("backend", ["pymupdf", "pypdf2"])
+def test_backends_yield_the_text_of_each_page(backend):
+    content = _pdf_bytes()
+    helper = PDFHelper(backend=backend)
+
+    pages = [text.strip() for text in helper.iter_pages(content)]
+    assert pages == ["Page number 1", "Page number 2", "Page number 3"]
+    assert "Page number 2" in helper.extract_text_from_pdf_bytes(content)
+
+
+def test_metadata_uses_the_current_reader():
+    metadata = PDFHelper().extract_metadata_from_pdf_bytes(_pdf_bytes())
+    assert metadata["Title"] == "Manual"
+    assert metadata["Number of pages"] == 3
@@ -0,0 +1,44 @@
+import os
+
+import fitz
+
+from src.extractors.pdf_rendering import plan_render_tasks, render_pdfs
+
+
+def _write_pdf(path, num_pages):
+    with fitz.open() as doc:
+        for page_number in range(num_pages):
+            doc.new_page(width=200, height=200).insert_text(
+                (20, 50), f"Page {page_number + 1}"
+            )
+        doc.save(path)
+
+
+def test_pages_are_rendered_in_order_across_workers(tmp_path):
+    first, second = str(tmp_path / "a.pdf"), str(tmp_path / "b.pdf")
+    _write_pdf(first, 5)
+    _write_pdf(second, 2)
+    output_dir = str(tmp_path / "images")
+
+    tasks = plan_render_tasks([first, second], output_dir, pages_per_task=2)
+    assert [(task.first_page, task.last_page) for task in tasks] == [
+        (1, 2),
+        (3, 4),
+        (5, 5),
+        (1, 2),
+    ]
+
+    pages = render_pdfs(
+        [first, second], output_dir, zoom=1.0, max_workers=2, pages_per_task=2
+    )
+    assert [(os.path.basename(p.file_path), p.page_number) for p in pages] == [
+        ("a.pdf", 1),
+        ("a.pdf", 2),
+        ("a.pdf", 3),
+        ("a.pdf", 4),
+        ("a.pdf", 5),
+        ("b.pdf", 1),
+        ("b.pdf", 2),
+    ]
+    assert os.path.basename(pages[-1].output_path) == "b-page-2.png"
+    assert all(os.path.exists(page.output_path) for page in pages)
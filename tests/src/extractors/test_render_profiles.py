@@ -0,0 +1,32 @@
+import pytest
+
+from src.extractors.render_profiles import (
+    RenderProfile,
+    estimate_vision_tokens,
+    get_render_profile,
+    page_scale,
+)
+
+
+def test_vision_tokens_follow_the_tile_accounting():
+    assert estimate_vision_tokens(1024, 1024) == 765
+    # Fitted to 1024x2048, then to 768x1536: 2x3 tiles.
+    assert estimate_vision_tokens(2048, 4096) == 1105
+    assert estimate_vision_tokens(300, 300) == 255
+    assert estimate_vision_tokens(4000, 4000, detail="low") == 85
+
+
+def test_page_scale_applies_caps_and_token_budget():
+    letter = (612, 792)
+    assert page_scale(*letter, RenderProfile(dpi=144)) == pytest.approx(2.0)
+
+    capped = page_scale(*letter, RenderProfile(dpi=300, max_pixels=1_000_000))
+    assert 612 * 792 * capped**2 == pytest.approx(1_000_000)
+
+    fitted = page_scale(*letter, RenderProfile(dpi=300, fit_to_model=True))
+    assert round(612 * fitted) == 768
+
+    budget = page_scale(*letter, get_render_profile("vision-compact"))
+    assert estimate_vision_tokens(int(612 * budget), int(792 * budget)) <= 425
+    with pytest.raises(ValueError):
+        get_render_profile("unknown")
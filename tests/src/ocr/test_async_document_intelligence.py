@@ -0,0 +1,259 @@
+import asyncio
+import io
+from contextlib import ExitStack
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+pytest.importorskip("aiohttp")
+pytest.importorskip("azure.ai.documentintelligence.aio")
+pytest.importorskip("src.ocr.async_document_intelligence", exc_type=ImportError)
+
+fitz = pytest.importorskip("fitz")
+
+from azure.ai.documentintelligence.models import (  # noqa: E402
+    AnalyzeDocumentRequest,
+    AnalyzeResult,
+)
+
+from src.ocr.async_document_intelligence import (  # noqa: E402
+    AsyncAzureDocumentIntelligenceManager,
+)
+
+CONNECTION_STRING = (
+    "DefaultEndpointsProtocol=https;AccountName=testaccount;"
+    "AccountKey=dGVzdGtleQ==;EndpointSuffix=core.windows.net"
+)
+BLOB_URL = "https://testaccount.blob.core.windows.net/docs/report.pdf"
+
+
+class StubAsyncClient:
+    """
+    Stands in for the aio DocumentIntelligenceClient, recording every analyze request.
+    """
+
+    def __init__(self, result=None):
+        self.calls = []
+        self.result = result
+        self.closed = False
+
+    async def begin_analyze_document(self, analyze_request, **kwargs):
+        if isinstance(analyze_request, io.IOBase):
+            analyze_request = analyze_request.read()
+        self.calls.append((analyze_request, kwargs))
+        result = self.result(analyze_request, kwargs) if self.result else "result"
+
+        async def poll_result():
+            return await result if asyncio.iscoroutine(result) else result
+
+        return SimpleNamespace(result=poll_result)
+
+    async def close(self):
+        self.closed = True
+
+
+def page_range_result(pages, content):
+    first_page, last_page = (int(page) for page in pages.split("-"))
+    return AnalyzeResult(
+        {
+            "modelId": "prebuilt-layout",
+            "stringIndexType": "unicodeCodePoint",
+            "content": content,
+            "pages": [
+                {
+                    "pageNumber": page_number,
+                    "spans": [{"offset": 0, "length": len(content)}],
+                }
+                for page_number in range(first_page, last_page + 1)
+            ],
+        }
+    )
+
+
+def make_pdf(page_count):
+    with fitz.open() as doc:
+        for page_number in range(1, page_count + 1):
+            doc.new_page(width=200, height=100).insert_text(
+                (10, 30), f"Page {page_number}"
+            )
+        return doc.tobytes()
+
+
+def analyze_pdf(body, kwargs):
+    """
+    Analyzes an uploaded PDF like the service, with pages numbered from 1.
+    """
+    with fitz.open(stream=body, filetype="pdf") as doc:
+        texts = [page.get_text().strip() for page in doc]
+    pages, offset = [], 0
+    for page_number, text in enumerate(texts, start=1):
+        pages.append(
+            {
+                "pageNumber": page_number,
+                "spans": [{"offset": offset, "length": len(text)}],
+            }
+        )
+        offset += len(text) + 1
+    return AnalyzeResult(
+        {
+            "modelId": kwargs["model_id"],
+            "stringIndexType": kwargs["string_index_type"],
+            "content": "\n".join(texts),
+            "pages": pages,
+        }
+    )
+
+
+def page_texts(result):
+    return {
+        page.page_number: result.content[
+            page.spans[0].offset : page.spans[0].offset + page.spans[0].length
+        ]
+        for page in result.pages
+    }
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    monkeypatch.setenv("AZURE_STORAGE_CONNECTION_STRING", CONNECTION_STRING)
+    manager = AsyncAzureDocumentIntelligenceManager(
+        azure_endpoint="https://di.example.com", azure_key="key"
+    )
+    manager._client = StubAsyncClient()
+    manager.blob_manager = MagicMock()
+    return manager
+
+
+def test_blob_request_sends_a_sas_url_when_the_blob_can_be_signed(manager):
+    manager.blob_manager.generate_sas_url.return_value = BLOB_URL + "?sig=abc"
+    analyze_kwargs = {"content_type": "application/json"}
+
+    async def open_request():
+        with ExitStack() as stack:
+            return await manager._open_blob_analyze_request(
+                BLOB_URL, analyze_kwargs, stack
+            )
+
+    request = asyncio.run(open_request())
+
+    assert isinstance(request, AnalyzeDocumentRequest)
+    assert request.url_source == BLOB_URL + "?sig=abc"
+    assert analyze_kwargs["content_type"] == "application/json"
+
+
+def test_blob_request_streams_a_temp_file_when_the_blob_cannot_be_signed(manager):
+    manager.blob_manager.generate_sas_url.return_value = None
+    temp_file = io.BytesIO(b"%PDF")
+
+    async def download_to_temp_file(blob_url):
+        return temp_file
+
+    manager.blob_manager.download_to_temp_file = download_to_temp_file
+
+    result = asyncio.run(manager.analyze_document(BLOB_URL))
+
+    assert result == "result"
+    ((body, kwargs),) = manager._client.calls
+    assert body == b"%PDF"
+    assert kwargs["content_type"] == "application/octet-stream"
+    assert temp_file.closed
+    assert "rss_increase_bytes" in manager.last_memory_stats
+
+
+def test_analyze_many_limits_concurrency_and_returns_errors_in_place(manager):
+    running = 0
+    max_running = 0
+
+    async def analyze(analyze_request, kwargs):
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        if analyze_request.url_source.endswith("broken.pdf"):
+            raise ValueError("unreadable")
+        return analyze_request.url_source
+
+    manager._client.result = analyze
+    urls = [f"https://docs.example.com/{name}.pdf" for name in "ab"] + [
+        "https://docs.example.com/broken.pdf",
+        "https://docs.example.com/c.pdf",
+    ]
+
+    results = asyncio.run(manager.analyze_many(urls, max_in_flight=2))
+
+    assert results[:2] == urls[:2] and results[3] == urls[3]
+    assert isinstance(results[2], ValueError)
+    assert max_running == 2
+    with pytest.raises(ValueError):
+        asyncio.run(manager.analyze_many(urls, return_exceptions=False))
+
+
+def test_async_context_manager_closes_the_shared_client(manager):
+    client = manager._client
+
+    async def use_manager():
+        async with manager as entered:
+            assert entered is manager
+            assert manager.document_analysis_client is client
+
+    asyncio.run(use_manager())
+
+    assert client.closed
+    assert manager._client is None
+    asyncio.run(manager.close())
+
+
+def test_sharded_analysis_limits_the_shards_in_flight(manager):
+    running = 0
+    max_running = 0
+
+    async def analyze(analyze_request, kwargs):
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return page_range_result(kwargs["pages"], f"pages {kwargs['pages']}")
+
+    manager._client.result = analyze
+
+    merged = asyncio.run(
+        manager.analyze_document_sharded(
+            "https://docs.example.com/long.pdf",
+            shard_size=2,
+            page_count=7,
+            max_in_flight=2,
+        )
+    )
+
+    assert sorted(kwargs["pages"] for _, kwargs in manager._client.calls) == [
+        "1-2",
+        "3-4",
+        "5-6",
+        "7-7",
+    ]
+    assert max_running == 2
+    assert [page.page_number for page in merged.pages] == list(range(1, 8))
+
+
+def test_sharded_analysis_uploads_page_ranges_and_rebases_the_merge(manager):
+    manager._client.result = analyze_pdf
+
+    merged = asyncio.run(manager.analyze_document_sharded(make_pdf(5), shard_size=2))
+
+    assert len(manager._client.calls) == 3
+    assert all(kwargs["pages"] is None for _, kwargs in manager._client.calls)
+    assert page_texts(merged) == {n: f"Page {n}" for n in range(1, 6)}
+
+
+def test_short_documents_are_analyzed_in_a_single_request(manager):
+    manager._client.result = analyze_pdf
+    content = make_pdf(2)
+
+    result = asyncio.run(manager.analyze_document_sharded(content, shard_size=4))
+
+    ((body, kwargs),) = manager._client.calls
+    assert body == content and kwargs["pages"] is None
+    assert page_texts(result) == {1: "Page 1", 2: "Page 2"}
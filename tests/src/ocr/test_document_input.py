@@ -0,0 +1,48 @@
+import io
+import mmap
+from contextlib import ExitStack
+
+import pytest
+
+from src.ocr.document_input import MemoryViewReader, is_url, open_document_body
+
+
+def test_memoryview_reader_reads_and_seeks_without_copy():
+    content = bytearray(b"%PDF-1.7 content")
+    reader = MemoryViewReader(content)
+
+    assert reader.read(4) == b"%PDF"
+    assert reader.seek(-7, io.SEEK_END) == len(content) - 7
+    assert reader.read() == b"content"
+    assert len(reader) == len(content)
+
+
+def test_open_document_body_accepts_local_inputs(tmp_path):
+    path = tmp_path / "doc.pdf"
+    path.write_bytes(b"%PDF-1.7")
+
+    with ExitStack() as stack:
+        assert open_document_body(b"%PDF-1.7", stack) == b"%PDF-1.7"
+        assert open_document_body(str(path), stack).read() == b"%PDF-1.7"
+        assert open_document_body(memoryview(b"%PDF-1.7"), stack).read() == b"%PDF-1.7"
+        with open(path, "rb") as file:
+            mapped = stack.enter_context(
+                mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            )
+            body = open_document_body(mapped, stack)
+            assert body.read() == b"%PDF-1.7"
+            body.close()
+
+
+def test_open_document_body_rejects_missing_files_and_unknown_types():
+    with ExitStack() as stack:
+        with pytest.raises(FileNotFoundError):
+            open_document_body("missing.pdf", stack)
+        with pytest.raises(TypeError):
+            open_document_body(42, stack)
+
+
+def test_is_url():
+    assert is_url("https://example.com/doc.pdf")
+    assert not is_url("docs/doc.pdf")
+    assert not is_url(b"https://example.com/doc.pdf")
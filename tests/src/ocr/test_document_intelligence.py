@@ -0,0 +1,198 @@
+import io
+from contextlib import ExitStack
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+pytest.importorskip("azure.ai.documentintelligence")
+pytest.importorskip("src.ocr.document_intelligence", exc_type=ImportError)
+
+fitz = pytest.importorskip("fitz")
+
+from azure.ai.documentintelligence.models import (  # noqa: E402
+    AnalyzeDocumentRequest,
+    AnalyzeResult,
+)
+
+from src.ocr.document_intelligence import (  # noqa: E402
+    AzureDocumentIntelligenceManager,
+    open_blob_analyze_request,
+)
+
+CONNECTION_STRING = (
+    "DefaultEndpointsProtocol=https;AccountName=testaccount;"
+    "AccountKey=dGVzdGtleQ==;EndpointSuffix=core.windows.net"
+)
+BLOB_URL = "https://testaccount.blob.core.windows.net/docs/report.pdf"
+
+
+def make_pdf(page_count):
+    with fitz.open() as doc:
+        for page_number in range(1, page_count + 1):
+            doc.new_page(width=200, height=100).insert_text(
+                (10, 30), f"Page {page_number}"
+            )
+        return doc.tobytes()
+
+
+def analyze_pdf(body, kwargs):
+    """
+    Analyzes an uploaded PDF like the service, with pages numbered from 1.
+    """
+    with fitz.open(stream=body, filetype="pdf") as doc:
+        texts = [page.get_text().strip() for page in doc]
+    pages, offset = [], 0
+    for page_number, text in enumerate(texts, start=1):
+        pages.append(
+            {
+                "pageNumber": page_number,
+                "spans": [{"offset": offset, "length": len(text)}],
+            }
+        )
+        offset += len(text) + 1
+    return AnalyzeResult(
+        {
+            "modelId": kwargs["model_id"],
+            "stringIndexType": kwargs["string_index_type"],
+            "content": "\n".join(texts),
+            "pages": pages,
+        }
+    )
+
+
+def page_texts(result):
+    return {
+        page.page_number: result.content[
+            page.spans[0].offset : page.spans[0].offset + page.spans[0].length
+        ]
+        for page in result.pages
+    }
+
+
+class StubClient:
+    """
+    Stands in for DocumentIntelligenceClient, recording every analyze request.
+    """
+
+    def __init__(self, result=None):
+        self.calls = []
+        self.result = result
+
+    def begin_analyze_document(self, analyze_request, **kwargs):
+        if isinstance(analyze_request, io.IOBase):
+            analyze_request = analyze_request.read()
+        self.calls.append((analyze_request, kwargs))
+        result = self.result(analyze_request, kwargs) if self.result else "result"
+        return SimpleNamespace(result=lambda: result)
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    monkeypatch.setenv("AZURE_STORAGE_CONNECTION_STRING", CONNECTION_STRING)
+    manager = AzureDocumentIntelligenceManager(
+        azure_endpoint="https://di.example.com", azure_key="key"
+    )
+    manager.document_analysis_client = StubClient()
+    manager.blob_manager = MagicMock()
+    return manager
+
+
+def test_blob_request_sends_a_sas_url_when_the_blob_can_be_signed():
+    blob_manager = MagicMock()
+    blob_manager.generate_sas_url.return_value = BLOB_URL + "?sig=abc"
+    analyze_kwargs = {"content_type": "application/json"}
+
+    with ExitStack() as stack:
+        request = open_blob_analyze_request(
+            blob_manager, BLOB_URL, analyze_kwargs, stack
+        )
+
+    assert isinstance(request, AnalyzeDocumentRequest)
+    assert request.url_source == BLOB_URL + "?sig=abc"
+    assert analyze_kwargs["content_type"] == "application/json"
+    blob_manager.download_to_temp_file.assert_not_called()
+
+
+def test_blob_request_streams_a_temp_file_when_the_blob_cannot_be_signed():
+    blob_manager = MagicMock()
+    blob_manager.generate_sas_url.return_value = None
+    temp_file = io.BytesIO(b"%PDF")
+    blob_manager.download_to_temp_file.return_value = temp_file
+    analyze_kwargs = {"content_type": "application/json"}
+
+    with ExitStack() as stack:
+        request = open_blob_analyze_request(
+            blob_manager, BLOB_URL, analyze_kwargs, stack
+        )
+        assert request is temp_file and not temp_file.closed
+
+    assert temp_file.closed
+    assert analyze_kwargs["content_type"] == "application/octet-stream"
+
+
+def test_analyze_document_reports_the_rss_change_of_the_call(manager):
+    manager.blob_manager.generate_sas_url.return_value = None
+    manager.blob_manager.download_to_temp_file.return_value = io.BytesIO(b"%PDF")
+
+    assert manager.analyze_document(BLOB_URL) == "result"
+
+    ((body, kwargs),) = manager.document_analysis_client.calls
+    assert body == b"%PDF"
+    assert kwargs["content_type"] == "application/octet-stream"
+    assert manager.last_memory_stats["scoped"] is False
+    assert "rss_increase_bytes" in manager.last_memory_stats
+
+
+def test_sharded_analysis_uploads_page_ranges_and_rebases_the_merge(manager):
+    manager.document_analysis_client.result = analyze_pdf
+
+    merged = manager.analyze_document_sharded(make_pdf(5), shard_size=2)
+
+    calls = manager.document_analysis_client.calls
+    shard_page_counts = []
+    for body, _ in calls:
+        with fitz.open(stream=body, filetype="pdf") as shard:
+            shard_page_counts.append(shard.page_count)
+    assert sorted(shard_page_counts) == [1, 2, 2]
+    assert all(kwargs["pages"] is None for _, kwargs in calls)
+    assert page_texts(merged) == {n: f"Page {n}" for n in range(1, 6)}
+    assert manager.last_memory_stats is not None
+
+
+def test_sharded_analysis_of_a_url_uses_the_pages_option(manager):
+    manager.document_analysis_client.result = lambda request, kwargs: AnalyzeResult(
+        {
+            "stringIndexType": "unicodeCodePoint",
+            "content": kwargs["pages"],
+            "pages": [
+                {"pageNumber": int(page), "spans": []}
+                for page in kwargs["pages"].split("-")
+            ],
+        }
+    )
+
+    merged = manager.analyze_document_sharded(
+        "https://docs.example.com/long.pdf", shard_size=3, page_count=6
+    )
+
+    assert sorted(
+        kwargs["pages"] for _, kwargs in manager.document_analysis_client.calls
+    ) == [
+        "1-3",
+        "4-6",
+    ]
+    assert [page.page_number for page in merged.pages] == [1, 3, 4, 6]
+    with pytest.raises(ValueError):
+        manager.analyze_document_sharded("https://docs.example.com/long.pdf")
+
+
+def test_short_documents_are_analyzed_in_a_single_request(manager):
+    manager.document_analysis_client.result = analyze_pdf
+    content = make_pdf(2)
+
+    result = manager.analyze_document_sharded(content, shard_size=4)
+
+    ((body, kwargs),) = manager.document_analysis_client.calls
+    assert body == content and kwargs["pages"] is None
+    assert page_texts(result) == {1: "Page 1", 2: "Page 2"}
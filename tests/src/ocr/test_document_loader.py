@@ -0,0 +1,98 @@
+import pytest
+
+pytest.importorskip("langchain_core")
+pytest.importorskip("azure.ai.documentintelligence")
+
+from azure.ai.documentintelligence.models import AnalyzeResult  # noqa: E402
+
+from src.ocr.document_loader import (  # noqa: E402
+    iter_page_documents,
+    iter_section_documents,
+)
+
+CONTENT = "Intro\nFirst page text\nPricing\nA table"
+
+
+def span(text):
+    return {"offset": CONTENT.index(text), "length": len(text)}
+
+
+def region(page_number):
+    return {"pageNumber": page_number, "polygon": [0, 0, 1, 0, 1, 1, 0, 1]}
+
+
+RESULT = AnalyzeResult(
+    {
+        "stringIndexType": "unicodeCodePoint",
+        "content": CONTENT,
+        "pages": [
+            {
+                "pageNumber": 1,
+                "width": 8.5,
+                "height": 11,
+                "unit": "inch",
+                "spans": [span("Intro\nFirst page text\n")],
+            },
+            {
+                "pageNumber": 2,
+                "width": 8.5,
+                "height": 11,
+                "unit": "inch",
+                "spans": [span("Pricing\nA table")],
+            },
+        ],
+        "paragraphs": [
+            {
+                "role": "title",
+                "content": "Intro",
+                "spans": [span("Intro")],
+                "boundingRegions": [region(1)],
+            },
+            {
+                "content": "First page text",
+                "spans": [span("First page text")],
+                "boundingRegions": [region(1)],
+            },
+            {
+                "role": "sectionHeading",
+                "content": "Pricing",
+                "spans": [span("Pricing")],
+                "boundingRegions": [region(2)],
+            },
+        ],
+        "tables": [
+            {
+                "rowCount": 1,
+                "columnCount": 1,
+                "cells": [],
+                "spans": [span("A table")],
+                "boundingRegions": [region(2)],
+            },
+        ],
+    }
+)
+
+
+def test_iter_page_documents():
+    documents = list(iter_page_documents(RESULT, source="doc.pdf"))
+
+    assert [document.page_content for document in documents] == [
+        "Intro\nFirst page text\n",
+        "Pricing\nA table",
+    ]
+    assert documents[0].metadata["tables"] == []
+    assert documents[1].metadata["tables"][0]["table_index"] == 0
+    assert documents[1].metadata["source"] == "doc.pdf"
+
+
+def test_iter_section_documents():
+    documents = list(iter_section_documents(RESULT))
+
+    assert [document.metadata["title"] for document in documents] == [
+        "Intro",
+        "Pricing",
+    ]
+    assert documents[1].page_content == "Pricing\nA table"
+    assert documents[0].metadata["page_numbers"] == [1]
+    assert documents[1].metadata["tables"][0]["row_count"] == 1
+    assert documents[1].metadata["bounding_regions"][0]["page_number"] == 2
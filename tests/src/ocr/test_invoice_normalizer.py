@@ -0,0 +1,70 @@
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+pytest.importorskip("azure.ai.documentintelligence")
+pd = pytest.importorskip("pandas")
+
+from azure.ai.documentintelligence.models import AnalyzeResult  # noqa: E402
+
+from src.ocr.invoice_normalizer import normalize_invoices  # noqa: E402
+
+
+def make_invoice(invoice_id, items):
+    return {
+        "docType": "invoice",
+        "confidence": 0.9,
+        "fields": {
+            "InvoiceId": {"type": "string", "content": invoice_id, "confidence": 0.8},
+            "Items": {
+                "type": "array",
+                "valueArray": [
+                    {
+                        "type": "object",
+                        "valueObject": {
+                            "Description": {
+                                "type": "string",
+                                "content": description,
+                                "confidence": 0.7,
+                            }
+                        },
+                    }
+                    for description in items
+                ],
+            },
+        },
+    }
+
+
+def test_normalize_invoices_builds_columnar_tables(tmp_path):
+    results = [
+        AnalyzeResult({"documents": [make_invoice("INV-1", ["a", "b"])]}),
+        AnalyzeResult({"documents": [make_invoice("INV-2", [])]}),
+    ]
+
+    tables = normalize_invoices(iter(results))
+
+    assert tables.invoices["InvoiceId"].tolist() == ["INV-1", "INV-2"]
+    assert tables.invoices["InvoiceId_confidence"].dtype == np.float32
+    assert tables.invoices["VendorName"].isna().all()
+    assert np.isnan(tables.invoices["VendorName_confidence"]).all()
+    assert tables.items["invoice_row"].tolist() == [0, 0]
+    assert tables.items["Description"].tolist() == ["a", "b"]
+
+    pytest.importorskip("pyarrow")
+    tables.to_parquet(str(tmp_path))
+    assert pd.read_parquet(tmp_path / "items.parquet")["item_index"].tolist() == [0, 1]
+
+
+def test_importing_the_module_does_not_load_pandas_or_numpy():
+    code = (
+        "import sys, src.ocr.invoice_normalizer; "
+        "print(sorted({'pandas', 'numpy'} & set(sys.modules)))"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+
+    assert output.strip() == "[]"
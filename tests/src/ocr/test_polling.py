@@ -0,0 +1,77 @@
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+
+pytest.importorskip("azure.core")
+
+from src.ocr.polling import (  # noqa: E402
+    DEFAULT_POLLING_CONFIG,
+    AdaptiveLROPolling,
+    PollingConfig,
+    get_retry_after,
+    resolve_polling_config,
+)
+
+
+class StubHttpResponse:
+    def __init__(self, headers):
+        self.headers = headers
+
+
+class StubPipelineResponse:
+    def __init__(self, headers):
+        self.http_response = StubHttpResponse(headers)
+
+
+def test_interval_backs_off_up_to_max_interval():
+    config = PollingConfig(initial_interval=0.5, max_interval=3.0, backoff_factor=2.0)
+
+    assert [config.interval(attempt) for attempt in range(5)] == [
+        0.5,
+        1.0,
+        2.0,
+        3.0,
+        3.0,
+    ]
+
+
+def test_extract_delay_honors_retry_after_and_records_wait():
+    polling = AdaptiveLROPolling(PollingConfig(initial_interval=0.5, max_interval=8.0))
+    polling._pipeline_response = StubPipelineResponse({"Retry-After": "2"})
+
+    assert polling._extract_delay() == 2
+    assert polling._extract_delay() == 2
+    assert polling._extract_delay() == 2
+    assert polling._extract_delay() == 4
+    assert polling.stats["poll_count"] == 4
+    assert polling.stats["wait_seconds"] == 10
+
+
+def test_get_retry_after_reads_milliseconds_seconds_and_dates():
+    assert get_retry_after(StubPipelineResponse({"retry-after-ms": "1500"})) == 1.5
+    assert get_retry_after(StubPipelineResponse({"x-ms-retry-after-ms": "20"})) == 0.02
+    assert get_retry_after(StubPipelineResponse({"Retry-After": "3"})) == 3
+    past_date = "Wed, 21 Oct 2015 07:28:00 GMT"
+    assert get_retry_after(StubPipelineResponse({"Retry-After": past_date})) == 0
+    future_date = format_datetime(datetime.now(timezone.utc) + timedelta(hours=1))
+    delay = get_retry_after(StubPipelineResponse({"retry-after": future_date}))
+    assert 3500 < delay <= 3600
+    assert get_retry_after(StubPipelineResponse({"Retry-After": "soon"})) is None
+    assert get_retry_after(StubPipelineResponse({})) is None
+
+
+def test_resolve_polling_config_prefers_call_then_model_then_default():
+    call_config = PollingConfig(initial_interval=0.1, max_interval=1.0)
+    read_config = PollingConfig(initial_interval=0.2, max_interval=2.0)
+    model_configs = {"prebuilt-read": read_config}
+
+    assert (
+        resolve_polling_config("prebuilt-read", call_config, model_configs)
+        is call_config
+    )
+    assert resolve_polling_config("prebuilt-read", None, model_configs) is read_config
+    assert (
+        resolve_polling_config("prebuilt-layout", None, model_configs)
+        is DEFAULT_POLLING_CONFIG
+    )
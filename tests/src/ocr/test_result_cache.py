@@ -0,0 +1,111 @@
+import io
+import time
+
+import pytest
+
+pytest.importorskip("azure.ai.documentintelligence")
+
+from azure.ai.documentintelligence.models import AnalyzeResult  # noqa: E402
+
+from src.extractors import disk_cache  # noqa: E402
+from src.ocr.result_cache import AnalyzeResultCache  # noqa: E402
+
+BASE_KEY = {
+    "document_digest": "digest",
+    "model_type": "prebuilt-layout",
+    "api_version": "2024-11-30",
+    "features": ["BARCODES"],
+    "pages": "1-3",
+    "locale": "en-US",
+    "output_format": "markdown",
+    "string_index_type": "unicodeCodePoint",
+}
+
+
+def make_result(content="Invoice 42"):
+    return AnalyzeResult(
+        {
+            "modelId": "prebuilt-layout",
+            "content": content,
+            "pages": [{"pageNumber": 1, "spans": []}],
+        }
+    )
+
+
+@pytest.mark.parametrize(
+    "component, value",
+    [
+        ("document_digest", "other-digest"),
+        ("model_type", "prebuilt-read"),
+        ("api_version", "2023-07-31"),
+        ("features", ["FORMULAS"]),
+        ("pages", "1-4"),
+        ("locale", "fr-FR"),
+        ("output_format", "text"),
+        ("string_index_type", "utf16CodeUnit"),
+    ],
+)
+def test_key_changes_with_every_component(component, value):
+    assert AnalyzeResultCache.make_key(
+        **{**BASE_KEY, component: value}
+    ) != AnalyzeResultCache.make_key(**BASE_KEY)
+
+
+def test_key_ignores_feature_order_and_defaults_the_api_version():
+    key = AnalyzeResultCache.make_key(**{**BASE_KEY, "features": ["A", "B"]})
+    assert key == AnalyzeResultCache.make_key(**{**BASE_KEY, "features": ["B", "A"]})
+
+    defaulted = {**BASE_KEY, "api_version": None}
+    assert AnalyzeResultCache.make_key(**defaulted) == AnalyzeResultCache.make_key(
+        **defaulted
+    )
+    assert AnalyzeResultCache.make_key(**defaulted) != AnalyzeResultCache.make_key(
+        **BASE_KEY
+    )
+
+
+def test_key_for_hashes_local_content_and_versions_urls(tmp_path):
+    cache = AnalyzeResultCache(str(tmp_path / "cache"))
+    path = tmp_path / "invoice.pdf"
+    path.write_bytes(b"%PDF-1.7")
+    stream = io.BytesIO(b"header%PDF-1.7")
+    stream.seek(6)
+
+    by_path = cache.key_for(str(path), model_type="prebuilt-invoice")
+    assert cache.key_for(b"%PDF-1.7", model_type="prebuilt-invoice") == by_path
+    assert cache.key_for(stream, model_type="prebuilt-invoice") == by_path
+    assert stream.tell() == 6
+
+    url = "https://account.blob.core.windows.net/docs/invoice.pdf"
+    assert cache.key_for(url, '"0x1"', model_type="prebuilt-invoice") != (
+        cache.key_for(url, '"0x2"', model_type="prebuilt-invoice")
+    )
+
+
+def test_results_round_trip_and_corrupted_entries_are_discarded(tmp_path):
+    cache = AnalyzeResultCache(str(tmp_path))
+    key = AnalyzeResultCache.make_key(**BASE_KEY)
+    assert cache.get(key) is None
+
+    cache.put(key, make_result())
+
+    cached = cache.get(key)
+    assert cached.as_dict() == make_result().as_dict()
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    cache.store.put(key, b"not zlib")
+    assert cache.get(key) is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_results_expire_after_their_ttl(tmp_path, monkeypatch):
+    cache = AnalyzeResultCache(str(tmp_path), ttl_seconds=60)
+    key = AnalyzeResultCache.make_key(**BASE_KEY)
+    cache.put(key, make_result())
+    assert cache.get(key) is not None
+
+    now = time.time()
+    monkeypatch.setattr(disk_cache.time, "time", lambda: now + 120)
+
+    assert cache.get(key) is None
+    assert cache.stats()["expirations"] == 1
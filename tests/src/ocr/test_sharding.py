@@ -0,0 +1,94 @@
+import pytest
+
+pytest.importorskip("azure.ai.documentintelligence")
+fitz = pytest.importorskip("fitz")
+
+from azure.ai.documentintelligence.models import AnalyzeResult  # noqa: E402
+
+from src.ocr.sharding import (  # noqa: E402
+    merge_analyze_results,
+    page_ranges,
+    shard_inputs,
+)
+
+
+def make_shard(content, page_numbers, paragraph_count):
+    return AnalyzeResult(
+        {
+            "modelId": "prebuilt-layout",
+            "stringIndexType": "unicodeCodePoint",
+            "content": content,
+            "pages": [
+                {
+                    "pageNumber": page_number,
+                    "spans": [{"offset": 0, "length": len(content)}],
+                    "words": [{"content": content, "span": {"offset": 0, "length": 1}}],
+                }
+                for page_number in page_numbers
+            ],
+            "paragraphs": [
+                {
+                    "content": content,
+                    "spans": [{"offset": 0, "length": len(content)}],
+                    "boundingRegions": [{"pageNumber": page_numbers[0], "polygon": []}],
+                }
+                for _ in range(paragraph_count)
+            ],
+            "sections": [
+                {
+                    "spans": [{"offset": 0, "length": len(content)}],
+                    "elements": [f"/paragraphs/{i}" for i in range(paragraph_count)],
+                }
+            ],
+            "figures": [{"id": f"{page_numbers[0]}.1", "elements": ["/paragraphs/0"]}],
+        }
+    )
+
+
+def test_page_ranges():
+    assert page_ranges(7, 3) == [(1, 3), (4, 6), (7, 7)]
+    with pytest.raises(ValueError):
+        page_ranges(7, 0)
+
+
+def test_merge_renumbers_relative_pages_and_shifts_offsets_and_refs():
+    first = make_shard("first", [1, 2], paragraph_count=2)
+    second = make_shard("second", [1], paragraph_count=1)
+
+    merged = merge_analyze_results([first, second], [(1, 2), (3, 3)])
+
+    assert merged.content == "first\nsecond"
+    assert [page.page_number for page in merged.pages] == [1, 2, 3]
+    paragraph = merged.paragraphs[2]
+    start = paragraph.spans[0].offset
+    assert merged.content[start : start + paragraph.spans[0].length] == "second"
+    assert paragraph.bounding_regions[0].page_number == 3
+    assert merged.pages[2].words[0].span.offset == start
+    assert merged.sections[1].elements == ["/paragraphs/2"]
+    assert merged.figures[1].id == "3.1"
+    assert merged.figures[1].elements == ["/paragraphs/2"]
+
+
+def test_merge_keeps_absolute_pages():
+    first = make_shard("first", [1], paragraph_count=1)
+    second = make_shard("second", [2], paragraph_count=1)
+
+    merged = merge_analyze_results([first, second], [(1, 1), (2, 2)])
+
+    assert [page.page_number for page in merged.pages] == [1, 2]
+    assert merged.figures[1].id == "2.1"
+
+
+def test_shard_inputs_splits_local_pdfs():
+    document = fitz.open()
+    for _ in range(5):
+        document.new_page()
+    content = document.tobytes()
+
+    ranges, shards = shard_inputs(content, shard_size=2)
+
+    assert ranges == [(1, 2), (3, 4), (5, 5)]
+    assert [fitz.open(stream=shard).page_count for shard, _ in shards] == [2, 2, 1]
+    assert all(pages is None for _, pages in shards)
+    _, url_shards = shard_inputs("https://example.com/doc.pdf", 5, 2)
+    assert [pages for _, pages in url_shards] == ["1-2", "3-4", "5-5"]
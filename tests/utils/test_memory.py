@@ -0,0 +1,37 @@
+from utils import memory
+from utils.memory import PeakRSSTracker
+
+
+def test_peak_rss_tracker_does_not_reset_by_default(monkeypatch):
+    resets = []
+    monkeypatch.setattr(memory, "reset_peak_rss", lambda: resets.append(1) or True)
+
+    with PeakRSSTracker() as tracker:
+        pass
+
+    assert resets == []
+    assert tracker.stats["scoped"] is False
+
+
+def test_peak_rss_tracker_resets_on_request(monkeypatch):
+    resets = []
+    monkeypatch.setattr(memory, "reset_peak_rss", lambda: resets.append(1) or True)
+
+    with PeakRSSTracker(reset_peak=True) as tracker:
+        pass
+
+    assert resets == [1]
+    assert tracker.stats["scoped"] is True
+
+
+def test_peak_rss_tracker_reports_the_change_of_an_unscoped_block(monkeypatch):
+    rss = iter([100, 160])
+    monkeypatch.setattr(memory, "current_rss_bytes", lambda: next(rss))
+    monkeypatch.setattr(memory, "peak_rss_bytes", lambda: 1000)
+
+    with PeakRSSTracker() as tracker:
+        pass
+
+    assert tracker.stats["rss_increase_bytes"] == 60
+    assert tracker.stats["peak_rss_bytes"] == 1000
+    assert tracker.stats["peak_increase_bytes"] is None
@@ -0,0 +1,115 @@
+import sys
+from typing import Any, Dict, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+PROC_STATUS_PATH = "/proc/self/status"
+PROC_CLEAR_REFS_PATH = "/proc/self/clear_refs"
+
+
+def _read_proc_status_kb(field: str) -> Optional[int]:
+    """
+    Reads a memory field of /proc/self/status.
+
+    :param field: Name of the field, such as "VmRSS" or "VmHWM".
+    :return: The value in kB, or None if unavailable.
+    """
+    try:
+        with open(PROC_STATUS_PATH) as status:
+            for line in status:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1])
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def current_rss_bytes() -> Optional[int]:
+    """
+    Returns the current resident set size of the process.
+
+    :return: The RSS in bytes, or None if the platform does not expose it.
+    """
+    rss_kb = _read_proc_status_kb("VmRSS")
+    return rss_kb * 1024 if rss_kb is not None else None
+
+
+def peak_rss_bytes() -> Optional[int]:
+    """
+    Returns the peak resident set size of the process.
+
+    :return: The peak RSS in bytes, or None if the platform does not expose it.
+    """
+    peak_kb = _read_proc_status_kb("VmHWM")
+    if peak_kb is not None:
+        return peak_kb * 1024
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kB everywhere else.
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+def reset_peak_rss() -> bool:
+    """
+    Resets the peak resident set size to the current one, on Linux 4.0 and later.
+
+    :return: Whether the peak was reset.
+    """
+    try:
+        with open(PROC_CLEAR_REFS_PATH, "w") as clear_refs:
+            clear_refs.write("5")
+        return True
+    except OSError:
+        return False
+
+
+class PeakRSSTracker:
+    """
+    Context manager measuring the peak resident set size of the process during a block.
+
+    By default the peak is that of the whole process lifetime and `stats["scoped"]` is
+    False, so `stats["rss_increase_bytes"]`, the RSS at the end of the block minus the
+    RSS at its start, is what tells blocks apart. With `reset_peak`, the peak is reset
+    when entering the block, where the platform allows it, and
+    `stats["peak_increase_bytes"]` is the peak of the block above its starting RSS. The
+    reset is process-wide and disturbs any other measurement running at the same time,
+    so only benchmarks and scripts owning the process should request it.
+    """
+
+    def __init__(self, reset_peak: bool = False):
+        """
+        Initialize the PeakRSSTracker.
+
+        :param reset_peak: Whether to reset the peak RSS of the process when entering the
+            block. Defaults to False.
+        """
+        self.reset_peak = reset_peak
+        self.stats: Dict[str, Any] = {}
+
+    def __enter__(self) -> "PeakRSSTracker":
+        scoped = reset_peak_rss() if self.reset_peak else False
+        self.stats = {
+            "rss_start_bytes": current_rss_bytes(),
+            "rss_end_bytes": None,
+            "rss_increase_bytes": None,
+            "peak_rss_bytes": None,
+            "peak_increase_bytes": None,
+            "scoped": scoped,
+        }
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        peak = peak_rss_bytes()
+        start = self.stats["rss_start_bytes"]
+        end = current_rss_bytes()
+        self.stats["rss_end_bytes"] = end
+        self.stats["peak_rss_bytes"] = peak
+        if end is not None and start is not None:
+            self.stats["rss_increase_bytes"] = end - start
+        # A lifetime peak can predate the block, so it says nothing about its increase.
+        if self.stats["scoped"] and peak is not None and start is not None:
+            self.stats["peak_increase_bytes"] = max(0, peak - start)